@@ -1,5 +1,7 @@
+from app.api.v1.endpoints.admin import router as admin_router
 from app.api.v1.endpoints.routes import router
 
 __all__ = [
+    "admin_router",
     "router",
 ]
\ No newline at end of file
@@ -0,0 +1,62 @@
+import hmac
+from typing import Dict, List, Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Response
+
+from app.core.config import ProfilerMode, settings
+from app.core.profiling import request_profiler
+from app.models.schemas import ProfilingConfig
+
+
+def require_admin(x_admin_token: Optional[str] = Header(None)):
+    """Reject requests without the configured ADMIN_TOKEN"""
+    if not settings.ADMIN_TOKEN or not x_admin_token:
+        raise HTTPException(status_code=401, detail="Admin token required")
+    if not hmac.compare_digest(x_admin_token, settings.ADMIN_TOKEN):
+        raise HTTPException(status_code=403, detail="Invalid admin token")
+
+
+router = APIRouter(
+    prefix=f"{settings.API_V1_STR}/admin",
+    tags=["admin"],
+    dependencies=[Depends(require_admin)],
+)
+
+
+@router.get("/profiling")
+async def get_profiling() -> Dict:
+    """Current sampling rate, mode and ring buffer usage"""
+    return request_profiler.state()
+
+
+@router.put("/profiling")
+async def set_profiling(config: ProfilingConfig) -> Dict:
+    """Change the share of requests profiled (0 turns sampling off)"""
+    request_profiler.configure(config.rate, config.mode)
+    return request_profiler.state()
+
+
+@router.get("/profiles")
+async def list_profiles() -> List[Dict]:
+    """Buffered profiles, newest first"""
+    return request_profiler.summaries()
+
+
+@router.get("/profiles/{profile_id}")
+async def download_profile(profile_id: int):
+    """
+    Raw profile: pstats (load with pstats.Stats or snakeviz) or collapsed
+    stacks (flamegraph.pl, speedscope)
+    """
+    profile = request_profiler.get(profile_id)
+    if profile is None:
+        raise HTTPException(status_code=404, detail="Profile not in buffer")
+    if profile.mode == ProfilerMode.CPROFILE:
+        filename, media_type = f"profile-{profile.id}.prof", "application/octet-stream"
+    else:
+        filename, media_type = f"profile-{profile.id}.collapsed", "text/plain"
+    return Response(
+        profile.data,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
@@ -1,8 +1,23 @@
-from fastapi import APIRouter, Depends
-from app.models.schemas import RouteRequest, RouteResponse
+import base64
+from typing import AsyncIterator, Dict
+
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import StreamingResponse
+import numpy as np
+from app.models.schemas import (
+    BatchRouteRequest,
+    EncodedMatrix,
+    MatrixRequest,
+    MatrixResponse,
+    RouteRequest,
+    RouteResponse,
+)
 from app.services.routing import bike_router
+from app.services.shaping import run_shaping, shape_alternative, shape_response
 from app.services.delhi_optimizer import DelhiRouteOptimizer
 from app.core.config import settings
+from app.core.metrics import timed
+from app.core.responses import FastJSONResponse, dumps
 
 
 router = APIRouter(
@@ -10,7 +25,17 @@ router = APIRouter(
     tags=["routes"]
 )
 
-@router.post("/routes", response_model=RouteResponse)
+def _route_payload(fields: Dict) -> Dict:
+    """
+    RouteResponse fields without re-validating the router's own output
+    (the raw OSRM `route` dict is the bulk of the payload)
+    """
+    return dict(RouteResponse.model_construct(**fields))
+
+
+@router.post(
+    "/routes", response_model=RouteResponse, response_class=FastJSONResponse
+)
 async def get_bike_route(
     request: RouteRequest,
     optimizer: DelhiRouteOptimizer = Depends()
@@ -21,5 +46,143 @@ async def get_bike_route(
         end=(request.end_lon, request.end_lat),
         avoid=request.avoid
     )
-    optimized_route = await optimizer.optimize(recommended_route)
-    return RouteResponse(**optimized_route)
+    if not recommended_route:
+        raise HTTPException(status_code=404, detail="No route found")
+    # Reuses the router's single-pass scoring result, no rescoring here
+    with timed("optimizer"):
+        optimized_route = await optimizer.optimize(recommended_route)
+    with timed("serialization"):
+        return FastJSONResponse(
+            _route_payload(
+                await shape_response(
+                    optimized_route, routes, recommended_route, request
+                )
+            )
+        )
+
+
+@router.post("/routes/stream")
+async def stream_bike_route(
+    request: RouteRequest,
+    http_request: Request,
+    optimizer: DelhiRouteOptimizer = Depends()
+):
+    """
+    Delhi-optimized bike route, streamed as alternatives are scored:
+    OSRM's primary route first, the others as they finish, the
+    recommendation last. An alternative that fails gets an `error` event
+    with its index; an `error` event without one ends the stream. NDJSON,
+    or Server-Sent Events when the client sends `Accept: text/event-stream`.
+    """
+    events = bike_router.stream_route(
+        start=(request.start_lon, request.start_lat),
+        end=(request.end_lon, request.end_lat),
+        avoid=request.avoid
+    )
+    # Wait for the primary route before responding so routing errors keep
+    # their HTTP status
+    first_event = await events.__anext__()
+    sse = "text/event-stream" in http_request.headers.get("accept", "")
+
+    def encode(event: str, payload: Dict) -> bytes:
+        if sse:
+            return b"event: " + event.encode() + b"\ndata: " + dumps(payload) + b"\n\n"
+        return dumps({"event": event, **payload}) + b"\n"
+
+    async def stream() -> AsyncIterator[bytes]:
+        event = first_event
+        try:
+            while True:
+                kind, index, route = event
+                if kind == "error":
+                    payload = {"index": index, **route}
+                elif kind == "route":
+                    payload = {
+                        "index": index,
+                        "primary": index == 0,
+                        **await run_shaping(request, shape_alternative, route, request),
+                    }
+                else:
+                    optimized_route = await optimizer.optimize(route)
+                    payload = {
+                        "index": index,
+                        **_route_payload(
+                            await shape_response(optimized_route, [], route, request)
+                        ),
+                    }
+                    # Alternatives were already streamed as route events
+                    payload.pop("alternatives", None)
+                yield encode(kind, payload)
+                event = await events.__anext__()
+        except StopAsyncIteration:
+            pass
+        except Exception as e:
+            status, detail = 503, "Route calculation service unavailable"
+            if isinstance(e, HTTPException):
+                status, detail = e.status_code, e.detail
+            yield encode("error", {"status": status, "detail": detail})
+        finally:
+            await events.aclose()
+
+    media_type = "text/event-stream" if sse else "application/x-ndjson"
+    return StreamingResponse(stream(), media_type=media_type)
+
+
+@router.post("/routes/batch")
+async def get_bike_routes_batch(
+    request: BatchRouteRequest,
+    optimizer: DelhiRouteOptimizer = Depends()
+):
+    """
+    Delhi-optimized bike routes for many origin-destination pairs,
+    streamed as NDJSON in completion order
+    """
+    async def stream() -> AsyncIterator[bytes]:
+        results = bike_router.calculate_routes_batch(request.routes)
+        async for index, result in results:
+            route_request = request.routes[index]
+            if isinstance(result, HTTPException):
+                line = {
+                    "index": index,
+                    "status": result.status_code,
+                    "detail": result.detail,
+                }
+            else:
+                optimized_route = await optimizer.optimize(result)
+                line = {
+                    "index": index,
+                    "status": 200,
+                    "route": _route_payload(
+                        await shape_response(
+                            optimized_route, [result], result, route_request
+                        )
+                    ),
+                }
+            yield dumps(line) + b"\n"
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
+
+
+def _encode_matrix(matrix: np.ndarray) -> EncodedMatrix:
+    array = np.ascontiguousarray(matrix, dtype="<f4")
+    return EncodedMatrix(
+        dtype="float32",
+        shape=list(array.shape),
+        data=base64.b64encode(array.tobytes()).decode(),
+    )
+
+
+@router.post("/matrix", response_model=MatrixResponse)
+async def get_route_matrix(request: MatrixRequest):
+    """
+    Many-to-many durations (s) and distances (m), optionally weighted by
+    zone risk at the endpoints (not along the routes)
+    """
+    durations, distances = await bike_router.calculate_matrix(
+        sources=[(loc.lon, loc.lat) for loc in request.sources],
+        destinations=[(loc.lon, loc.lat) for loc in request.destinations],
+        safety_weight=request.safety_weight,
+    )
+    return MatrixResponse(
+        durations=_encode_matrix(durations), distances=_encode_matrix(distances)
+    )
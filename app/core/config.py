@@ -6,6 +6,7 @@ Using StringifiedEnum and modern Pydantic features
 from urllib.parse import urljoin
 from pydantic import (
     AnyUrl,
+    BaseModel,
     PostgresDsn,
     Field,
     field_validator,
@@ -43,6 +44,27 @@ class RoutingProfile(StringifiedEnum):
     BIKE_FAST = "bike-fast"
 
 
+class ExecutorMode(StringifiedEnum):
+    INLINE = "inline"
+    THREAD = "thread"
+    PROCESS = "process"
+
+
+class ScoringMode(StringifiedEnum):
+    GEOMETRY = "geometry"  # Clip the full route geometry to the zone layers
+    ANNOTATIONS = "annotations"  # Look up OSRM node annotations in NODE_TABLE_PATH
+
+
+class ProfilerMode(StringifiedEnum):
+    CPROFILE = "cprofile"  # Deterministic, event loop thread only (pstats)
+    SAMPLING = "sampling"  # Stack samples of every thread (collapsed stacks)
+
+
+class RoutingEngine(StringifiedEnum):
+    OSRM = "osrm"
+    GRAPH = "graph"  # In-process A* over ROAD_GRAPH_PATH, OSRM as fallback
+
+
 class HazardType(StringifiedEnum):
     WATERLOGGING = "waterlogging"
     THEFT = "theft"
@@ -50,6 +72,15 @@ class HazardType(StringifiedEnum):
     CONSTRUCTION = "construction"
 
 
+class OSRMBackend(BaseModel):
+    """One osrm-routed instance and the region its extract covers"""
+
+    url: AnyUrl
+    region: str = "default"
+    # Same keys as DELHI_BOUNDARY; None means the backend covers everything
+    bbox: Optional[Dict[str, float]] = None
+
+
 class Settings(BaseSettings):
     # --- Core Application Settings ---
     ENVIRONMENT: Environment = Field(default=Environment.DEVELOPMENT)
@@ -61,6 +92,15 @@ class Settings(BaseSettings):
     SERVER_HOST: str = "0.0.0.0"
     SERVER_PORT: int = 8000
     CORS_ORIGINS: List[str] = ["*"]
+    BATCH_MAX_ROUTES: int = 500  # Max pairs per /routes/batch request
+    BATCH_MAX_CONCURRENCY: int = 16  # Concurrent OSRM calls per batch/matrix
+    MATRIX_MAX_LOCATIONS: int = 2000  # Max sources/destinations per /matrix
+
+    # --- CPU-bound Scoring ---
+    SCORING_EXECUTOR: ExecutorMode = ExecutorMode.THREAD
+    SCORING_WORKERS: int = Field(default_factory=lambda: os.cpu_count() or 1)
+    SCORING_MAX_QUEUE: int = 256  # Pending jobs before shedding with 503
+    SCORING_MODE: ScoringMode = ScoringMode.GEOMETRY
 
     # --- Delhi Routing Defaults ---
     DEFAULT_AVOID: List[HazardType] = Field(
@@ -70,29 +110,88 @@ class Settings(BaseSettings):
     DELHI_BOUNDARY: Dict[str, float] = Field(
         default={"min_lon": 76.84, "max_lon": 77.45, "min_lat": 28.40, "max_lat": 28.88}
     )
+    RISK_GRID_CELL_SIZE: float = 0.002  # Degrees (~200m) per zone grid cell
+
+    # --- In-process Routing ---
+    ROUTING_ENGINE: RoutingEngine = RoutingEngine.OSRM
+    # Built by `python -m app.utils.roadgraph <extract.osm.pbf>`
+    ROAD_GRAPH_PATH: Path = Path("data/delhi_zones/roads.npz")
+    ROAD_GRAPH_RISK_WEIGHT: float = 4.0  # Extra cost per metre in an avoided zone
+    ROAD_GRAPH_SNAP_DISTANCE: float = 500.0  # Max metres to the nearest road node
+    ROAD_GRAPH_CYCLING_SPEED: float = 4.5  # m/s, for route durations
 
     # --- OSRM Routing Engine ---
     OSRM_URL: AnyUrl = "http://localhost:5000"
     BIKE_ROUTING_URL: str = "/route/v1/cycling/{coordinates}"
+    BIKE_TABLE_URL: str = "/table/v1/cycling/{coordinates}"
+    BIKE_NEAREST_URL: str = "/nearest/v1/cycling/{coordinates}"  # Health checks
+    OSRM_TABLE_MAX_SIZE: int = 100  # Must match osrm-routed --max-table-size
     OSRM_PROFILE: RoutingProfile = RoutingProfile.BIKE_DELHI
     MAX_ALTERNATIVES: int = 3
+    # Regional OSRM pool, e.g. '[{"url": "http://osrm-north:5000",
+    # "region": "north", "bbox": {"min_lon": ..., ...}}]'. Empty uses OSRM_URL.
+    OSRM_BACKENDS: List[OSRMBackend] = Field(default_factory=list)
+    OSRM_HEALTH_CHECK_INTERVAL: float = 10.0  # Seconds, 0 disables
+    OSRM_HEALTH_CHECK_FAILURES: int = 2  # Consecutive failures before ejection
+    OSRM_EXCLUSION_MERGE: bool = True  # Union overlapping exclusion polygons
+    OSRM_EXCLUSION_SIMPLIFY_TOLERANCE: float = 0.0  # Degrees, 0 disables
+
+    # --- OSRM Connection Pool ---
+    OSRM_POOL_SIZE: int = 100  # Total sockets
+    OSRM_POOL_SIZE_PER_HOST: int = 10
+    OSRM_DNS_CACHE_TTL: int = 300  # Seconds
+    OSRM_KEEPALIVE_TIMEOUT: float = 15.0  # Seconds an idle socket is kept
+    OSRM_CONNECT_TIMEOUT: float = 2.0
+    OSRM_READ_TIMEOUT: float = 10.0
+    OSRM_TOTAL_TIMEOUT: float = 10.0
+    OSRM_RETRIES: int = 1  # Extra attempts on timeouts, connection errors, 5xx
+    OSRM_RETRY_BACKOFF: float = 0.1  # Base seconds, jittered exponential
+    OSRM_HEDGE_ENABLED: bool = False
+    OSRM_HEDGE_PERCENTILE: float = 95.0  # Hedge after this latency percentile
+    OSRM_HEDGE_MIN_DELAY: float = 0.05  # Seconds
+
+    # --- OSRM Admission Control ---
+    OSRM_MAX_CONCURRENCY: int = 64  # Upstream requests in flight; others queue
+    OSRM_DEGRADE_QUEUE: int = 32  # Queued requests before alternatives=false
+    OSRM_MAX_QUEUE: int = 128  # Queued requests before shedding with 429
+
+    # --- Profiling (needs ADMIN_TOKEN) ---
+    PROFILE_SAMPLE_RATE: float = 0.0  # Share of requests profiled at startup
+    PROFILE_MODE: ProfilerMode = ProfilerMode.SAMPLING
+    PROFILE_SAMPLE_INTERVAL: float = 0.002  # Seconds between stack samples
+    PROFILE_BUFFER_SIZE: int = 50  # Most recent profiles kept for download
 
     # --- Database ---
     POSTGRES_URL: Optional[PostgresDsn] = None
-    POSTGIS_TABLE: str = "delhi_bike_routes"
+    POSTGIS_TABLE: str = "delhi_bike_routes"  # zone_type, geom, properties, updated_at
+    POSTGIS_POOL_SIZE: int = 10
     REDIS_URL: AnyUrl = "redis://localhost:6379/0"
     REDIS_CACHE_TTL: int = 3600  # 1 hour
 
+    # --- Route Cache ---
+    ROUTE_CACHE_ENABLED: bool = True
+    ROUTE_CACHE_GRID: float = 0.0005  # Snap coordinates to ~50m cells
+    ROUTE_CACHE_LRU_SIZE: int = 1024  # In-process entries in front of Redis
+    ROUTE_CACHE_DEGRADED_TTL: int = 30  # Single-route answers under load; 0 = off
+
     # --- Delhi Data Sources ---
     MCD_API_URL: AnyUrl = "https://mcddelhi.org/api/v1"
     DELHI_TRAFFIC_API: AnyUrl = "https://delhitrafficpolice.nic.in/api"
     HAZARD_DATA_PATH: Path = Path("data/delhi_hazards")
     ZONE_DATA_PATH: Path = Path("data/delhi_zones")
+    # Compiled by `python -m app.utils.zonestore`; GeoJSON is used if missing
+    ZONE_STORE_PATH: Path = Path("data/delhi_zones/zones.dzs")
+    # Built by `python -m app.utils.nodetable <extract.osm.pbf>` (annotation scoring)
+    NODE_TABLE_PATH: Path = Path("data/delhi_zones/nodes.npz")
+    ZONE_RELOAD_POLL_INTERVAL: float = 5.0  # Seconds between checks, 0 disables
+    ZONE_RELOAD_CHANNEL: Optional[str] = None  # Redis pub/sub, e.g. "zones:reload"
+    ZONE_DB_REFRESH_INTERVAL: float = 60.0  # PostGIS version checks, 0 disables
 
     # --- Secrets ---
     OSRM_AUTH_KEY: Optional[str] = None
     MCD_API_KEY: Optional[str] = None
     TRAFFIC_API_KEY: Optional[str] = None
+    ADMIN_TOKEN: Optional[str] = None  # X-Admin-Token for /admin; unset disables it
 
     # Pydantic V2 config
     model_config = ConfigDict(
@@ -111,6 +210,10 @@ class Settings(BaseSettings):
     def is_monsoon_season(self) -> bool:
         return datetime.now().month in self.MONSOON_MONTHS
 
+    @property
+    def osrm_backends(self) -> List[OSRMBackend]:
+        return self.OSRM_BACKENDS or [OSRMBackend(url=self.OSRM_URL)]
+
     @property
     def osrm_bike_routing_url(self) -> str:
         return urljoin(str(self.OSRM_URL), self.BIKE_ROUTING_URL)
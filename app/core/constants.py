@@ -6,3 +6,15 @@ class ZoneType(StringifiedEnum):
     WATERLOGGING = "waterlogging"
     BIKE_LANE = "bike_lane"
     POTHOLE = "pothole"
+
+
+class GeometryFormat(StringifiedEnum):
+    GEOJSON = "geojson"
+    POLYLINE = "polyline"  # Google encoded polyline, 5 decimal places
+    POLYLINE6 = "polyline6"  # Encoded polyline, 6 decimal places
+
+
+class AlternativesMode(StringifiedEnum):
+    NONE = "none"  # Recommended route only
+    SUMMARY = "summary"  # Distance, duration and scores of every candidate
+    FULL = "full"  # Every candidate route, shaped like the recommended one
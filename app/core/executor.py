@@ -0,0 +1,97 @@
+"""
+Execution backend for CPU-bound route scoring
+Runs jobs inline, on a bounded thread pool, or on a process pool whose
+workers pre-load the zone index, with a queue-depth limit for backpressure
+"""
+
+import asyncio
+import logging
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Optional
+
+from fastapi import HTTPException
+
+from app.core.config import ExecutorMode, settings
+from app.core.lifecycle import lifecycle
+from app.utils.geospatial import geo_utils
+
+logger = logging.getLogger(__name__)
+
+
+def _init_worker():
+    """Process pool initializer: load the zone index once per worker"""
+    asyncio.run(geo_utils.load_zones())
+
+
+class ScoringExecutor:
+    def __init__(self):
+        self.mode = settings.SCORING_EXECUTOR
+        self._pool: Optional[Executor] = None
+        self.pending = 0
+        self.rejected = 0
+
+    async def _startup(self):
+        """Create the worker pool for the configured mode"""
+        self._pool = self._create_pool()
+        logger.info(f"Scoring executor: {self.mode} ({settings.SCORING_WORKERS})")
+
+    def _create_pool(self) -> Optional[Executor]:
+        if self.mode == ExecutorMode.THREAD:
+            return ThreadPoolExecutor(
+                max_workers=settings.SCORING_WORKERS, thread_name_prefix="scoring"
+            )
+        if self.mode == ExecutorMode.PROCESS:
+            return ProcessPoolExecutor(
+                max_workers=settings.SCORING_WORKERS, initializer=_init_worker
+            )
+        return None
+
+    async def refresh(self):
+        """
+        Replace process workers so they load freshly swapped zone data.
+        Jobs already running finish on the old workers.
+        """
+        if self.mode != ExecutorMode.PROCESS or self._pool is None:
+            return
+        old_pool, self._pool = self._pool, self._create_pool()
+        old_pool.shutdown(wait=False)
+
+    async def _shutdown(self):
+        """Stop the worker pool"""
+        if self._pool:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    async def run(self, fn: Callable, *args: Any) -> Any:
+        """
+        Run a CPU-bound job on the configured backend.
+        Process mode requires `fn` and its arguments to be picklable.
+        Sheds load with 503 once SCORING_MAX_QUEUE jobs are pending.
+        """
+        if self.mode == ExecutorMode.INLINE or self._pool is None:
+            return fn(*args)
+
+        if self.pending >= settings.SCORING_MAX_QUEUE:
+            self.rejected += 1
+            raise HTTPException(
+                status_code=503,
+                detail="Route scoring capacity exceeded",
+                headers={"Retry-After": "1"},
+            )
+
+        self.pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._pool, partial(fn, *args))
+        finally:
+            self.pending -= 1
+
+
+# Shared scoring executor (manage lifecycle with FastAPI events)
+scoring_executor = ScoringExecutor()
+lifecycle.add_resource(
+    name="scoring_executor",
+    startup=scoring_executor._startup,
+    shutdown=scoring_executor._shutdown,
+)
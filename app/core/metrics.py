@@ -0,0 +1,123 @@
+"""
+Prometheus instrumentation
+Hot-path stages record into one latency histogram, labelled with the
+request's avoid set and monsoon mode (carried in a context variable so
+helpers don't need extra arguments). Executor, OSRM pool and cache state
+is read only when /metrics is scraped.
+"""
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, List, Tuple
+
+from prometheus_client import REGISTRY, Counter, Histogram
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+
+from app.core.constants import ZoneType
+
+STAGE_SECONDS = Histogram(
+    "delhi_bike_stage_seconds",
+    "Time spent per request stage",
+    ["stage", "avoid", "monsoon"],
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+ROUTE_ERRORS = Counter(
+    "delhi_bike_route_errors_total", "Failed route calculations", ["status"]
+)
+
+# (avoid, monsoon) labels of the request being served
+_route_labels: ContextVar[Tuple[str, str]] = ContextVar(
+    "route_labels", default=("none", "0")
+)
+
+
+def set_route_labels(avoid: List[ZoneType], monsoon_mode: bool):
+    """Label this request's (and its child tasks') stage timings"""
+    avoided = ",".join(sorted({str(zone) for zone in avoid})) or "none"
+    _route_labels.set((avoided, str(int(monsoon_mode))))
+
+
+@contextmanager
+def timed(stage: str) -> Iterator[None]:
+    """Record the duration of the enclosed block as `stage`"""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        STAGE_SECONDS.labels(stage, *_route_labels.get()).observe(
+            time.perf_counter() - started
+        )
+
+
+class RuntimeCollector:
+    """Scrape-time gauges and counters from the shared service objects"""
+
+    def describe(self):
+        # Don't collect at registration; the services import this module
+        return []
+
+    def collect(self):
+        from app.core.executor import scoring_executor
+        from app.services.cache import route_cache
+        from app.services.osrm import osrm_client
+
+        yield GaugeMetricFamily(
+            "delhi_bike_scoring_queue_depth",
+            "Scoring jobs pending on the executor",
+            value=scoring_executor.pending,
+        )
+        yield CounterMetricFamily(
+            "delhi_bike_scoring_rejected",
+            "Scoring jobs shed with 503",
+            value=scoring_executor.rejected,
+        )
+
+        pool = osrm_client.pool_stats()
+        for name, documentation in (
+            ("acquired", "OSRM connections in use"),
+            ("saturation", "Share of the OSRM connection pool in use"),
+            ("in_flight", "OSRM requests in flight"),
+            ("queued", "OSRM requests waiting for a concurrency slot"),
+        ):
+            yield GaugeMetricFamily(
+                f"delhi_bike_osrm_{name}", documentation, value=pool[name]
+            )
+        for name, documentation in (
+            ("requests", "OSRM requests sent"),
+            ("retries", "OSRM requests retried"),
+            ("hedged", "OSRM requests hedged"),
+            ("coalesced", "OSRM calls served by an identical in-flight request"),
+            ("degraded", "OSRM route requests degraded to alternatives=false"),
+            ("shed", "OSRM requests shed with 429"),
+        ):
+            yield CounterMetricFamily(
+                f"delhi_bike_osrm_{name}", documentation, value=pool[name]
+            )
+        healthy = GaugeMetricFamily(
+            "delhi_bike_osrm_backend_healthy",
+            "OSRM backend health (1 healthy, 0 ejected)",
+            labels=["url", "region"],
+        )
+        for backend in pool["backends"]:
+            healthy.add_metric(
+                [backend["url"], backend["region"]], int(backend["healthy"])
+            )
+        yield healthy
+
+        yield CounterMetricFamily(
+            "delhi_bike_route_cache_hits", "Route cache hits", value=route_cache.hits
+        )
+        yield CounterMetricFamily(
+            "delhi_bike_route_cache_misses",
+            "Route cache misses",
+            value=route_cache.misses,
+        )
+        yield GaugeMetricFamily(
+            "delhi_bike_route_cache_hit_ratio",
+            "Route cache hit ratio since startup",
+            value=route_cache.hit_ratio,
+        )
+
+
+REGISTRY.register(RuntimeCollector())
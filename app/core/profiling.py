@@ -0,0 +1,227 @@
+"""
+On-demand request profiling
+Installed only when ADMIN_TOKEN is set. A request is profiled when it falls
+in the sampled share (PUT /admin/profiling) or carries an X-Profile header
+with the admin token. One request is profiled at a time, either under
+cProfile (pstats, event loop thread) or a stack sampler that also sees the
+scoring threads (collapsed stacks for flamegraph.pl or speedscope). Both
+also capture whatever else the event loop runs meanwhile. Results land in a
+bounded ring buffer downloadable from /admin/profiles.
+"""
+
+import concurrent.futures.thread
+import cProfile
+import hmac
+import itertools
+import logging
+import marshal
+import random
+import sys
+import threading
+import time
+from collections import Counter, deque
+from typing import Deque, Dict, List, Optional
+
+from app.core.config import ProfilerMode, settings
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = b"x-profile"
+_EXECUTOR_WORKER = concurrent.futures.thread._worker.__code__
+
+
+def _idle(frame) -> bool:
+    """Whether a thread is parked, e.g. a pool worker waiting for a job"""
+    code = frame.f_code
+    if code.co_filename == threading.__file__:
+        return code.co_name == "wait"
+    # Executor workers block in the C-level queue get at the top of the loop
+    return code is _EXECUTOR_WORKER
+
+
+class StackSampler:
+    """Samples every thread's Python stack on an interval"""
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name="profiler", daemon=True
+        )
+
+    def enable(self):
+        self._thread.start()
+
+    def disable(self):
+        self._stop.set()
+        self._thread.join()
+
+    def dump(self) -> bytes:
+        """Collapsed stacks: `thread;outer;...;inner count` per line"""
+        return "".join(
+            f"{stack} {count}\n" for stack, count in self.stacks.most_common()
+        ).encode()
+
+    def _run(self):
+        own = threading.get_ident()
+        names: Dict[int, str] = {}
+        while not self._stop.wait(self.interval):
+            for ident, frame in sys._current_frames().items():
+                if ident == own or _idle(frame):
+                    continue
+                if ident not in names:
+                    names.update((t.ident, t.name) for t in threading.enumerate())
+                frames = []
+                while frame is not None:
+                    code = frame.f_code
+                    location = f"{code.co_filename}:{code.co_firstlineno}"
+                    frames.append(f"{code.co_qualname} ({location})")
+                    frame = frame.f_back
+                frames.append(names.get(ident, str(ident)))
+                self.stacks[";".join(reversed(frames))] += 1
+
+
+class CProfiler:
+    """cProfile behind the same interface as StackSampler"""
+
+    def __init__(self):
+        self.profile = cProfile.Profile()
+
+    def enable(self):
+        self.profile.enable()
+
+    def disable(self):
+        self.profile.disable()
+
+    def dump(self) -> bytes:
+        """pstats data, as Profile.dump_stats writes it"""
+        self.profile.create_stats()
+        return marshal.dumps(self.profile.stats)
+
+
+class RequestProfile:
+    """One finished profile and the request it covers"""
+
+    def __init__(self, profile_id: int, method: str, path: str, mode: ProfilerMode):
+        self.id = profile_id
+        self.method = method
+        self.path = path
+        self.mode = mode
+        self.forced = False
+        self.started = time.time()
+        self.duration = 0.0
+        self.status: Optional[int] = None
+        self.data = b""
+
+    def summary(self) -> Dict:
+        return {
+            "id": self.id,
+            "method": self.method,
+            "path": self.path,
+            "mode": str(self.mode),
+            "forced": self.forced,
+            "started": self.started,
+            "duration": self.duration,
+            "status": self.status,
+            "size": len(self.data),
+        }
+
+
+class RequestProfiler:
+    def __init__(self):
+        self.rate = settings.PROFILE_SAMPLE_RATE
+        self.mode = settings.PROFILE_MODE
+        self.profiles: Deque[RequestProfile] = deque(
+            maxlen=settings.PROFILE_BUFFER_SIZE
+        )
+        self.active = False
+        self.skipped = 0  # Selected while another request was being profiled
+        self._ids = itertools.count(1)
+
+    def configure(self, rate: float, mode: ProfilerMode):
+        self.rate, self.mode = rate, mode
+        logger.info(f"Request profiling: {rate:.1%} sampled, {mode}")
+
+    def state(self) -> Dict:
+        return {
+            "rate": self.rate,
+            "mode": str(self.mode),
+            "active": self.active,
+            "skipped": self.skipped,
+            "buffered": len(self.profiles),
+            "capacity": self.profiles.maxlen,
+        }
+
+    def get(self, profile_id: int) -> Optional[RequestProfile]:
+        return next((p for p in self.profiles if p.id == profile_id), None)
+
+    def summaries(self) -> List[Dict]:
+        return [p.summary() for p in reversed(self.profiles)]
+
+    def forced(self, scope: Dict) -> bool:
+        """Whether the request carries X-Profile with the admin token"""
+        for name, value in scope["headers"]:
+            if name == PROFILE_HEADER:
+                return hmac.compare_digest(value, settings.ADMIN_TOKEN.encode())
+        return False
+
+    def _backend(self):
+        if self.mode == ProfilerMode.CPROFILE:
+            return CProfiler()
+        return StackSampler(settings.PROFILE_SAMPLE_INTERVAL)
+
+    async def run(self, app, scope: Dict, receive, send, forced: bool):
+        """Serve the request under a profiler and buffer the result"""
+        if self.active:
+            self.skipped += 1
+            return await app(scope, receive, send)
+
+        profile = RequestProfile(
+            next(self._ids), scope["method"], scope["path"], self.mode
+        )
+        profile.forced = forced
+
+        async def send_with_id(message):
+            if message["type"] == "http.response.start":
+                profile.status = message["status"]
+                message["headers"] = list(message.get("headers", [])) + [
+                    (b"x-profile-id", str(profile.id).encode())
+                ]
+            await send(message)
+
+        self.active = True
+        backend = self._backend()
+        started = time.perf_counter()
+        backend.enable()
+        try:
+            await app(scope, receive, send_with_id)
+        finally:
+            backend.disable()
+            profile.duration = time.perf_counter() - started
+            self.active = False
+            profile.data = backend.dump()
+            self.profiles.append(profile)
+
+
+class ProfilingMiddleware:
+    """ASGI middleware handing sampled or forced requests to the profiler"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http":
+            if request_profiler.rate and random.random() < request_profiler.rate:
+                return await request_profiler.run(
+                    self.app, scope, receive, send, forced=False
+                )
+            if request_profiler.forced(scope):
+                return await request_profiler.run(
+                    self.app, scope, receive, send, forced=True
+                )
+        await self.app(scope, receive, send)
+
+
+# Shared request profiler (used by ProfilingMiddleware and /admin)
+request_profiler = RequestProfiler()
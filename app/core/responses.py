@@ -0,0 +1,24 @@
+"""
+orjson-based JSON responses
+Route payloads are large nested dicts produced by our own router, so the
+/routes family renders them directly with orjson instead of validating
+them through a response model and FastAPI's default encoder.
+"""
+
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse
+
+# Numpy arrays/scalars pass through as JSON arrays/numbers
+ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+
+def dumps(content: Any) -> bytes:
+    """Serialize to JSON bytes (Enums as values, unknown types as str)"""
+    return orjson.dumps(content, default=str, option=ORJSON_OPTIONS)
+
+
+class FastJSONResponse(JSONResponse):
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
@@ -1,9 +1,14 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
 from fastapi.staticfiles import StaticFiles
-from app.api.v1.endpoints import router
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+from app.api.v1.endpoints import admin_router, router
 from fastapi.middleware.cors import CORSMiddleware
 from app.core.config import settings
 from app.core.lifecycle import lifecycle
+from app.core import metrics  # noqa: F401 (registers collectors)
+from app.core.profiling import ProfilingMiddleware
+from app.services.osrm import osrm_client
+from app.services.zone_reload import zone_reloader  # noqa: F401 (registers lifecycle)
 
 app = FastAPI(
     title="Bike Router",
@@ -20,6 +25,12 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Profiling and other admin tools only exist when an admin token is set,
+# so requests pay nothing for them otherwise
+if settings.ADMIN_TOKEN:
+    app.add_middleware(ProfilingMiddleware)
+    app.include_router(admin_router)
+
 app.include_router(router)
 # Serve static files (if any)
 app.mount(
@@ -33,5 +44,12 @@ async def health_check():
     return {
         "status": "healthy",
         "environment": str(settings.ENVIRONMENT),
-        "debug": settings.DEBUG
+        "debug": settings.DEBUG,
+        "osrm_pool": osrm_client.pool_stats(),
     }
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics_endpoint():
+    """Prometheus exposition of stage latencies and runtime state"""
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
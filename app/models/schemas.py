@@ -1,8 +1,10 @@
-from typing import List, Optional
+from typing import Dict, List, Optional
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
-from app.core.constants import ZoneType
+from app.core.config import ProfilerMode, settings
+
+from app.core.constants import AlternativesMode, GeometryFormat, ZoneType
 
 
 class RouteRequest(BaseModel):
@@ -11,13 +13,66 @@ class RouteRequest(BaseModel):
     end_lat: float
     end_lon: float
     avoid: Optional[List[ZoneType]] = None
+    # Response shape; scoring always uses the full geometry
+    geometry: GeometryFormat = GeometryFormat.GEOJSON
+    steps: bool = True
+    alternatives: AlternativesMode = AlternativesMode.NONE
+    slim: bool = False  # Drop coordinates/metadata duplicated in `route`
+
+
+class Location(BaseModel):
+    lat: float
+    lon: float
+
+
+class MatrixRequest(BaseModel):
+    sources: List[Location] = Field(
+        ..., min_length=1, max_length=settings.MATRIX_MAX_LOCATIONS
+    )
+    destinations: List[Location] = Field(
+        ..., min_length=1, max_length=settings.MATRIX_MAX_LOCATIONS
+    )
+    safety_weight: float = Field(
+        default=0.0,
+        ge=0,
+        description=(
+            "Scales each duration by 1 + safety_weight * mean zone risk of the "
+            "source and destination points. Endpoint-only approximation: "
+            "hazards along the way are not sampled; use /routes for that."
+        ),
+    )
+
+
+class EncodedMatrix(BaseModel):
+    """Row-major little-endian array, base64 encoded (NaN = unreachable)"""
+
+    dtype: str
+    shape: List[int]
+    data: str
+
+
+class MatrixResponse(BaseModel):
+    durations: EncodedMatrix
+    distances: EncodedMatrix
+
+
+class BatchRouteRequest(BaseModel):
+    routes: List[RouteRequest] = Field(
+        ..., min_length=1, max_length=settings.BATCH_MAX_ROUTES
+    )
 
 
 class RouteResponse(BaseModel):
     route: dict
     delhi_optimized: bool
     safety_score: float
-    hazards: List[str]
+    hazards: List[Dict]
     bike_lane_percentage: float
     distance: float
     duration: float
+    alternatives: Optional[List[Dict]] = None
+
+
+class ProfilingConfig(BaseModel):
+    rate: float = Field(..., ge=0, le=1)  # Share of requests to profile
+    mode: ProfilerMode = ProfilerMode.SAMPLING
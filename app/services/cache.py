@@ -0,0 +1,208 @@
+"""
+Two-tier route response cache
+In-process LRU in front of Redis, keyed on grid-snapped coordinates, the
+avoid set, monsoon mode and the zone data version
+"""
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+import orjson
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from app.core.config import settings
+from app.core.constants import ZoneType
+from app.core import responses
+from app.core.lifecycle import lifecycle
+from app.utils.geospatial import geo_utils
+
+logger = logging.getLogger(__name__)
+
+
+class ShortLived:
+    """
+    A computed value to cache for ROUTE_CACHE_DEGRADED_TTL only, e.g. an
+    answer degraded under load that shouldn't outlive the load
+    """
+
+    def __init__(self, value: Any):
+        self.value = value
+
+
+class RouteCache:
+    def __init__(self):
+        self.redis: Optional[Redis] = None
+        self._local: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self._version = geo_utils.version
+        self.hits = 0
+        self.misses = 0
+
+    async def _startup(self):
+        """Connect to Redis (the in-process tier works without it)"""
+        if settings.ROUTE_CACHE_ENABLED:
+            self.redis = Redis.from_url(str(settings.REDIS_URL))
+
+    async def _shutdown(self):
+        """Close the Redis connection"""
+        if self.redis:
+            await self.redis.aclose()
+
+    def make_key(
+        self,
+        start: Tuple[float, float],
+        end: Tuple[float, float],
+        avoid: List[ZoneType],
+        monsoon_mode: bool,
+    ) -> str:
+        """Build a cache key from snapped coordinates and routing options"""
+        grid = settings.ROUTE_CACHE_GRID
+        snapped = ";".join(
+            f"{round(lon / grid) * grid:.6f},{round(lat / grid) * grid:.6f}"
+            for lon, lat in (start, end)
+        )
+        avoided = ",".join(sorted({str(zone) for zone in avoid}))
+        return f"route:{geo_utils.version}:{snapped}:{avoided}:{int(monsoon_mode)}"
+
+    async def get_or_compute(self, key: str, compute: Callable[[], Awaitable[Any]]):
+        """
+        Return the cached value for key, or compute and store it.
+        Concurrent callers for the same key share a single computation.
+        `compute` may return a ShortLived value to cache it only briefly.
+        """
+        if not settings.ROUTE_CACHE_ENABLED:
+            return self._unwrap(await compute())[0]
+
+        self._check_version()
+        value = self._get_local(key)
+        if value is not None:
+            self.hits += 1
+            return value
+
+        task = self._inflight.get(key)
+        if task is not None:
+            self.hits += 1  # Coalesced onto an in-flight computation
+        else:
+            task = asyncio.ensure_future(self._load(key, compute))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        # Shield so one cancelled caller doesn't cancel the shared work
+        return await asyncio.shield(task)
+
+    async def get(self, key: str) -> Optional[Any]:
+        """Cached value for key from either tier, or None"""
+        if not settings.ROUTE_CACHE_ENABLED:
+            return None
+
+        self._check_version()
+        value = self._get_local(key)
+        if value is None:
+            value, ttl = await self._get_remote(key)
+            if value is not None:
+                self._set_local(key, value, ttl)
+        if value is not None:
+            self.hits += 1
+        else:
+            self.misses += 1
+        return value
+
+    async def set(self, key: str, value: Any):
+        """
+        Store a value computed outside get_or_compute in both tiers
+        (wrap it in ShortLived to cache it only briefly)
+        """
+        if not settings.ROUTE_CACHE_ENABLED:
+            return
+        self._check_version()
+        value, ttl = self._unwrap(value)
+        if ttl:
+            self._set_local(key, value, ttl)
+            await self._set_remote(key, value, ttl)
+
+    @staticmethod
+    def _unwrap(value: Any) -> Tuple[Any, int]:
+        """The value to cache and its TTL (0: don't cache)"""
+        if isinstance(value, ShortLived):
+            return value.value, settings.ROUTE_CACHE_DEGRADED_TTL
+        return value, settings.REDIS_CACHE_TTL
+
+    def _check_version(self):
+        if self._version != geo_utils.version:
+            # Zone data changed: entries for the old version can never hit again
+            self._version = geo_utils.version
+            self.clear()
+
+    async def _load(self, key: str, compute: Callable[[], Awaitable[Any]]):
+        value, ttl = await self._get_remote(key)
+        if value is not None:
+            self.hits += 1
+        else:
+            self.misses += 1
+            value, ttl = self._unwrap(await compute())
+            if not ttl:
+                return value
+            await self._set_remote(key, value, ttl)
+        self._set_local(key, value, ttl)
+        return value
+
+    def _get_local(self, key: str) -> Optional[Any]:
+        entry = self._local.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._local[key]
+            return None
+        self._local.move_to_end(key)
+        return value
+
+    def _set_local(self, key: str, value: Any, ttl: int):
+        self._local[key] = (time.monotonic() + ttl, value)
+        self._local.move_to_end(key)
+        while len(self._local) > settings.ROUTE_CACHE_LRU_SIZE:
+            self._local.popitem(last=False)
+
+    async def _get_remote(self, key: str) -> Tuple[Optional[Any], int]:
+        """
+        Value for key from Redis with its remaining TTL, so the in-process
+        copy doesn't outlive it
+        """
+        if not self.redis:
+            return None, 0
+        try:
+            async with self.redis.pipeline(transaction=False) as pipe:
+                cached, ttl = await pipe.get(key).ttl(key).execute()
+        except RedisError as e:
+            logger.warning(f"Route cache read failed: {str(e)}")
+            return None, 0
+        if not cached:
+            return None, 0
+        return orjson.loads(cached), ttl if ttl > 0 else settings.REDIS_CACHE_TTL
+
+    async def _set_remote(self, key: str, value: Any, ttl: int):
+        if not self.redis:
+            return
+        try:
+            await self.redis.set(key, responses.dumps(value), ex=ttl)
+        except RedisError as e:
+            logger.warning(f"Route cache write failed: {str(e)}")
+
+    def clear(self):
+        """Drop the in-process tier (Redis entries expire via the version key)"""
+        self._local.clear()
+
+    @property
+    def hit_ratio(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+# Shared route cache (manage lifecycle with FastAPI events)
+route_cache = RouteCache()
+lifecycle.add_resource(
+    name="route_cache", startup=route_cache._startup, shutdown=route_cache._shutdown
+)
@@ -2,7 +2,8 @@
 Delhi Route Optimizer
 """
 
-from typing import List, Dict, Tuple
+from typing import List, Dict, Tuple, FrozenSet
+import numpy as np
 from app.core.constants import ZoneType
 from app.utils.geospatial import geo_utils
 
@@ -25,100 +26,127 @@ class DelhiRouteOptimizer:
         """
         Enhance OSRM route with Delhi-specific optimizations
         Args:
-            osrm_route: Standard OSRM route response (v5 format)
+            osrm_route: Standard OSRM route response (v5 format), optionally
+                already scored by the routing service
         Returns:
             Enhanced route with safety metadata
         """
         if not osrm_route:
             return {}
 
-        # Extract coordinates from OSRM response
-        coordinates = self._get_coordinates(osrm_route)
-        if not coordinates:
-            return osrm_route  # Return original if no geometry
-
-        # Calculate enhancements
-        safety_score = await self._calc_safety_score(coordinates)
-        hazards = await self._find_hazards(coordinates)
-        bike_lane_pct = await self._calc_bike_lane_usage(coordinates)
+        # Reuse the single-pass scoring result when the router already has it
+        metadata = osrm_route.get("delhi_metadata", {}).get("optimizer")
+        if metadata is None:
+            # Extract coordinates from OSRM response
+            coordinates = self._get_coordinates(osrm_route)
+            if not coordinates:
+                return osrm_route  # Return original if no geometry
+            coords = np.asarray(coordinates, dtype=float)
+            metadata = self.route_metadata(
+                coords,
+                geo_utils.zone_membership(coords, self.zone_types),
+                geo_utils.zone_lengths([coords], self.zone_types)[0],
+            )
 
         # Return enhanced route
         return {
             "route": osrm_route,  # Keep original OSRM data
             "delhi_optimized": True,
-            "safety_score": round(safety_score, 2),
-            "hazards": hazards,
-            "bike_lane_percentage": bike_lane_pct,
+            **metadata,
             "distance": osrm_route.get("distance", 0),
             "duration": osrm_route.get("duration", 0),
         }
 
+    @property
+    def zone_types(self) -> List[ZoneType]:
+        """Zone layers the optimizer needs membership for"""
+        return [*self.risk_factors, *self.positive_factors]
+
+    def route_metadata(
+        self,
+        coords: np.ndarray,
+        membership: Dict[ZoneType, np.ndarray],
+        lengths: Dict[FrozenSet[ZoneType], float],
+    ) -> Dict:
+        """
+        Derive optimizer metadata from precomputed zone membership (hazard
+        locations) and metres ridden per zone combination (scores)
+        """
+        return {
+            "safety_score": round(self._calc_safety_score(lengths), 2),
+            "hazards": self._find_hazards(coords, membership),
+            "bike_lane_percentage": self._calc_bike_lane_usage(lengths),
+        }
+
     def _get_coordinates(self, route: Dict) -> List[Tuple[float, float]]:
         """Extract coordinates from OSRM response"""
         if "geometry" in route and "coordinates" in route["geometry"]:
             return [(lon, lat) for lon, lat in route["geometry"]["coordinates"]]
         return []
 
-    async def _calc_safety_score(self, coords: List[Tuple[float, float]]) -> float:
-        """Calculate route safety (0-1 scale)"""
-        if not coords:
-            return 0.5  # Neutral score for empty routes
-
-        sample_rate = max(1, len(coords) // 20)  # Sample every ~5%
-        total_score = 0
-        sample_count = 0
+    def _membership(
+        self, membership: Dict[ZoneType, np.ndarray], zone_type: ZoneType, n: int
+    ) -> np.ndarray:
+        mask = membership.get(zone_type)
+        return mask if mask is not None else np.zeros(n, dtype=bool)
 
-        for i in range(0, len(coords), sample_rate):
-            lon, lat = coords[i]
-            point_score = 1.0  # Start with perfect score
-
-            # Deduct for each hazard type found
-            for hazard, weight in self.risk_factors.items():
-                if geo_utils.is_in_zone(lon, lat, hazard):
-                    point_score -= weight
-
-            # Add bonuses
-            for zone_type, bonus in self.positive_factors.items():
-                if geo_utils.is_in_zone(lon, lat, zone_type.value):
-                    point_score += bonus
-
-            total_score += max(0, point_score)  # Don't go below 0
-            sample_count += 1
-
-        return total_score / sample_count if sample_count else 0
+    def _calc_safety_score(self, lengths: Dict[FrozenSet[ZoneType], float]) -> float:
+        """Calculate route safety (0-1 scale), weighted by metres ridden"""
+        total = sum(lengths.values())
+        if not total:
+            return 0.5  # Neutral score for empty routes
 
-    async def _find_hazards(self, coords: List[Tuple[float, float]]) -> List[Dict]:
+        score = 0.0
+        for zones, metres in lengths.items():
+            # Deduct for each hazard type, add bonuses, don't go below 0
+            stretch = 1.0 - sum(
+                weight
+                for hazard, weight in self.risk_factors.items()
+                if hazard in zones
+            )
+            stretch += sum(
+                bonus
+                for zone_type, bonus in self.positive_factors.items()
+                if zone_type in zones
+            )
+            score += max(stretch, 0.0) * metres
+        return score / total
+
+    def _find_hazards(
+        self, coords: np.ndarray, membership: Dict[ZoneType, np.ndarray]
+    ) -> List[Dict]:
         """Identify hazards along the route"""
         hazards = []
-        sample_rate = max(1, len(coords) // 10)  # Check every ~10%
+        n = len(coords)
+        sample_rate = max(1, n // 10)  # Check every ~10%
 
-        for i in range(0, len(coords), sample_rate):
-            lon, lat = coords[i]
-            for hazard in self.risk_factors:
-                if geo_utils.is_in_zone(lon, lat, hazard):
+        sampled = {
+            hazard: self._membership(membership, hazard, n)
+            for hazard in self.risk_factors
+        }
+        for i in range(0, n, sample_rate):
+            lon, lat = coords[i].tolist()
+            for hazard, mask in sampled.items():
+                if mask[i]:
                     hazards.append(
                         {
-                            "type": hazard,
+                            "type": str(hazard),
                             "location": {"lat": lat, "lon": lon},
-                            "distance_along": i / len(coords),  # 0-1 ratio
+                            "distance_along": i / n,  # 0-1 ratio
                         }
                     )
         return hazards
 
-    async def _calc_bike_lane_usage(self, coords: List[Tuple[float, float]]) -> float:
-        """Calculate percentage of route with bike lanes"""
-        if not coords:
+    def _calc_bike_lane_usage(self, lengths: Dict[FrozenSet[ZoneType], float]) -> float:
+        """Calculate percentage of route distance on bike lanes"""
+        total = sum(lengths.values())
+        if not total:
             return 0.0
 
-        bike_lane_count = 0
-        sample_rate = max(1, len(coords) // 20)  # Sample every ~5%
-
-        for i in range(0, len(coords), sample_rate):
-            lon, lat = coords[i]
-            if geo_utils.is_in_zone(lon, lat, ZoneType.BIKE_LANE):
-                bike_lane_count += 1
-
-        return (bike_lane_count / (len(coords) / sample_rate)) * 100
+        on_lanes = sum(
+            metres for zones, metres in lengths.items() if ZoneType.BIKE_LANE in zones
+        )
+        return (on_lanes / total) * 100
 
 
 # Ready-to-use instance
@@ -0,0 +1,122 @@
+"""
+In-process risk-weighted routing
+Answers hazard-avoiding route requests from the compact road graph
+(app.utils.roadgraph) when ROUTING_ENGINE=graph: the route minimizing
+risk-weighted cost, plus the plain shortest route as an alternative.
+Routes are shaped like OSRM's so the usual scoring and shaping apply.
+"""
+
+from typing import Dict, List, Optional, Tuple
+import logging
+import threading
+from app.core.config import settings
+from app.core.constants import ZoneType
+from app.utils.geospatial import geo_utils
+from app.utils.roadgraph import RoadGraph
+
+logger = logging.getLogger(__name__)
+
+
+def find_routes(
+    start: Tuple[float, float], end: Tuple[float, float], avoid: List[ZoneType]
+) -> Optional[List[Dict]]:
+    """Module-level entry point so process-mode executors pickle it by name"""
+    return graph_router.routes(start, end, avoid)
+
+
+class GraphRouter:
+    def __init__(self):
+        self._graph: Optional[RoadGraph] = None
+        self._graph_loaded = False
+        # Scoring threads share the graph; one loads or reclassifies it
+        self._lock = threading.Lock()
+
+    @property
+    def graph(self) -> Optional[RoadGraph]:
+        """Road graph, loaded on first use and reclassified if zones changed"""
+        graph = self._graph
+        if self._graph_loaded and (
+            graph is None or graph.version == geo_utils.version
+        ):
+            return graph
+        with self._lock:
+            return self._load_graph()
+
+    def _load_graph(self) -> Optional[RoadGraph]:
+        """Load and/or reclassify the graph (holding the lock)"""
+        if not self._graph_loaded:
+            try:
+                self._graph = RoadGraph.from_file(settings.ROAD_GRAPH_PATH)
+            except FileNotFoundError:
+                logger.warning(
+                    f"No road graph at {settings.ROAD_GRAPH_PATH}, routing with OSRM"
+                )
+            else:
+                logger.info(
+                    f"Loaded road graph: {len(self._graph)} nodes, "
+                    f"{len(self._graph.heads)} edges"
+                )
+            self._graph_loaded = True
+        graph = self._graph
+        snapshot = geo_utils.snapshot
+        if graph is not None and graph.version != snapshot.version:
+            logger.info(
+                f"Reclassifying road graph edges for zones {snapshot.version} "
+                f"(built for {graph.version})"
+            )
+            # Swapped in whole: concurrent routes keep the masks and costs
+            # they started with
+            graph.zones = graph.classify(snapshot)
+        return graph
+
+    def routes(
+        self,
+        start: Tuple[float, float],
+        end: Tuple[float, float],
+        avoid: List[ZoneType],
+    ) -> Optional[List[Dict]]:
+        """
+        OSRM-shaped routes between two (lon, lat) points (CPU-bound), or
+        None when the graph is missing or can't connect them
+        """
+        graph = self.graph
+        if graph is None:
+            return None
+        source = graph.nearest(*start, settings.ROAD_GRAPH_SNAP_DISTANCE)
+        target = graph.nearest(*end, settings.ROAD_GRAPH_SNAP_DISTANCE)
+        if source is None or target is None:
+            return None
+
+        costs = graph.zones.edge_costs(avoid, settings.ROAD_GRAPH_RISK_WEIGHT)
+        safest = graph.shortest_path(source, target, costs)
+        if safest is None:
+            return None
+        if costs is graph.lengths:  # Nothing on the graph to avoid
+            return [self._route(graph, safest, "distance")]
+
+        routes = [self._route(graph, safest, "risk")]
+        shortest = graph.shortest_path(source, target, graph.lengths)
+        if shortest is not None and shortest != safest:
+            routes.append(self._route(graph, shortest, "distance"))
+        return routes
+
+    @staticmethod
+    def _route(graph: RoadGraph, path: List[int], weight_name: str) -> Dict:
+        distance = graph.path_metres(path)
+        duration = distance / settings.ROAD_GRAPH_CYCLING_SPEED
+        leg = {"distance": distance, "duration": duration, "summary": "", "steps": []}
+        return {
+            "geometry": {
+                "type": "LineString",
+                "coordinates": graph.coords[path].tolist(),
+            },
+            "distance": distance,
+            "duration": duration,
+            "weight": duration,
+            "weight_name": weight_name,
+            "legs": [leg],
+        }
+
+
+# Shared graph router (the road graph loads lazily, once per process)
+graph_router = GraphRouter()
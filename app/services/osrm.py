@@ -0,0 +1,366 @@
+"""
+Async OSRM HTTP client
+Tunable connection pool with keep-alive and DNS caching, per-phase timeouts,
+retries with jittered backoff and optional hedged requests, load balanced
+across a pool of regional OSRM backends with active health checks
+"""
+
+import asyncio
+import logging
+import random
+import time
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlencode, urljoin
+
+import aiohttp
+import numpy as np
+import orjson
+from fastapi import HTTPException
+
+from app.core.config import OSRMBackend, settings
+
+logger = logging.getLogger(__name__)
+
+
+class Backend:
+    """Runtime state of one OSRM backend"""
+
+    def __init__(self, config: OSRMBackend):
+        self.url = str(config.url)
+        self.region = config.region
+        self.bbox = config.bbox
+        self.outstanding = 0
+        self.failures = 0
+        self.healthy = True
+
+    @property
+    def area(self) -> float:
+        if self.bbox is None:
+            return float("inf")
+        return (self.bbox["max_lon"] - self.bbox["min_lon"]) * (
+            self.bbox["max_lat"] - self.bbox["min_lat"]
+        )
+
+    def covers(self, points: List[Tuple[float, float]]) -> bool:
+        """Check if every (lon, lat) falls inside this backend's region"""
+        if self.bbox is None:
+            return True
+        return all(
+            self.bbox["min_lon"] <= lon <= self.bbox["max_lon"]
+            and self.bbox["min_lat"] <= lat <= self.bbox["max_lat"]
+            for lon, lat in points
+        )
+
+    def record_failure(self):
+        self.failures += 1
+        if self.healthy and self.failures >= settings.OSRM_HEALTH_CHECK_FAILURES:
+            self.healthy = False
+            logger.warning(f"Ejecting OSRM backend {self.url} ({self.region})")
+
+    def record_success(self):
+        if not self.healthy:
+            logger.info(f"Restoring OSRM backend {self.url} ({self.region})")
+        self.failures = 0
+        self.healthy = True
+
+
+class OSRMClient:
+    def __init__(self):
+        self.session: Optional[aiohttp.ClientSession] = None
+        self.backends = [Backend(config) for config in settings.osrm_backends]
+        self._health_task: Optional[asyncio.Task] = None
+        self._latencies = deque(maxlen=512)  # Recent successful round trips (s)
+        self._hedge_delay = settings.OSRM_HEDGE_MIN_DELAY
+        self.in_flight = 0
+        self.requests = 0
+        self.retries = 0
+        self.hedged = 0
+        # Admission control: identical in-flight calls are shared, the rest
+        # wait for one of OSRM_MAX_CONCURRENCY upstream slots
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._slots = asyncio.Semaphore(settings.OSRM_MAX_CONCURRENCY)
+        self.coalesced = 0
+        self.degraded = 0
+        self.shed = 0
+
+    async def _startup(self):
+        """Initialize the pooled aiohttp client session and health checks"""
+        self._slots = asyncio.Semaphore(settings.OSRM_MAX_CONCURRENCY)
+        self.session = aiohttp.ClientSession(
+            timeout=aiohttp.ClientTimeout(
+                total=settings.OSRM_TOTAL_TIMEOUT,
+                connect=settings.OSRM_CONNECT_TIMEOUT,
+                sock_read=settings.OSRM_READ_TIMEOUT,
+            ),
+            connector=aiohttp.TCPConnector(
+                limit=settings.OSRM_POOL_SIZE,
+                limit_per_host=settings.OSRM_POOL_SIZE_PER_HOST,
+                ttl_dns_cache=settings.OSRM_DNS_CACHE_TTL,
+                keepalive_timeout=settings.OSRM_KEEPALIVE_TIMEOUT,
+            ),
+        )
+        if settings.OSRM_HEALTH_CHECK_INTERVAL:
+            self._health_task = asyncio.create_task(self._health_check_loop())
+
+    async def _shutdown(self):
+        """Cleanup health checks and the aiohttp client session"""
+        if self._health_task:
+            self._health_task.cancel()
+        if self.session:
+            await self.session.close()
+
+    async def get(
+        self, path: str, params: Dict, points: List[Tuple[float, float]]
+    ) -> Dict:
+        """
+        GET an OSRM endpoint path on the best backend for `points` and return
+        the decoded JSON body (shared between coalesced callers: don't
+        mutate it). Concurrent identical requests share one upstream call.
+        Beyond OSRM_MAX_CONCURRENCY requests queue; past OSRM_DEGRADE_QUEUE
+        queued requests, route queries drop alternatives (the body is then
+        marked `"degraded": true`), and past OSRM_MAX_QUEUE new requests
+        are shed with 429.
+        """
+        key = self._request_key(path, params)
+        task = self._inflight.get(key)
+        degraded = False
+        if task is None:
+            params, degraded = self._admit(params)
+            key = self._request_key(path, params)
+            task = self._inflight.get(key)
+        if task is not None:
+            self.coalesced += 1
+        else:
+            task = asyncio.ensure_future(self._limited_get(path, params, points))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        # Shield so one cancelled caller doesn't cancel the shared request
+        data = await asyncio.shield(task)
+        return {**data, "degraded": True} if degraded else data
+
+    @staticmethod
+    def _request_key(path: str, params: Dict) -> str:
+        return path + "?" + urlencode(sorted((k, str(v)) for k, v in params.items()))
+
+    @property
+    def queued(self) -> int:
+        """Distinct upstream requests waiting for a concurrency slot"""
+        return max(0, len(self._inflight) - settings.OSRM_MAX_CONCURRENCY)
+
+    def _admit(self, params: Dict) -> Tuple[Dict, bool]:
+        """
+        Shed or degrade a new upstream request based on queue depth,
+        returning the params to send and whether they were degraded
+        """
+        if self.queued >= settings.OSRM_MAX_QUEUE:
+            self.shed += 1
+            raise HTTPException(
+                status_code=429,
+                detail="Routing service busy, try again shortly",
+                headers={"Retry-After": "1"},
+            )
+        if (
+            settings.OSRM_DEGRADE_QUEUE
+            and self.queued >= settings.OSRM_DEGRADE_QUEUE
+            and params.get("alternatives") == "true"
+        ):
+            # A single route is much cheaper for osrm-routed to compute
+            self.degraded += 1
+            return {**params, "alternatives": "false"}, True
+        return params, False
+
+    async def _limited_get(
+        self, path: str, params: Dict, points: List[Tuple[float, float]]
+    ) -> Dict:
+        async with self._slots:
+            return await self._get_with_retries(path, params, points)
+
+    async def _get_with_retries(
+        self, path: str, params: Dict, points: List[Tuple[float, float]]
+    ) -> Dict:
+        """
+        Retry timeouts, connection errors and 5xx responses with jittered
+        exponential backoff; 4xx responses fail immediately
+        """
+        for attempt in range(settings.OSRM_RETRIES + 1):
+            try:
+                if settings.OSRM_HEDGE_ENABLED:
+                    return await self._hedged_get(path, params, points)
+                return await self._get(path, params, points)
+            except (asyncio.TimeoutError, aiohttp.ClientError, _RetryableError) as e:
+                if attempt == settings.OSRM_RETRIES:
+                    if isinstance(e, asyncio.TimeoutError):
+                        logger.warning("OSRM request timed out")
+                        raise HTTPException(
+                            status_code=504, detail="Routing service timeout"
+                        )
+                    raise RuntimeError(f"OSRM error: {str(e)}")
+                self.retries += 1
+                backoff = settings.OSRM_RETRY_BACKOFF * 2**attempt
+                await asyncio.sleep(random.uniform(0, backoff))
+
+    async def _hedged_get(
+        self, path: str, params: Dict, points: List[Tuple[float, float]]
+    ) -> Dict:
+        """
+        Fire a second request if the first hasn't answered within the recent
+        p95 latency, and return whichever succeeds first
+        """
+        primary = asyncio.ensure_future(self._get(path, params, points))
+        done, _ = await asyncio.wait({primary}, timeout=self._hedge_delay)
+        if done:
+            return primary.result()
+
+        # The hedge goes to the least-loaded replica, usually a different one
+        self.hedged += 1
+        pending = {primary, asyncio.ensure_future(self._get(path, params, points))}
+        try:
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    if not task.exception():
+                        return task.result()
+                if not pending:
+                    # Both attempts failed: surface the error
+                    return done.pop().result()
+        finally:
+            for task in pending:
+                task.cancel()
+
+    def select_backend(self, points: List[Tuple[float, float]]) -> Backend:
+        """
+        Pick the most specific region covering every point, then the healthy
+        replica in it with the fewest outstanding requests. If every covering
+        backend is ejected, try them anyway rather than refusing outright.
+        """
+        covering = [backend for backend in self.backends if backend.covers(points)]
+        if not covering:
+            raise HTTPException(
+                status_code=503, detail="No routing backend available for this area"
+            )
+        healthy = [backend for backend in covering if backend.healthy] or covering
+        smallest = min(backend.area for backend in healthy)
+        return min(
+            (backend for backend in healthy if backend.area == smallest),
+            key=lambda backend: backend.outstanding,
+        )
+
+    async def _get(
+        self, path: str, params: Dict, points: List[Tuple[float, float]]
+    ) -> Dict:
+        backend = self.select_backend(points)
+        backend.outstanding += 1
+        self.in_flight += 1
+        self.requests += 1
+        started = time.monotonic()
+        try:
+            async with self.session.get(
+                urljoin(backend.url, path), params=params
+            ) as response:
+                if response.status >= 500:
+                    self._record_live_failure(backend)
+                    raise _RetryableError(await response.text())
+                if response.status != 200:
+                    error_text = await response.text()
+                    raise RuntimeError(f"OSRM error: {error_text}")
+
+                data = orjson.loads(await response.read())
+        except (asyncio.TimeoutError, aiohttp.ClientError):
+            self._record_live_failure(backend)
+            raise
+        finally:
+            backend.outstanding -= 1
+            self.in_flight -= 1
+
+        backend.record_success()
+        self._record_latency(time.monotonic() - started)
+        return data
+
+    def _record_live_failure(self, backend: Backend):
+        """
+        Count a failed request toward ejection only while health checks run:
+        without probes nothing would ever restore the backend
+        """
+        if self._health_task is not None:
+            backend.record_failure()
+
+    def _record_latency(self, latency: float):
+        self._latencies.append(latency)
+        # Refresh the hedge delay periodically rather than on every request
+        if len(self._latencies) % 32 == 0:
+            self._hedge_delay = max(
+                settings.OSRM_HEDGE_MIN_DELAY,
+                float(
+                    np.percentile(self._latencies, settings.OSRM_HEDGE_PERCENTILE)
+                ),
+            )
+
+    async def _health_check_loop(self):
+        """Actively probe every backend, ejecting and restoring as needed"""
+        while True:
+            await asyncio.gather(
+                *(self._health_check(backend) for backend in self.backends)
+            )
+            await asyncio.sleep(settings.OSRM_HEALTH_CHECK_INTERVAL)
+
+    async def _health_check(self, backend: Backend):
+        # Probe /nearest at the centre of the backend's region
+        bbox = backend.bbox or settings.DELHI_BOUNDARY
+        lon = (bbox["min_lon"] + bbox["max_lon"]) / 2
+        lat = (bbox["min_lat"] + bbox["max_lat"]) / 2
+        path = settings.BIKE_NEAREST_URL.format(coordinates=f"{lon},{lat}")
+        url = urljoin(backend.url, path)
+        try:
+            async with self.session.get(
+                url, timeout=aiohttp.ClientTimeout(total=settings.OSRM_CONNECT_TIMEOUT)
+            ) as response:
+                healthy = response.status < 500
+        except (asyncio.TimeoutError, aiohttp.ClientError):
+            healthy = False
+
+        if healthy:
+            backend.record_success()
+        else:
+            backend.record_failure()
+
+    def pool_stats(self) -> Dict:
+        """Connection pool saturation, client counters and backend health"""
+        # Each in-flight request (hedges included) holds a pooled connection
+        # or is waiting for one
+        limit = settings.OSRM_POOL_SIZE
+        acquired = min(self.in_flight, limit) if limit else self.in_flight
+        return {
+            "limit": limit,
+            "limit_per_host": settings.OSRM_POOL_SIZE_PER_HOST,
+            "acquired": acquired,
+            "saturation": acquired / limit if limit else 0.0,
+            "in_flight": self.in_flight,
+            "requests": self.requests,
+            "retries": self.retries,
+            "hedged": self.hedged,
+            "hedge_delay": self._hedge_delay,
+            "queued": self.queued,
+            "coalesced": self.coalesced,
+            "degraded": self.degraded,
+            "shed": self.shed,
+            "backends": [
+                {
+                    "url": backend.url,
+                    "region": backend.region,
+                    "healthy": backend.healthy,
+                    "outstanding": backend.outstanding,
+                }
+                for backend in self.backends
+            ],
+        }
+
+
+class _RetryableError(Exception):
+    """OSRM answered with a 5xx status"""
+
+
+# Shared OSRM client
+osrm_client = OSRMClient()
@@ -3,16 +3,22 @@ Async Delhi bike routing service with OSRM integration
 Uses async/await for non-blocking HTTP requests and database operations
 """
 
-import aiohttp
-from typing import List, Dict, Tuple
+import numpy as np
+import shapely
+from typing import AsyncIterator, List, Dict, Tuple
 from app.core.constants import ZoneType
+from app.core.executor import scoring_executor
 from app.core.lifecycle import lifecycle
-from app.utils.geospatial import geo_utils
-from app.models.schemas import RouteResponse
-from app.core.config import settings
+from app.core.metrics import ROUTE_ERRORS, set_route_labels, timed
+from app.utils.geospatial import ZoneSnapshot, geo_utils
+from app.services.scoring import route_coordinates, score_routes, scoring_engine
+from app.services.cache import ShortLived, route_cache
+from app.services.osrm import osrm_client
+from app.services.graph_router import find_routes
+from app.models.schemas import RouteRequest, RouteResponse
+from app.core.config import RoutingEngine, ScoringMode, settings
 from fastapi import HTTPException
 import logging
-import polyline
 import asyncio
 from functools import partial
 
@@ -23,19 +29,17 @@ class AsyncDelhiBikeRouter:
     def __init__(self):
         self.osrm_url = settings.OSRM_URL
         self.max_alternatives = 3
-        self.session = None  # Will be initialized in startup
+        self.osrm = osrm_client  # Session is initialized in startup
+        self._exclusion_cache: Dict[Tuple[str, Tuple[str, ...]], str] = {}
+        self._exclusion_version = None
 
     async def _startup(self):
-        """Initialize aiohttp client session"""
-        self.session = aiohttp.ClientSession(
-            timeout=aiohttp.ClientTimeout(total=10),
-            connector=aiohttp.TCPConnector(limit_per_host=10),
-        )
+        """Initialize the OSRM client session"""
+        await self.osrm._startup()
 
     async def _shutdown(self):
-        """Cleanup aiohttp client session"""
-        if self.session:
-            await self.session.close()
+        """Cleanup the OSRM client session"""
+        await self.osrm._shutdown()
 
     async def calculate_route(
         self,
@@ -48,16 +52,136 @@ class AsyncDelhiBikeRouter:
         Async calculate optimal bike route through Delhi
         with hazard avoidance and safety scoring
         """
+        avoid = self._normalize_avoid(avoid, monsoon_mode)
+        set_route_labels(avoid, monsoon_mode)
+        key = route_cache.make_key(start, end, avoid, monsoon_mode)
+        return await route_cache.get_or_compute(
+            key, partial(self._compute_route, start, end, avoid)
+        )
+
+    async def stream_route(
+        self,
+        start: Tuple[float, float],
+        end: Tuple[float, float],
+        avoid: List[ZoneType] = None,
+        monsoon_mode: bool = False,
+    ) -> AsyncIterator[Tuple[str, int, Dict]]:
+        """
+        Streaming variant of calculate_route. Yields ("route", index, route)
+        for OSRM's primary route as soon as it is scored, then for the other
+        alternatives as they finish, and ("recommendation", index, route)
+        last. A failing alternative other than the primary yields
+        ("error", index, {"status", "detail"}) and is left out of the
+        recommendation. Complete results are cached like calculate_route's.
+        """
+        avoid = self._normalize_avoid(avoid, monsoon_mode)
+        set_route_labels(avoid, monsoon_mode)
+        key = route_cache.make_key(start, end, avoid, monsoon_mode)
+        cached = await route_cache.get(key)
+        if cached is not None:
+            enhanced_routes, best_route = cached
+            if not enhanced_routes:  # Cached "no route" result
+                raise HTTPException(status_code=404, detail="No route found")
+            for index, route in enumerate(enhanced_routes):
+                yield "route", index, route
+            yield "recommendation", enhanced_routes.index(best_route), best_route
+            return
+
+        try:
+            alternatives, degraded = await self._get_alternatives(start, end, avoid)
+        except Exception as e:
+            raise self._routing_error(e, start, end, avoid)
+        if not alternatives:
+            raise HTTPException(status_code=404, detail="No route found")
+
+        tasks = [
+            asyncio.ensure_future(self._enhance_route(route, avoid))
+            for route in alternatives
+        ]
+        enhanced_routes: List[Dict] = [None] * len(tasks)
+        try:
+            # Primary route first, then alternatives in completion order
+            try:
+                enhanced_routes[0] = await tasks[0]
+            except Exception as e:
+                raise self._routing_error(e, start, end, avoid)
+            yield "route", 0, enhanced_routes[0]
+
+            pending = {task: index for index, task in enumerate(tasks[1:], 1)}
+            while pending:
+                done, _ = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in sorted(done, key=pending.get):
+                    index = pending.pop(task)
+                    try:
+                        enhanced_routes[index] = task.result()
+                    except Exception as e:
+                        # The primary route is out already: report just this
+                        # alternative and carry on with the rest
+                        error = self._routing_error(e, start, end, avoid)
+                        yield "error", index, {
+                            "status": error.status_code,
+                            "detail": error.detail,
+                        }
+                        continue
+                    yield "route", index, enhanced_routes[index]
+        finally:
+            for task in tasks:
+                task.cancel()
+
+        scored = [route for route in enhanced_routes if route is not None]
+        with timed("select"):
+            best_route = self._select_best_route(scored)
+        if len(scored) == len(enhanced_routes):
+            result = (enhanced_routes, best_route)
+            await route_cache.set(key, ShortLived(result) if degraded else result)
+        yield "recommendation", enhanced_routes.index(best_route), best_route
+
+    @staticmethod
+    def _routing_error(
+        error: Exception,
+        start: Tuple[float, float],
+        end: Tuple[float, float],
+        avoid: List[ZoneType],
+    ) -> HTTPException:
+        """Count a routing failure, as an HTTPException (503 if unexpected)"""
+        if isinstance(error, HTTPException):
+            ROUTE_ERRORS.labels(error.status_code).inc()
+            return error
+        ROUTE_ERRORS.labels(503).inc()
+        logger.error(
+            f"Routing failed for {start} -> {end} (avoid={avoid}): "
+            f"{type(error).__name__}: {str(error)}"
+        )
+        return HTTPException(
+            status_code=503, detail="Route calculation service unavailable"
+        )
+
+    @staticmethod
+    def _normalize_avoid(avoid: List[ZoneType], monsoon_mode: bool) -> List[ZoneType]:
         if not avoid:
             avoid = []
 
         # Auto-enable waterlogging avoidance during monsoon
         if monsoon_mode and ZoneType.WATERLOGGING not in avoid:
             avoid.append(ZoneType.WATERLOGGING)
+        return avoid
 
+    async def _compute_route(
+        self,
+        start: Tuple[float, float],
+        end: Tuple[float, float],
+        avoid: List[ZoneType],
+    ):
+        """
+        Fetch, score and rank alternatives (uncached). Returns
+        (enhanced routes, best route), wrapped in ShortLived when OSRM
+        dropped the alternatives under load.
+        """
         try:
-            # Step 1: Get raw routes from OSRM (async)
-            alternatives = await self._get_osrm_alternatives(start, end, avoid)
+            # Step 1: Get raw routes from the road graph or OSRM (async)
+            alternatives, degraded = await self._get_alternatives(start, end, avoid)
 
             # Step 2: Parallel route enhancement (async)
             enhance_tasks = [
@@ -65,28 +189,148 @@ class AsyncDelhiBikeRouter:
             ]
             enhanced_routes = await asyncio.gather(*enhance_tasks)
 
-            # Step 3: Select best route (CPU-bound, run in thread)
-            loop = asyncio.get_running_loop()
-            best_route = await loop.run_in_executor(
-                None, partial(self._select_best_route, enhanced_routes)
-            )
+            # Step 3: Select best route (cheap, not worth an executor hop)
+            with timed("select"):
+                best_route = self._select_best_route(enhanced_routes)
 
-            return (enhanced_routes, best_route)
+            result = (enhanced_routes, best_route)
+            return ShortLived(result) if degraded else result
 
         except Exception as e:
-            logger.error(f"Routing failed: {str(e)}")
-            raise HTTPException(
-                status_code=503, detail="Route calculation service unavailable"
+            raise self._routing_error(e, start, end, avoid)
+
+    async def calculate_routes_batch(
+        self, requests: List[RouteRequest]
+    ) -> AsyncIterator[Tuple[int, Dict]]:
+        """
+        Route many origin-destination pairs, yielding (index, best route)
+        in completion order. OSRM calls share the session with bounded
+        concurrency; responses that are ready together are scored in one
+        batched zone-membership pass. Failed pairs yield an HTTPException.
+        """
+        semaphore = asyncio.Semaphore(settings.BATCH_MAX_CONCURRENCY)
+        queue: asyncio.Queue = asyncio.Queue()
+
+        async def fetch(index: int, request: RouteRequest):
+            avoid = list(request.avoid or [])
+            set_route_labels(avoid, False)
+            try:
+                async with semaphore:
+                    alternatives, _ = await self._get_alternatives(
+                        (request.start_lon, request.start_lat),
+                        (request.end_lon, request.end_lat),
+                        avoid,
+                    )
+                await queue.put((index, avoid, alternatives, None))
+            except Exception as e:
+                await queue.put((index, avoid, [], e))
+
+        tasks = [
+            asyncio.create_task(fetch(index, request))
+            for index, request in enumerate(requests)
+        ]
+        try:
+            remaining = len(tasks)
+            while remaining:
+                # Take whatever has completed so far as one scoring batch
+                batch = [await queue.get()]
+                while not queue.empty():
+                    batch.append(queue.get_nowait())
+                remaining -= len(batch)
+
+                for result in await self._score_batch(batch):
+                    yield result
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def _score_batch(self, batch: List[Tuple]) -> List[Tuple[int, Dict]]:
+        """Score all alternatives of a batch of OSRM responses"""
+        routes, coordinates, avoids = [], [], []
+        for index, avoid, alternatives, error in batch:
+            for route in alternatives if error is None else []:
+                routes.append((index, route))
+                coordinates.append(route_coordinates(route))
+                avoids.append(avoid)
+
+        enhanced: Dict[int, List[Dict]] = {}
+        try:
+            with timed("scoring"):
+                metadata = await scoring_executor.run(
+                    score_routes,
+                    [route for _, route in routes],
+                    coordinates,
+                    avoids,
+                )
+        except Exception as e:
+            # Fail just this batch's pairs (e.g. the executor shedding with
+            # 503); the stream has started, so raising would truncate it
+            scored = {index for index, _ in routes}
+            batch = [
+                (index, avoid, alternatives, e if index in scored else error)
+                for index, avoid, alternatives, error in batch
+            ]
+            metadata = []
+        for (index, route), coords, delhi_metadata in zip(
+            routes, coordinates, metadata
+        ):
+            enhanced.setdefault(index, []).append(
+                {
+                    **self._without_annotations(route),
+                    "delhi_metadata": delhi_metadata,
+                    "coordinates": coords,
+                }
             )
 
+        results = []
+        for index, _, _, error in batch:
+            if error is not None:
+                logger.error(f"Batch routing failed for #{index}: {str(error)}")
+                if not isinstance(error, HTTPException):
+                    error = HTTPException(
+                        status_code=503,
+                        detail="Route calculation service unavailable",
+                    )
+                ROUTE_ERRORS.labels(error.status_code).inc()
+                results.append((index, error))
+            elif not enhanced.get(index):
+                results.append(
+                    (index, HTTPException(status_code=404, detail="No route found"))
+                )
+            else:
+                with timed("select"):
+                    best_route = self._select_best_route(enhanced[index])
+                results.append((index, best_route))
+        return results
+
+    async def _get_alternatives(
+        self,
+        start: Tuple[float, float],
+        end: Tuple[float, float],
+        avoid: List[ZoneType],
+    ) -> Tuple[List[Dict], bool]:
+        """
+        Route alternatives for requests avoiding hazards come from the
+        in-process road graph when configured, falling back to OSRM if the
+        graph can't answer. Everything else is routed by OSRM. Also returns
+        whether OSRM degraded the request to a single route under load.
+        """
+        if settings.ROUTING_ENGINE == RoutingEngine.GRAPH and avoid:
+            with timed("graph"):
+                routes = await scoring_executor.run(find_routes, start, end, avoid)
+            if routes:
+                return routes, False
+        return await self._get_osrm_alternatives(start, end, avoid)
+
     async def _get_osrm_alternatives(
         self,
         start: Tuple[float, float],
         end: Tuple[float, float],
         avoid: List[ZoneType],
-    ) -> List[Dict]:
+    ) -> Tuple[List[Dict], bool]:
         """
-        Async fetch route alternatives from OSRM with Delhi-specific parameters
+        Async fetch route alternatives from OSRM with Delhi-specific
+        parameters, and whether they were degraded to a single route
         """
         coordinates = f"{start[0]},{start[1]};{end[0]},{end[1]}"
         params = {
@@ -95,151 +339,227 @@ class AsyncDelhiBikeRouter:
             "geometries": "geojson",
             "overview": "full",
         }
-
-        # Add Delhi-specific avoids (async)
-        exclude_polygons = []
-        if ZoneType.WATERLOGGING in avoid:
-            exclude_polygons.extend(
-                await self._get_exclusion_polygons(ZoneType.WATERLOGGING)
+        if (
+            settings.SCORING_MODE == ScoringMode.ANNOTATIONS
+            and scoring_engine.node_table_current
+        ):
+            # Scored from node annotations, so the overview is only for
+            # display. Without a current node table scoring falls back to
+            # the geometry, which then needs every vertex.
+            params["annotations"] = "nodes,distance"
+            params["overview"] = "simplified"
+
+        # Add Delhi-specific avoids (compiled once per zone version/avoid set)
+        exclude = await self._get_exclusion_param(avoid)
+        if exclude:
+            params["exclude"] = exclude
+
+        with timed("osrm"):
+            data = await self._osrm_request(
+                settings.BIKE_ROUTING_URL.format(coordinates=coordinates),
+                params,
+                [start, end],
             )
-        if ZoneType.THEFT in avoid:
-            exclude_polygons.extend(await self._get_exclusion_polygons(ZoneType.THEFT))
+        return data.get("routes", []), data.get("degraded", False)
+
+    async def _osrm_request(
+        self, path: str, params: Dict, points: List[Tuple[float, float]]
+    ) -> Dict:
+        """
+        Async GET against the OSRM backend covering `points`,
+        returning the decoded JSON body
+        """
+        return await self.osrm.get(path, params, points)
 
-        if exclude_polygons:
-            params["exclude"] = ",".join(exclude_polygons)
+    async def calculate_matrix(
+        self,
+        sources: List[Tuple[float, float]],
+        destinations: List[Tuple[float, float]],
+        safety_weight: float = 0.0,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Many-to-many (durations, distances) matrices via OSRM's table service.
+        Large matrices are split into chunks under OSRM_TABLE_MAX_SIZE that run
+        concurrently and are stitched back together. With safety_weight > 0,
+        each duration is scaled by 1 + safety_weight * mean endpoint risk from
+        the precomputed zone-risk grid. This is an endpoint-only approximation:
+        the table service returns no geometry, so zones crossed between the
+        endpoints don't count. Unreachable cells are NaN.
+        """
+        durations = np.full((len(sources), len(destinations)), np.nan, np.float32)
+        distances = np.full_like(durations, np.nan)
+
+        # Each chunk request carries its sources and destinations
+        chunk = max(1, settings.OSRM_TABLE_MAX_SIZE // 2)
+        blocks = [
+            (i, j)
+            for i in range(0, len(sources), chunk)
+            for j in range(0, len(destinations), chunk)
+        ]
+        semaphore = asyncio.Semaphore(settings.BATCH_MAX_CONCURRENCY)
+
+        async def fetch(i: int, j: int):
+            src, dst = sources[i : i + chunk], destinations[j : j + chunk]
+            async with semaphore:
+                data = await self._get_osrm_table(src, dst)
+            durations[i : i + len(src), j : j + len(dst)] = self._table_array(
+                data.get("durations"), len(src), len(dst)
+            )
+            distances[i : i + len(src), j : j + len(dst)] = self._table_array(
+                data.get("distances"), len(src), len(dst)
+            )
 
         try:
-            async with self.session.get(
-                settings.osrm_bike_routing_url.format(coordinates=coordinates),
-                params=params,
-            ) as response:
-                if response.status != 200:
-                    error_text = await response.text()
-                    raise RuntimeError(f"OSRM error: {error_text}")
-
-                data = await response.json()
-                return data.get("routes", [])
-
-        except asyncio.TimeoutError:
-            logger.warning("OSRM request timed out")
-            raise HTTPException(status_code=504, detail="Routing service timeout")
-
-    async def _get_exclusion_polygons(self, zone_type: ZoneType) -> List[str]:
+            await asyncio.gather(*(fetch(i, j) for i, j in blocks))
+        except HTTPException:
+            raise
+        except Exception as e:
+            logger.error(f"Matrix failed: {str(e)}")
+            raise HTTPException(
+                status_code=503, detail="Route calculation service unavailable"
+            )
+
+        if safety_weight:
+            source_risk = geo_utils.risk_at(np.asarray(sources, dtype=float))
+            destination_risk = geo_utils.risk_at(np.asarray(destinations, dtype=float))
+            penalty = (source_risk[:, None] + destination_risk[None, :]) / 2
+            durations *= (1 + safety_weight * penalty).astype(np.float32)
+
+        return durations, distances
+
+    async def _get_osrm_table(
+        self,
+        sources: List[Tuple[float, float]],
+        destinations: List[Tuple[float, float]],
+    ) -> Dict:
+        """Async fetch one table chunk from OSRM"""
+        coordinates = ";".join(f"{lon},{lat}" for lon, lat in [*sources, *destinations])
+        params = {
+            "sources": ";".join(str(i) for i in range(len(sources))),
+            "destinations": ";".join(
+                str(i) for i in range(len(sources), len(sources) + len(destinations))
+            ),
+            "annotations": "duration,distance",
+        }
+        with timed("osrm_table"):
+            return await self._osrm_request(
+                settings.BIKE_TABLE_URL.format(coordinates=coordinates),
+                params,
+                [*sources, *destinations],
+            )
+
+    def _table_array(self, rows: List[List], n_rows: int, n_cols: int) -> np.ndarray:
+        """Convert an OSRM table (null for unreachable) to a float32 array"""
+        if rows is None:
+            return np.full((n_rows, n_cols), np.nan, np.float32)
+        return np.array(
+            [[np.nan if v is None else v for v in row] for row in rows], np.float32
+        )
+
+    async def _get_exclusion_param(self, avoid: List[ZoneType]) -> str:
         """
-        Async convert Delhi hazard zones to OSRM exclusion polygons
+        OSRM exclusion parameter for an avoid set, compiled once per
+        zone data version and avoid-set combination
         """
-        # Use thread executor for CPU-bound GeoJSON processing
-        loop = asyncio.get_running_loop()
-        zones = await loop.run_in_executor(
-            None,
-            lambda: {
-                "waterlogging": geo_utils.waterlogging_zones,
-                "theft": geo_utils.theft_zones,
-            }.get(str(zone_type), []),
+        zone_types = tuple(
+            sorted(
+                {str(z) for z in avoid}
+                & {str(ZoneType.WATERLOGGING), str(ZoneType.THEFT)}
+            )
         )
+        if not zone_types:
+            return ""
+
+        snapshot = geo_utils.snapshot
+        if self._exclusion_version != snapshot.version:
+            self._exclusion_version = snapshot.version
+            self._exclusion_cache.clear()
+
+        # Keyed on the version too: a compile started before a reload must
+        # not be served for the new zones when it finishes
+        key = (snapshot.version, zone_types)
+        exclude = self._exclusion_cache.get(key)
+        if exclude is None:
+            # Use thread executor for CPU-bound geometry processing
+            loop = asyncio.get_running_loop()
+            with timed("exclusion"):
+                exclude = await loop.run_in_executor(
+                    None, partial(self._compile_exclusion_param, snapshot, zone_types)
+                )
+            if snapshot.version == self._exclusion_version:
+                self._exclusion_cache[key] = exclude
+        return exclude
+
+    def _compile_exclusion_param(
+        self, snapshot: ZoneSnapshot, zone_types: Tuple[str, ...]
+    ) -> str:
+        """
+        Convert Delhi hazard zones to OSRM exclusion polygons (CPU-bound),
+        optionally merging overlapping zones and simplifying outlines
+        """
+        geometries = np.concatenate(
+            [snapshot.zone_geometries(zone_type) for zone_type in zone_types]
+        )
+        if settings.OSRM_EXCLUSION_MERGE and len(geometries):
+            geometries = shapely.get_parts(shapely.union_all(geometries))
+        if settings.OSRM_EXCLUSION_SIMPLIFY_TOLERANCE:
+            geometries = shapely.simplify(
+                geometries,
+                settings.OSRM_EXCLUSION_SIMPLIFY_TOLERANCE,
+                preserve_topology=True,
+            )
 
         polygons = []
-        for zone in zones:
-            coords = zone["geometry"]["coordinates"][0]
+        for geometry in geometries:
+            if geometry.geom_type != "Polygon" or geometry.is_empty:
+                continue
             poly_str = (
                 "polygon("
-                + ",".join(f"{coord[1]},{coord[0]}" for coord in coords)
+                + ",".join(
+                    f"{round(lat, 6)},{round(lon, 6)}"
+                    for lon, lat in geometry.exterior.coords
+                )
                 + ",100)"
             )  # 100m buffer radius
             polygons.append(poly_str)
 
-        return polygons
+        return ",".join(polygons)
 
     async def _enhance_route(self, route: Dict, avoid: List[str]) -> Dict:
         """
         Async add Delhi-specific metadata to route
         """
-        # Decode polyline or GeoJSON in thread (CPU-bound)
-        loop = asyncio.get_running_loop()
-        if "geometry" in route:
-            if isinstance(route["geometry"], str):  # Polyline
-                coordinates = await loop.run_in_executor(
-                    None, partial(polyline.decode, route["geometry"], geojson=True)
-                )
-            elif (
-                isinstance(route["geometry"], dict)
-                and route["geometry"].get("type") == "LineString"
-            ):  # GeoJSON
-                coordinates = route["geometry"]["coordinates"]
+        # Decode polyline on the scoring executor (CPU-bound)
+        with timed("decode"):
+            if isinstance(route.get("geometry"), str):
+                coordinates = await scoring_executor.run(route_coordinates, route)
             else:
-                coordinates = []
-        else:
-            coordinates = []
+                coordinates = route_coordinates(route)
 
-        # Parallel safety calculations
-        safety_task = loop.run_in_executor(
-            None, partial(geo_utils.calculate_route_safety, coordinates)
-        )
-        bike_lane_task = loop.run_in_executor(
-            None, partial(self._calculate_bike_lane_percentage, coordinates)
-        )
-        hazards_task = loop.run_in_executor(
-            None, partial(self._detect_hazards_along_route, coordinates, avoid)
-        )
-
-        safety_score, bike_lane_percentage, hazards = await asyncio.gather(
-            safety_task, bike_lane_task, hazards_task
-        )
+        # Single-pass scoring: zone membership and lengths computed once per route
+        with timed("scoring"):
+            [delhi_metadata] = await scoring_executor.run(
+                score_routes, [route], [coordinates], [avoid]
+            )
 
         return {
-            **route,
-            "delhi_metadata": {
-                "safety_score": round(safety_score, 2),
-                "bike_lane_percentage": bike_lane_percentage,
-                "hazards": hazards,
-                "avoided_risks": avoid,
-            },
+            **self._without_annotations(route),
+            "delhi_metadata": delhi_metadata,
             "coordinates": coordinates,
         }
 
-    def _calculate_bike_lane_percentage(
-        self, coordinates: List[Tuple[float, float]]
-    ) -> float:
-        """Calculate % of route using dedicated bike lanes (CPU-bound)"""
-        if not coordinates:
-            return 0.0
-
-        bike_lane_points = sum(
-            1
-            for coord in coordinates
-            if geo_utils.is_in_zone(coord[0], coord[1], "bike_lane")
-        )
-        return round(bike_lane_points / len(coordinates) * 100, 1)
-
-    def _detect_hazards_along_route(
-        self, coordinates: List[Tuple[float, float]], avoided_risks: List[str]
-    ) -> List[Dict]:
-        """
-        Identify hazards along route (CPU-bound)
-        """
-        hazards = []
-
-        # Check every 5th point for performance
-        for i in range(0, len(coordinates), 5):
-            lon, lat = coordinates[i]
-
-            if "theft" not in avoided_risks and geo_utils.is_in_zone(lon, lat, "theft"):
-                hazards.append(
-                    {"type": "theft_risk", "location": [lat, lon], "severity": "high"}
-                )
-
-            if "waterlogging" not in avoided_risks and geo_utils.is_in_zone(
-                lon, lat, "waterlogging"
-            ):
-                hazards.append(
-                    {
-                        "type": "waterlogging",
-                        "location": [lat, lon],
-                        "severity": "medium",
-                    }
-                )
-
-        return hazards
+    @staticmethod
+    def _without_annotations(route: Dict) -> Dict:
+        """Drop OSRM leg annotations once scored; clients don't need them"""
+        if not any("annotation" in leg for leg in route.get("legs", [])):
+            return route
+        return {
+            **route,
+            "legs": [
+                {k: v for k, v in leg.items() if k != "annotation"}
+                for leg in route["legs"]
+            ],
+        }
 
     def _select_best_route(self, routes: List[Dict]) -> Dict:
         """
@@ -0,0 +1,303 @@
+"""
+Single-pass Delhi route scoring
+Computes zone membership and metres ridden per zone for a route once and
+derives the router's safety metadata and the optimizer's metadata from them
+"""
+
+from typing import List, Dict, Tuple, Optional, FrozenSet
+import asyncio
+import logging
+import numpy as np
+import polyline
+from app.core.config import ExecutorMode, ScoringMode, settings
+from app.core.constants import ZoneType
+from app.core.lifecycle import lifecycle
+from app.services.delhi_optimizer import optimizer
+from app.utils.geospatial import ZONE_BITS, geo_utils
+from app.utils.nodetable import NodeTable
+
+logger = logging.getLogger(__name__)
+
+
+def route_coordinates(route: Dict) -> List[Tuple[float, float]]:
+    """Decode route geometry (polyline or GeoJSON) to (lon, lat) pairs"""
+    geometry = route.get("geometry")
+    if isinstance(geometry, str):  # Polyline
+        return polyline.decode(geometry, geojson=True)
+    if isinstance(geometry, dict) and geometry.get("type") == "LineString":
+        return geometry["coordinates"]  # GeoJSON
+    return []
+
+
+def score_routes(
+    routes: List[Dict],
+    coordinates: List[List[Tuple[float, float]]],
+    avoids: List[List[ZoneType]],
+) -> List[Dict]:
+    """
+    RouteScoringEngine.score_routes on this process's shared engine.
+    Executors pickle this by name, so process workers keep their own
+    engine (and its loaded node table) instead of receiving a copy per job.
+    """
+    return scoring_engine.score_routes(routes, coordinates, avoids)
+
+
+class RouteScoringEngine:
+    def __init__(self):
+        self.hazard_sample_rate = 5  # Check every 5th point for hazards
+        self._node_table: Optional[NodeTable] = None
+        self._node_table_loaded = False
+        # Zone version of the node table on disk, once loaded or read
+        self.node_table_version: Optional[str] = None
+        self._stale_warned: Optional[str] = None
+
+    async def _startup(self):
+        """
+        Load the node table off the event loop for annotation scoring.
+        Process workers load their own copy, so the parent only reads
+        which zone version the table was built from.
+        """
+        if settings.SCORING_MODE != ScoringMode.ANNOTATIONS:
+            return
+        loop = asyncio.get_running_loop()
+        if settings.SCORING_EXECUTOR == ExecutorMode.PROCESS:
+            try:
+                self.node_table_version = await loop.run_in_executor(
+                    None, NodeTable.read_version, settings.NODE_TABLE_PATH
+                )
+            except FileNotFoundError:
+                self._log_missing_node_table()
+        else:
+            await loop.run_in_executor(None, lambda: self.node_table)
+
+    async def _shutdown(self):
+        """Nothing to release; the node table is plain arrays"""
+
+    @property
+    def node_table(self) -> Optional[NodeTable]:
+        """Node table for annotation scoring, loaded on first use"""
+        if not self._node_table_loaded:
+            self._node_table_loaded = True
+            try:
+                self._node_table = NodeTable.from_file(settings.NODE_TABLE_PATH)
+            except FileNotFoundError:
+                self._log_missing_node_table()
+            else:
+                self.node_table_version = self._node_table.version
+        return self._node_table
+
+    @property
+    def node_table_current(self) -> bool:
+        """
+        Whether the node table was built for the loaded zones, so routes can
+        be scored from OSRM node annotations. Never loads the table itself.
+        """
+        version = self.node_table_version
+        if version is None:
+            return False
+        if version != geo_utils.version:
+            if self._stale_warned != geo_utils.version:
+                self._stale_warned = geo_utils.version
+                logger.warning(
+                    f"Node table built for zones {version}, "
+                    f"loaded zones are {geo_utils.version}; "
+                    "scoring routes from geometry until it is rebuilt"
+                )
+            return False
+        return True
+
+    @staticmethod
+    def _log_missing_node_table():
+        logger.warning(
+            f"No node table at {settings.NODE_TABLE_PATH}, "
+            "scoring routes from geometry"
+        )
+
+    @property
+    def zone_types(self) -> List[ZoneType]:
+        """Every zone layer any scorer needs"""
+        return list(
+            dict.fromkeys(
+                [
+                    ZoneType.THEFT,
+                    ZoneType.WATERLOGGING,
+                    ZoneType.BIKE_LANE,
+                    *optimizer.zone_types,
+                ]
+            )
+        )
+
+    def score_routes(
+        self,
+        routes: List[Dict],
+        coordinates: List[List[Tuple[float, float]]],
+        avoids: List[List[ZoneType]],
+    ) -> List[Dict]:
+        """
+        Score OSRM routes (CPU-bound). With SCORING_MODE=annotations, routes
+        carrying node annotations that the node table covers are scored from
+        those; the rest are scored from their decoded `coordinates`.
+        """
+        results: List[Optional[Dict]] = [None] * len(routes)
+        if settings.SCORING_MODE == ScoringMode.ANNOTATIONS:
+            results = [
+                self.score_annotations(route, avoid)
+                for route, avoid in zip(routes, avoids)
+            ]
+
+        pending = [i for i, result in enumerate(results) if result is None]
+        scored = self.score_many(
+            [coordinates[i] for i in pending], [avoids[i] for i in pending]
+        )
+        for i, metadata in zip(pending, scored):
+            results[i] = metadata
+        return results
+
+    def score_annotations(self, route: Dict, avoid: List[ZoneType]) -> Optional[Dict]:
+        """
+        Score a route from its OSRM `nodes`/`distance` leg annotations.
+        A segment counts as inside a zone when both of its nodes are.
+        Returns None when the route can't be scored this way.
+        """
+        table = self.node_table
+        if table is None or not self.node_table_current:
+            return None
+
+        coords, node_masks, segment_masks, distances = [], [], [], []
+        for leg in route.get("legs", []):
+            annotation = leg.get("annotation") or {}
+            nodes = annotation.get("nodes")
+            if not nodes or len(annotation.get("distance", ())) != len(nodes) - 1:
+                return None
+            found = table.lookup(nodes)
+            if found is None:
+                return None
+            leg_coords, leg_masks = found
+            coords.append(leg_coords)
+            node_masks.append(leg_masks)
+            segment_masks.append(leg_masks[:-1] & leg_masks[1:])
+            distances.append(annotation["distance"])
+        if not coords:
+            return None
+
+        coords = np.concatenate(coords)
+        node_masks = np.concatenate(node_masks)
+        membership = {
+            zone_type: (node_masks & (1 << ZONE_BITS[zone_type])).astype(bool)
+            for zone_type in self.zone_types
+        }
+
+        combos, inverse = np.unique(np.concatenate(segment_masks), return_inverse=True)
+        metres = np.bincount(inverse, weights=np.concatenate(distances))
+        lengths = {
+            frozenset(z for z, bit in ZONE_BITS.items() if combo & (1 << bit)): float(m)
+            for combo, m in zip(combos.tolist(), metres)
+        }
+        return self._score_route(coords, membership, lengths, avoid)
+
+    def score_many(
+        self,
+        routes: List[List[Tuple[float, float]]],
+        avoids: List[List[ZoneType]],
+    ) -> List[Dict]:
+        """
+        Score several routes with one batched zone-membership pass and one
+        batched clip of the route lines to the zone layers (CPU-bound).
+        `avoids` holds the avoided risks of each route.
+        Returns one delhi_metadata dict per route, in input order.
+        """
+        coords = [np.asarray(c, dtype=float).reshape(-1, 2) for c in routes]
+        if not coords:
+            return []
+
+        offsets = np.cumsum([len(c) for c in coords])[:-1]
+        membership = geo_utils.zone_membership(
+            np.concatenate(coords), self.zone_types
+        )
+        split = {
+            zone_type: np.split(mask, offsets)
+            for zone_type, mask in membership.items()
+        }
+        lengths = geo_utils.zone_lengths(coords, self.zone_types)
+
+        results = []
+        for i, (route_coords, avoid) in enumerate(zip(coords, avoids)):
+            route_membership = {
+                zone_type: masks[i] for zone_type, masks in split.items()
+            }
+            results.append(
+                self._score_route(route_coords, route_membership, lengths[i], avoid)
+            )
+        return results
+
+    def _score_route(
+        self,
+        coords: np.ndarray,
+        membership: Dict[ZoneType, np.ndarray],
+        lengths: Dict[FrozenSet[ZoneType], float],
+        avoid: List[ZoneType],
+    ) -> Dict:
+        return {
+            "safety_score": round(
+                geo_utils.calculate_route_safety(coords, lengths), 2
+            ),
+            "bike_lane_percentage": self.bike_lane_percentage(lengths),
+            "hazards": self.detect_hazards(coords, membership, avoid),
+            "avoided_risks": avoid,
+            "optimizer": optimizer.route_metadata(coords, membership, lengths),
+        }
+
+    def bike_lane_percentage(self, lengths: Dict[FrozenSet[ZoneType], float]) -> float:
+        """Calculate % of route distance on dedicated bike lanes"""
+        total = sum(lengths.values())
+        if not total:
+            return 0.0
+        on_lanes = sum(
+            metres for zones, metres in lengths.items() if ZoneType.BIKE_LANE in zones
+        )
+        return round(on_lanes / total * 100, 1)
+
+    def detect_hazards(
+        self,
+        coords: np.ndarray,
+        membership: Dict[ZoneType, np.ndarray],
+        avoided_risks: List[str],
+        sample_rate: Optional[int] = None,
+    ) -> List[Dict]:
+        """Identify hazards at sampled route points"""
+        hazards = []
+        if not len(coords):
+            return hazards
+
+        step = sample_rate or self.hazard_sample_rate
+        sampled = coords[::step]
+        theft = membership[ZoneType.THEFT][::step] & ("theft" not in avoided_risks)
+        waterlogging = membership[ZoneType.WATERLOGGING][::step] & (
+            "waterlogging" not in avoided_risks
+        )
+
+        for i in np.flatnonzero(theft | waterlogging):
+            lon, lat = sampled[i].tolist()
+            if theft[i]:
+                hazards.append(
+                    {"type": "theft_risk", "location": [lat, lon], "severity": "high"}
+                )
+            if waterlogging[i]:
+                hazards.append(
+                    {
+                        "type": "waterlogging",
+                        "location": [lat, lon],
+                        "severity": "medium",
+                    }
+                )
+
+        return hazards
+
+
+# Shared scoring engine instance (manage lifecycle with FastAPI events)
+scoring_engine = RouteScoringEngine()
+lifecycle.add_resource(
+    name="scoring_engine",
+    startup=scoring_engine._startup,
+    shutdown=scoring_engine._shutdown,
+)
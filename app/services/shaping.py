@@ -0,0 +1,127 @@
+"""
+Route response shaping
+Routes are fetched, scored and cached with full GeoJSON geometry and steps;
+the client's RouteRequest decides what is sent back: geometry encoding,
+turn-by-turn steps, duplicated fields and how much of the alternatives.
+"""
+
+from typing import Callable, Dict, List, Optional
+
+import polyline
+
+from app.core.constants import AlternativesMode, GeometryFormat
+from app.core.executor import scoring_executor
+from app.models.schemas import RouteRequest
+
+# Decimal places per encoded polyline format
+POLYLINE_PRECISION = {GeometryFormat.POLYLINE: 5, GeometryFormat.POLYLINE6: 6}
+
+
+def encode_geometry(geometry, geometry_format: GeometryFormat):
+    """Re-encode a GeoJSON LineString as a (precision 5 or 6) polyline"""
+    precision = POLYLINE_PRECISION.get(geometry_format)
+    if precision is None or not isinstance(geometry, dict):
+        return geometry
+    return polyline.encode(
+        geometry.get("coordinates", []), precision=precision, geojson=True
+    )
+
+
+def shape_route(route: Dict, request: RouteRequest) -> Dict:
+    """Apply the request's geometry/steps/slim options to one OSRM route"""
+    shaped = dict(route)
+    if request.slim:
+        # Same data as `geometry` and the response's top-level scores
+        shaped.pop("coordinates", None)
+        shaped.pop("delhi_metadata", None)
+    if "geometry" in shaped:
+        shaped["geometry"] = encode_geometry(shaped["geometry"], request.geometry)
+
+    if "legs" in shaped:
+        legs = []
+        for leg in shaped["legs"]:
+            leg = dict(leg)
+            if not request.steps:
+                leg.pop("steps", None)
+            elif request.geometry != GeometryFormat.GEOJSON:
+                leg["steps"] = [
+                    {
+                        **step,
+                        "geometry": encode_geometry(
+                            step.get("geometry"), request.geometry
+                        ),
+                    }
+                    for step in leg.get("steps", [])
+                ]
+            legs.append(leg)
+        shaped["legs"] = legs
+    return shaped
+
+
+def summarize_route(route: Dict) -> Dict:
+    """Distance, duration and Delhi scores of a scored route"""
+    meta = route.get("delhi_metadata", {})
+    return {
+        "distance": route.get("distance", 0),
+        "duration": route.get("duration", 0),
+        "safety_score": meta.get("safety_score", 0),
+        "bike_lane_percentage": meta.get("bike_lane_percentage", 0),
+        "hazard_count": len(meta.get("hazards", [])),
+    }
+
+
+def shape_alternative(route: Dict, request: RouteRequest, full: bool = True) -> Dict:
+    """Summary of one scored route, plus the shaped route itself if `full`"""
+    alternative = summarize_route(route)
+    if full:
+        alternative["route"] = shape_route(route, request)
+    return alternative
+
+
+def shape_alternatives(
+    routes: List[Dict], recommended: Dict, request: RouteRequest
+) -> Optional[List[Dict]]:
+    """Alternatives section of the response, per request.alternatives"""
+    if request.alternatives == AlternativesMode.NONE:
+        return None
+
+    return [
+        {
+            **shape_alternative(
+                route, request, request.alternatives == AlternativesMode.FULL
+            ),
+            "recommended": route is recommended or route == recommended,
+        }
+        for route in routes
+    ]
+
+
+async def run_shaping(request: RouteRequest, fn: Callable, *args):
+    """
+    Run a shaping function; polyline encoding is CPU-bound, so requests for
+    encoded geometry run it on the scoring executor
+    """
+    if request.geometry == GeometryFormat.GEOJSON:
+        return fn(*args)
+    return await scoring_executor.run(fn, *args)
+
+
+async def shape_response(
+    optimized_route: Dict, routes: List[Dict], recommended: Dict, request: RouteRequest
+) -> Dict:
+    """RouteResponse fields for an optimizer result, shaped per the request"""
+    shaped, alternatives = await run_shaping(
+        request, _shape_all, optimized_route.get("route"), routes, recommended, request
+    )
+    if shaped is not None:
+        optimized_route = {**optimized_route, "route": shaped}
+    return {**optimized_route, "alternatives": alternatives}
+
+
+def _shape_all(
+    route: Optional[Dict], routes: List[Dict], recommended: Dict, request: RouteRequest
+):
+    return (
+        shape_route(route, request) if route is not None else None,
+        shape_alternatives(routes, recommended, request),
+    )
@@ -0,0 +1,116 @@
+"""
+Zone data hot reload
+Rebuilds versioned zone snapshots (with their spatial indexes) in the
+background and swaps them in by reference, triggered by zone file changes
+or a Redis pub/sub message. Reads never wait on a reload.
+"""
+
+import asyncio
+import logging
+import os
+from typing import Dict, List, Optional
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from app.core.config import settings
+from app.core.executor import scoring_executor
+from app.core.lifecycle import lifecycle
+from app.utils.geospatial import geo_utils, zone_layer_paths
+
+logger = logging.getLogger(__name__)
+
+
+class ZoneReloader:
+    def __init__(self):
+        self._tasks: List[asyncio.Task] = []
+        self._lock: Optional[asyncio.Lock] = None  # Serializes rebuilds only
+        self._mtimes: Dict[str, float] = {}
+        self.reloads = 0
+
+    async def _startup(self):
+        """Load the initial snapshot and start the reload triggers"""
+        self._lock = asyncio.Lock()
+        self._mtimes = self._watched_mtimes()
+        await geo_utils.load_zones()
+        if settings.ZONE_RELOAD_POLL_INTERVAL:
+            self._tasks.append(asyncio.create_task(self._watch_files()))
+        if settings.ZONE_RELOAD_CHANNEL:
+            self._tasks.append(asyncio.create_task(self._watch_redis()))
+
+    async def _shutdown(self):
+        """Stop the reload triggers"""
+        for task in self._tasks:
+            task.cancel()
+        self._tasks = []
+
+    async def reload(self) -> str:
+        """
+        Rebuild the zone snapshot in the background and swap it in.
+        Route and exclusion caches are keyed on the version, so they
+        invalidate themselves. Returns the active version.
+        """
+        async with self._lock:
+            snapshot = await geo_utils.build_snapshot()
+            if snapshot.version == geo_utils.version:
+                return snapshot.version
+            previous = geo_utils.version
+            geo_utils.swap(snapshot)
+            await scoring_executor.refresh()
+            self.reloads += 1
+            logger.info(f"Swapped zone snapshot {previous} -> {snapshot.version}")
+            return snapshot.version
+
+    def _watched_mtimes(self) -> Dict[str, float]:
+        # build_snapshot reads whichever of the store and layers is newer,
+        # so a change to either picks the right source
+        paths = zone_layer_paths() + [str(settings.ZONE_STORE_PATH)]
+        mtimes = {}
+        for path in paths:
+            try:
+                mtimes[path] = os.stat(path).st_mtime
+            except FileNotFoundError:
+                continue
+        return mtimes
+
+    async def _watch_files(self):
+        """Poll zone file modification times and reload on change"""
+        while True:
+            await asyncio.sleep(settings.ZONE_RELOAD_POLL_INTERVAL)
+            mtimes = self._watched_mtimes()
+            if mtimes == self._mtimes:
+                continue
+            self._mtimes = mtimes
+            try:
+                await self.reload()
+            except Exception as e:
+                logger.error(f"Zone reload failed: {str(e)}")
+
+    async def _watch_redis(self):
+        """Reload whenever a message arrives on ZONE_RELOAD_CHANNEL"""
+        while True:
+            redis = Redis.from_url(str(settings.REDIS_URL))
+            try:
+                async with redis.pubsub() as pubsub:
+                    await pubsub.subscribe(settings.ZONE_RELOAD_CHANNEL)
+                    async for message in pubsub.listen():
+                        if message["type"] != "message":
+                            continue
+                        try:
+                            await self.reload()
+                        except Exception as e:
+                            logger.error(f"Zone reload failed: {str(e)}")
+            except RedisError as e:
+                logger.warning(f"Zone reload subscription lost: {str(e)}")
+                await asyncio.sleep(settings.ZONE_RELOAD_POLL_INTERVAL or 5)
+            finally:
+                await redis.aclose()
+
+
+# Shared zone reloader (manage lifecycle with FastAPI events)
+zone_reloader = ZoneReloader()
+lifecycle.add_resource(
+    name="zone_reloader",
+    startup=zone_reloader._startup,
+    shutdown=zone_reloader._shutdown,
+)
@@ -4,18 +4,28 @@ Handles coordinate validation, zone detection, and distance calculations
 optimized for 2-wheeler navigation in urban environments.
 """
 
+import asyncio
 import logging
-from typing import List, Tuple, Dict, Optional
+from functools import cached_property
+from typing import List, Tuple, Dict, Optional, FrozenSet
 import numpy as np
+import shapely
+from shapely import STRtree
 from shapely.geometry import Point, shape
 from geopy.distance import geodesic
 import json
+import hashlib
 import os
+import time
 import aiofiles
+import asyncpg
+from pathlib import Path
 from redis.asyncio import Redis
 
 from app.core.constants import ZoneType
 from app.core.config import Environment, settings
+from app.core.lifecycle import lifecycle
+from app.utils.zonestore import ZoneStore, write_store
 
 
 logger = logging.getLogger(__name__)
@@ -35,22 +45,403 @@ DELHI_BOUNDARY = {
 }
 
 
+class ZoneIndex:
+    """
+    Spatial index over a single zone layer.
+    Geometries are converted and prepared once; lookups query the STRtree
+    by bounding box and only run exact predicates on the candidates.
+    """
+
+    def __init__(self, geometries: np.ndarray):
+        self.geometries = np.asarray(geometries, dtype=object)
+        shapely.prepare(self.geometries)
+        self.tree = STRtree(self.geometries)
+
+    @classmethod
+    def from_features(cls, features: List[Dict]) -> "ZoneIndex":
+        """Build an index from GeoJSON features."""
+        return cls(
+            np.array([shape(feature["geometry"]) for feature in features], dtype=object)
+        )
+
+    def __len__(self) -> int:
+        return len(self.geometries)
+
+    def contains(self, point: Point) -> bool:
+        """Check if any zone geometry contains the point."""
+        candidates = self.tree.query(point)
+        return any(self.geometries[i].contains(point) for i in candidates)
+
+    def distance(self, point: Point) -> Optional[float]:
+        """
+        Distance (degrees) from point to the nearest zone boundary.
+        Returns None if point is inside a zone or the layer is empty.
+        """
+        if not len(self) or self.contains(point):
+            return None
+        _, distances = self.tree.query_nearest(point, return_distance=True)
+        return float(distances.min())
+
+    def contains_points(self, points: np.ndarray) -> np.ndarray:
+        """
+        Vectorized membership test for an array of Shapely points.
+        Returns a boolean mask, True where a point lies inside any zone.
+        """
+        mask = np.zeros(len(points), dtype=bool)
+        if not len(self) or not len(points):
+            return mask
+        input_idx, _ = self.tree.query(points, predicate="within")
+        mask[input_idx] = True
+        return mask
+
+    @cached_property
+    def dissolved(self) -> STRtree:
+        """Index over the layer with overlapping zones merged (built lazily)."""
+        return STRtree(shapely.get_parts(shapely.union_all(self.geometries)))
+
+    def clip(self, lines: np.ndarray) -> np.ndarray:
+        """
+        Vectorized clip of an array of line geometries to this layer.
+        Returns, per line, the part of it lying inside any zone. Lines are
+        clipped to the dissolved layer so stretches inside overlapping zones
+        are not counted twice.
+        """
+        clipped = np.full(len(lines), EMPTY_LINE, dtype=object)
+        if not len(self) or not len(lines):
+            return clipped
+        tree = self.dissolved
+        line_idx, zone_idx = tree.query(lines, predicate="intersects")
+        pieces = shapely.intersection(lines[line_idx], tree.geometries[zone_idx])
+        for i in np.unique(line_idx):
+            clipped[i] = shapely.union_all(pieces[line_idx == i])
+        return clipped
+
+
+EMPTY_LINE = shapely.LineString()
+
+# Metres per degree of latitude, and of longitude at the centre of Delhi
+_METRES_PER_DEG_LAT = 111_195.0
+_METRES_PER_DEG_LON = _METRES_PER_DEG_LAT * np.cos(
+    np.radians(
+        (settings.DELHI_BOUNDARY["min_lat"] + settings.DELHI_BOUNDARY["max_lat"]) / 2
+    )
+)
+
+
+def project_metres(coordinates: np.ndarray) -> np.ndarray:
+    """(lon, lat) degrees to x/y metres, equirectangular around Delhi"""
+    return coordinates * [_METRES_PER_DEG_LON, _METRES_PER_DEG_LAT]
+
+
+def line_metres(lines: np.ndarray) -> np.ndarray:
+    """
+    Lengths in metres of lon/lat line geometries.
+    Uses an equirectangular projection centred on Delhi (<0.5% error across
+    the NCR), which keeps the measure vectorized.
+    """
+    return shapely.length(shapely.transform(lines, project_metres))
+
+
+# Per-zone contribution to grid risk, mirroring calculate_route_safety
+ZONE_RISK_WEIGHTS = {
+    ZoneType.THEFT: 0.5,
+    ZoneType.WATERLOGGING: 0.3,
+}
+
+# Bit per zone type in the grid masks; the same bit + 8 flags boundary cells
+ZONE_BITS = {
+    ZoneType.THEFT: 0,
+    ZoneType.WATERLOGGING: 1,
+    ZoneType.BIKE_LANE: 2,
+    ZoneType.POTHOLE: 3,
+}
+_BOUNDARY_SHIFT = 8
+
+
+class RiskGrid:
+    """
+    Precomputed zone raster over Settings.DELHI_BOUNDARY.
+    Each cell packs, per zone type, whether it lies entirely inside a zone
+    (low byte) or straddles a zone boundary (high byte) into a uint16. A
+    point lookup is an array index; only points in boundary cells (or
+    outside the grid) fall back to the exact geometry test.
+    """
+
+    def __init__(
+        self, masks: np.ndarray, cell_size: float, index: Dict[ZoneType, ZoneIndex]
+    ):
+        boundary = settings.DELHI_BOUNDARY
+        self.min_lon, self.min_lat = boundary["min_lon"], boundary["min_lat"]
+        self.cell_size = cell_size
+        self.n_lat, self.n_lon = masks.shape
+        self.masks = masks
+        self.index = index
+
+    @classmethod
+    def from_index(
+        cls, index: Dict[ZoneType, ZoneIndex], cell_size: float
+    ) -> "RiskGrid":
+        """Rasterize every indexed zone layer with bulk cell/zone queries."""
+        boundary = settings.DELHI_BOUNDARY
+        n_lon = int(np.ceil((boundary["max_lon"] - boundary["min_lon"]) / cell_size))
+        n_lat = int(np.ceil((boundary["max_lat"] - boundary["min_lat"]) / cell_size))
+        layers = [
+            (ZONE_BITS[zone_type], zone_index)
+            for zone_type, zone_index in index.items()
+            if zone_type in ZONE_BITS and len(zone_index)
+        ]
+        if not layers:
+            # Nothing to rasterize (e.g. the empty snapshot at import)
+            return cls(np.zeros((n_lat, n_lon), dtype=np.uint16), cell_size, index)
+
+        col, row = np.meshgrid(np.arange(n_lon), np.arange(n_lat))
+        min_lon = boundary["min_lon"] + col.ravel() * cell_size
+        min_lat = boundary["min_lat"] + row.ravel() * cell_size
+        cells = shapely.box(min_lon, min_lat, min_lon + cell_size, min_lat + cell_size)
+
+        masks = np.zeros(len(cells), dtype=np.uint16)
+        for bit, zone_index in layers:
+            touching = np.zeros(len(cells), dtype=bool)
+            inside = np.zeros(len(cells), dtype=bool)
+            touching[zone_index.tree.query(cells, predicate="intersects")[0]] = True
+            inside[zone_index.tree.query(cells, predicate="within")[0]] = True
+            masks[inside] |= np.uint16(1 << bit)
+            masks[touching & ~inside] |= np.uint16(1 << (bit + _BOUNDARY_SHIFT))
+        return cls(masks.reshape(n_lat, n_lon), cell_size, index)
+
+    @staticmethod
+    def params() -> Dict:
+        """Parameters a stored grid must match to be reused."""
+        return {
+            "format": "bitmask-v1",
+            "cell_size": settings.RISK_GRID_CELL_SIZE,
+            "boundary": settings.DELHI_BOUNDARY,
+        }
+
+    def membership(
+        self, coordinates: np.ndarray, zone_types: List[ZoneType]
+    ) -> Dict[ZoneType, np.ndarray]:
+        """
+        Point-in-zone masks for an Nx2 array of (lon, lat), answered from
+        the grid with exact geometry only for ambiguous points.
+        """
+        coordinates = np.asarray(coordinates, dtype=float).reshape(-1, 2)
+        cols = np.floor((coordinates[:, 0] - self.min_lon) / self.cell_size)
+        rows = np.floor((coordinates[:, 1] - self.min_lat) / self.cell_size)
+        on_grid = (cols >= 0) & (cols < self.n_lon) & (rows >= 0) & (rows < self.n_lat)
+
+        cell_masks = np.zeros(len(coordinates), dtype=np.uint16)
+        cell_masks[on_grid] = self.masks[
+            rows[on_grid].astype(int), cols[on_grid].astype(int)
+        ]
+
+        membership = {}
+        for zone_type in zone_types:
+            index = self.index.get(zone_type)
+            bit = ZONE_BITS.get(zone_type)
+            if index is None or bit is None:
+                membership[zone_type] = np.zeros(len(coordinates), dtype=bool)
+                continue
+            inside = (cell_masks & (1 << bit)).astype(bool)
+            ambiguous = ~on_grid | (cell_masks & (1 << (bit + _BOUNDARY_SHIFT))).astype(
+                bool
+            )
+            if ambiguous.any() and len(index):
+                inside[ambiguous] = index.contains_points(
+                    shapely.points(coordinates[ambiguous])
+                )
+            membership[zone_type] = inside
+        return membership
+
+    def lookup(self, coordinates: np.ndarray) -> np.ndarray:
+        """Zone risk (0-1) for an Nx2 array of (lon, lat)."""
+        coordinates = np.asarray(coordinates, dtype=float).reshape(-1, 2)
+        membership = self.membership(coordinates, list(ZONE_RISK_WEIGHTS))
+        risk = np.zeros(len(coordinates))
+        for zone_type, weight in ZONE_RISK_WEIGHTS.items():
+            risk += weight * membership[zone_type]
+        return np.clip(risk, 0, 1)
+
+
+# GeoJSON source file per indexed zone layer
+GEOJSON_DIR = os.path.join(os.path.dirname(__file__), "../data")
+ZONE_LAYER_FILES = {
+    ZoneType.THEFT: "theft_zones.geojson",
+    ZoneType.WATERLOGGING: "waterlogging_zones.geojson",
+    ZoneType.BIKE_LANE: "bike_lanes.geojson",
+}
+
+
+def zone_layer_paths() -> List[str]:
+    """Paths of the GeoJSON zone layer files"""
+    return [os.path.join(GEOJSON_DIR, name) for name in ZONE_LAYER_FILES.values()]
+
+
+class ZoneSnapshot:
+    """
+    Immutable, versioned set of zone layers with their spatial indexes.
+    Readers take the current snapshot by reference; a reload builds a new
+    one and swaps it in, so in-flight requests keep using the old one.
+    """
+
+    def __init__(
+        self,
+        version: str,
+        index: Dict[ZoneType, ZoneIndex],
+        risk_grid: RiskGrid,
+        features: Optional[Dict[ZoneType, List[Dict]]] = None,
+        store: Optional[ZoneStore] = None,
+    ):
+        self.version = version
+        self.index = index
+        self.risk_grid = risk_grid
+        self.features = features or {}
+        self._store = store  # Keeps the mapping alive for zero-copy views
+
+    @classmethod
+    def from_features(cls, layers: Dict[ZoneType, List[Dict]]) -> "ZoneSnapshot":
+        """Build a snapshot from GeoJSON features per zone type (CPU-bound)."""
+        layers = {
+            zone_type: layers.get(zone_type, []) for zone_type in ZONE_LAYER_FILES
+        }
+        # Content hash of the layers, shared across processes
+        digest = hashlib.sha1()
+        for zones in layers.values():
+            digest.update(json.dumps(zones, sort_keys=True).encode())
+
+        index = {
+            zone_type: ZoneIndex.from_features(features)
+            for zone_type, features in layers.items()
+        }
+        risk_grid = RiskGrid.from_index(index, settings.RISK_GRID_CELL_SIZE)
+        return cls(digest.hexdigest()[:12], index, risk_grid, features=layers)
+
+    @classmethod
+    def from_store(cls, path: Path) -> "ZoneSnapshot":
+        """
+        Build a snapshot from a memory-mapped binary zone store.
+        Raw GeoJSON features are not kept in this mode.
+        """
+        store = ZoneStore(path)
+        index = {
+            zone_type: ZoneIndex(store.geometries(str(zone_type)))
+            for zone_type in ZONE_LAYER_FILES
+        }
+        masks = store.risk_grid(**RiskGrid.params())
+        risk_grid = (
+            RiskGrid(masks, settings.RISK_GRID_CELL_SIZE, index)
+            if masks is not None
+            else RiskGrid.from_index(index, settings.RISK_GRID_CELL_SIZE)
+        )
+        return cls(store.version, index, risk_grid, store=store)
+
+    def zone_geometries(self, zone_type: ZoneType) -> np.ndarray:
+        """Indexed Shapely geometries for a zone layer (read-only)."""
+        index = self.index.get(zone_type)
+        return index.geometries if index is not None else np.array([], dtype=object)
+
+
 class DelhiGeoUtils:
     def __init__(self):
-        # Initialize empty zones; they will be loaded asynchronously
-        self.theft_zones = []
-        self.waterlogging_zones = []
-        self.bike_lanes = []
+        # Start with empty zones; they will be loaded asynchronously
+        self._snapshot = ZoneSnapshot.from_features({})
+
+    @property
+    def snapshot(self) -> ZoneSnapshot:
+        """Current zone snapshot; hold on to it for consistent multi-step reads."""
+        return self._snapshot
+
+    @property
+    def version(self) -> str:
+        return self._snapshot.version
+
+    @property
+    def theft_zones(self) -> List[Dict]:
+        return self._snapshot.features.get(ZoneType.THEFT, [])
+
+    @property
+    def waterlogging_zones(self) -> List[Dict]:
+        return self._snapshot.features.get(ZoneType.WATERLOGGING, [])
+
+    @property
+    def bike_lanes(self) -> List[Dict]:
+        return self._snapshot.features.get(ZoneType.BIKE_LANE, [])
+
+    def swap(self, snapshot: ZoneSnapshot):
+        """Atomically replace the current snapshot (readers never block)."""
+        self._snapshot = snapshot
 
     async def load_zones(self):
-        """Asynchronously load all zone data."""
-        self.theft_zones = await self._load_geojson("theft_zones.geojson")
-        self.waterlogging_zones = await self._load_geojson("waterlogging_zones.geojson")
-        self.bike_lanes = await self._load_geojson("bike_lanes.geojson")
+        """
+        Asynchronously load all zone data, preferring the compiled binary
+        zone store (see app.utils.zonestore) over GeoJSON when present.
+        """
+        self.swap(await self.build_snapshot())
+
+    async def load_geojson_zones(self):
+        """Asynchronously load and index the GeoJSON zone layers."""
+        self.swap(await self.build_snapshot(use_store=False))
+
+    async def build_snapshot(self, use_store: bool = True) -> ZoneSnapshot:
+        """Build a new snapshot off the event loop without swapping it in."""
+        loop = asyncio.get_running_loop()
+        if use_store and self._store_is_current():
+            snapshot = await loop.run_in_executor(
+                None, ZoneSnapshot.from_store, settings.ZONE_STORE_PATH
+            )
+            logger.info(
+                f"Loaded zone store {settings.ZONE_STORE_PATH} "
+                f"(version {snapshot.version})"
+            )
+            return snapshot
+
+        layers = {
+            zone_type: await self._load_geojson(filename)
+            for zone_type, filename in ZONE_LAYER_FILES.items()
+        }
+        snapshot = await loop.run_in_executor(
+            None, ZoneSnapshot.from_features, layers
+        )
+        logger.info(f"Loaded GeoJSON zone layers (version {snapshot.version})")
+        return snapshot
+
+    @staticmethod
+    def _store_is_current() -> bool:
+        """Whether the zone store exists and no GeoJSON layer is newer"""
+        store = settings.ZONE_STORE_PATH
+        try:
+            store_mtime = store.stat().st_mtime
+        except FileNotFoundError:
+            return False
+        for path in zone_layer_paths():
+            try:
+                newer = os.stat(path).st_mtime > store_mtime
+            except FileNotFoundError:
+                continue
+            if newer:
+                logger.warning(
+                    f"{path} is newer than zone store {store}, loading GeoJSON"
+                )
+                return False
+        return True
+
+    def compile_zone_store(self, path: Path):
+        """Write the currently indexed zones to a binary zone store."""
+        snapshot = self._snapshot
+        write_store(
+            path,
+            snapshot.version,
+            {
+                str(zone_type): index.geometries
+                for zone_type, index in snapshot.index.items()
+            },
+            snapshot.risk_grid.masks,
+            RiskGrid.params(),
+        )
 
     async def _load_geojson(self, filename: str) -> List[Dict]:
         """Asynchronously load Delhi-specific GeoJSON data from /app/data."""
-        path = os.path.join(os.path.dirname(__file__), "../data", filename)
+        path = os.path.join(GEOJSON_DIR, filename)
         try:
             async with aiofiles.open(path, mode="r") as f:
                 content = await f.read()
@@ -71,15 +462,12 @@ class DelhiGeoUtils:
         - 'waterlogging': Monsoon flooding zones (e.g., Minto Road)
         - 'bike_lane': Dedicated bicycle paths
         """
+        index = self._snapshot.index.get(zone_type)
+        if index is None:
+            return False
         if not point:
             point = Point(lon, lat)
-        zones = {
-            "theft": self.theft_zones,
-            "waterlogging": self.waterlogging_zones,
-            "bike_lane": self.bike_lanes,
-        }.get(str(zone_type), [])
-
-        return any(shape(zone["geometry"]).contains(point) for zone in zones)
+        return index.contains(point)
 
     async def distance_to_zone(
         self, lon: float, lat: float, zone_type: ZoneType
@@ -88,22 +476,36 @@ class DelhiGeoUtils:
         Calculate shortest distance (meters) to nearest zone boundary.
         Returns None if point is inside the zone.
         """
-        point = Point(lon, lat)
-        zones = {
-            "theft": self.theft_zones,
-            "waterlogging": self.waterlogging_zones,
-        }.get(str(zone_type), [])
-
-        min_dist = None
-        for zone in zones:
-            zone_shape = shape(zone["geometry"])
-            if zone_shape.contains(point):
-                return None
-            dist = point.distance(zone_shape.boundary)
-            min_dist = dist if min_dist is None else min(min_dist, dist)
+        if zone_type not in (ZoneType.THEFT, ZoneType.WATERLOGGING):
+            return None
 
+        min_dist = self._snapshot.index[zone_type].distance(Point(lon, lat))
+        if min_dist is None:
+            return None
         return min_dist * 111_320  # Convert degrees to meters
 
+    def zone_geometries(self, zone_type: ZoneType) -> np.ndarray:
+        """Indexed Shapely geometries for a zone layer (read-only)."""
+        return self._snapshot.zone_geometries(zone_type)
+
+    def zone_membership(
+        self, coordinates: np.ndarray, zone_types: Optional[List[ZoneType]] = None
+    ) -> Dict[ZoneType, np.ndarray]:
+        """
+        Bulk point-in-zone test for a whole route.
+        Takes an Nx2 array of (lon, lat) and returns a boolean mask of length N
+        per zone type, read from the precomputed zone grid with one STRtree
+        bulk query per layer for points in boundary cells.
+        """
+        snapshot = self._snapshot
+        if zone_types is None:
+            zone_types = list(snapshot.index)
+        return snapshot.risk_grid.membership(coordinates, zone_types)
+
+    def risk_at(self, coordinates: np.ndarray) -> np.ndarray:
+        """Zone risk (0-1) per (lon, lat) from the precomputed risk grid."""
+        return self._snapshot.risk_grid.lookup(coordinates)
+
     def road_quality_score(self, lon: float, lat: float) -> float:
         """
         Calculate road quality score (0-1) for bike routing:
@@ -116,26 +518,96 @@ class DelhiGeoUtils:
         # TODO: Integrate with MCD pothole database
         return 0.8
 
-    def calculate_route_safety(self, coordinates: List[Tuple[float, float]]) -> float:
+    def zone_lengths(
+        self,
+        routes: List[np.ndarray],
+        zone_types: Optional[List[ZoneType]] = None,
+    ) -> List[Dict[FrozenSet[ZoneType], float]]:
+        """
+        Metres ridden inside each combination of zone types, per route.
+        Every route is clipped to each layer (and to each overlap of layers)
+        with one bulk STRtree query per step; the keys of each result are
+        the exact set of zones a stretch lies in, frozenset() meaning none.
         """
-        Aggregate safety score (0-1) for entire route:
+        snapshot = self._snapshot
+        if zone_types is None:
+            zone_types = list(snapshot.index)
+        zone_types = [z for z in zone_types if z in snapshot.index]
+
+        coords = [np.asarray(route, dtype=float).reshape(-1, 2) for route in routes]
+        lines = np.array(
+            [shapely.linestrings(c) if len(c) > 1 else EMPTY_LINE for c in coords],
+            dtype=object,
+        )
+
+        # Clipped line and length for every overlap of layers, built up one
+        # layer at a time so each step is a line/polygon clip
+        clipped = {(): lines}
+        overlap = {frozenset(): line_metres(lines)}
+        pending = [()]
+        while pending:
+            combo = pending.pop()
+            start = zone_types.index(combo[-1]) + 1 if combo else 0
+            for zone_type in zone_types[start:]:
+                lines_in = snapshot.index[zone_type].clip(clipped[combo])
+                metres = line_metres(lines_in)
+                if not metres.any():
+                    continue
+                next_combo = (*combo, zone_type)
+                clipped[next_combo] = lines_in
+                overlap[frozenset(next_combo)] = metres
+                pending.append(next_combo)
+
+        # Inclusion-exclusion: metres in exactly each combination of zones
+        exact = {}
+        for combo in overlap:
+            metres = np.zeros(len(lines))
+            for other, other_metres in overlap.items():
+                if combo <= other:
+                    metres += (-1) ** len(other - combo) * other_metres
+            exact[combo] = np.maximum(metres, 0)
+
+        return [
+            {combo: float(metres[i]) for combo, metres in exact.items()}
+            for i in range(len(lines))
+        ]
+
+    @staticmethod
+    def stretch_safety(zones: FrozenSet[ZoneType]) -> float:
+        """Safety (0-1) of a stretch of road lying in exactly `zones`."""
+        safety = 0.5 if ZoneType.THEFT in zones else 1.0
+        safety *= 0.7 if ZoneType.WATERLOGGING in zones else 1.0
+        # Road quality: 1.0 on bike lanes, 0.8 on normal roads
+        safety *= 1.0 if ZoneType.BIKE_LANE in zones else 0.8
+        return safety
+
+    def calculate_route_safety(
+        self,
+        coordinates: List[Tuple[float, float]],
+        lengths: Optional[Dict[FrozenSet[ZoneType], float]] = None,
+    ) -> float:
+        """
+        Aggregate safety score (0-1) for entire route, weighted by distance:
         - Penalizes theft zones and poor roads
         - Rewards bike lanes
+        Pass precomputed `lengths` (see zone_lengths) to skip the clipping.
         """
-        if not coordinates:
+        if lengths is None:
+            lengths = self.zone_lengths(
+                [coordinates],
+                [ZoneType.THEFT, ZoneType.WATERLOGGING, ZoneType.BIKE_LANE],
+            )[0]
+        total = sum(lengths.values())
+        if not total:
             return 0.0
 
-        safety_scores = []
-        for lon, lat in coordinates:
-            score = 1.0
-            if self.is_in_zone(lon, lat, ZoneType.THEFT):
-                score *= 0.5
-            if self.is_in_zone(lon, lat, ZoneType.WATERLOGGING):
-                score *= 0.7
-            score *= self.road_quality_score(lon, lat)
-            safety_scores.append(score)
-
-        return np.mean(safety_scores)
+        return (
+            sum(
+                self.stretch_safety(zones) * metres
+                for zones, metres in lengths.items()
+            )
+            / total
+        )
 
     @staticmethod
     async def haversine_distance(
@@ -150,9 +622,55 @@ geo_utils = DelhiGeoUtils()
 
 
 class DelhiZoneManager:
+    """
+    Async zone provider: PostGIS (source of truth) -> Redis (shared cache)
+    -> in-process cache of parsed, indexed geometries.
+    Each zone type carries a version (feature count + last update); only
+    zone types whose version changed are re-pulled.
+    """
+
+    ZONE_TYPES = ("theft", "waterlogging", "bike_lanes")
+
     def __init__(self):
         self.redis = None
+        self.pool = None  # asyncpg pool, created on first production load
+        self.cache_ttl = settings.REDIS_CACHE_TTL
         self._dev_zones = {}  # For development storage
+        # zone_type -> (version, checked_at, features, index)
+        self._local: Dict[str, Tuple[str, float, List[Dict], ZoneIndex]] = {}
+        self._refresh_task: Optional[asyncio.Task] = None
+
+    async def _startup(self):
+        """Load zones and start re-pulling the layers PostGIS changes"""
+        try:
+            await self.load_zones()
+        except Exception as e:
+            # Routing doesn't depend on PostGIS; keep retrying in the background
+            logger.error(f"Zone manager load failed: {str(e)}")
+        if (
+            settings.ENVIRONMENT != Environment.DEVELOPMENT
+            and settings.ZONE_DB_REFRESH_INTERVAL
+        ):
+            self._refresh_task = asyncio.create_task(self._refresh_loop())
+
+    async def _shutdown(self):
+        """Stop refreshing and release connections"""
+        if self._refresh_task:
+            self._refresh_task.cancel()
+            self._refresh_task = None
+        await self.close()
+
+    async def _refresh_loop(self):
+        """Check PostGIS zone versions every ZONE_DB_REFRESH_INTERVAL"""
+        while True:
+            await asyncio.sleep(settings.ZONE_DB_REFRESH_INTERVAL)
+            try:
+                if self.pool is None:
+                    await self.load_zones()
+                else:
+                    await self.refresh()
+            except Exception as e:
+                logger.error(f"Zone manager refresh failed: {str(e)}")
 
     async def load_zones(self):
         """Environment-aware zone loading"""
@@ -166,38 +684,138 @@ class DelhiZoneManager:
                 # Fallback to empty zones in dev
                 self._dev_zones = {"theft": [], "waterlogging": [], "bike_lanes": []}
                 logger.warning("Using empty zones in development mode")
+            self._local.clear()
         else:
-            # Production: Initialize Redis and load properly
-            self.redis = Redis.from_url(settings.REDIS_URL)
+            # Production: Initialize Redis and PostGIS and load properly
+            if self.redis is None:
+                self.redis = Redis.from_url(str(settings.REDIS_URL))
+            if self.pool is None:
+                self.pool = await asyncpg.create_pool(
+                    str(settings.POSTGRES_URL),
+                    min_size=1,
+                    max_size=settings.POSTGIS_POOL_SIZE,
+                )
             await self._load_zones_to_cache()
-    
 
-    async def _load_zones_to_cache(self):
-        """Load all zones from DB to Redis on startup"""
+    async def close(self):
+        """Release the PostGIS pool and Redis connection"""
+        if self.pool:
+            await self.pool.close()
+            self.pool = None
+        if self.redis:
+            await self.redis.aclose()
+            self.redis = None
+
+    async def _load_zones_to_cache(self) -> List[str]:
+        """
+        Bulk load zones whose DB version differs from Redis into Redis.
+        Returns the zone types that were re-pulled.
+        """
+        db_versions = await self._fetch_db_versions()
+        cached_versions = await self.redis.mget(
+            [f"zones:{zone_type}:version" for zone_type in self.ZONE_TYPES]
+        )
+        changed = [
+            zone_type
+            for zone_type, cached in zip(self.ZONE_TYPES, cached_versions)
+            if cached is None or cached.decode() != db_versions.get(zone_type, "")
+        ]
+        if not changed:
+            return []
+
         zones = {
-            'theft': await self._fetch_from_db('theft'),
-            'waterlogging': await self._fetch_from_db('waterlogging'),
-            'bike_lanes': await self._fetch_from_db('bike_lanes')
+            zone_type: await self._fetch_from_db(zone_type) for zone_type in changed
         }
         async with self.redis.pipeline() as pipe:
             for zone_type, data in zones.items():
-                await pipe.setex(
-                    f"zones:{zone_type}",
-                    self.cache_ttl,
-                    json.dumps(data)
-                )
+                version = db_versions.get(zone_type, "")
+                pipe.set(f"zones:{zone_type}", json.dumps(data), ex=self.cache_ttl)
+                pipe.set(f"zones:{zone_type}:version", version, ex=self.cache_ttl)
             await pipe.execute()
+        logger.info(f"Re-pulled changed zones: {', '.join(changed)}")
+        return changed
+
+    async def refresh(self) -> List[str]:
+        """Re-pull only the zone types whose version changed in PostGIS"""
+        if settings.ENVIRONMENT == Environment.DEVELOPMENT:
+            return []
+        return await self._load_zones_to_cache()
 
+    async def _fetch_db_versions(self) -> Dict[str, str]:
+        async with self.pool.acquire() as conn:
+            rows = await conn.fetch(
+                f"SELECT zone_type, count(*) AS n, max(updated_at) AS updated "
+                f"FROM {settings.POSTGIS_TABLE} GROUP BY zone_type"
+            )
+        # max(updated_at) is NULL when a layer's rows carry no timestamps
+        return {
+            row["zone_type"]: (
+                f"{row['n']}:{row['updated'].isoformat() if row['updated'] else ''}"
+            )
+            for row in rows
+        }
+
+    async def _fetch_from_db(self, zone_type: str) -> List[Dict]:
+        """Fetch one zone layer from PostGIS as GeoJSON features"""
+        async with self.pool.acquire() as conn:
+            rows = await conn.fetch(
+                f"SELECT ST_AsGeoJSON(geom) AS geometry, properties "
+                f"FROM {settings.POSTGIS_TABLE} WHERE zone_type = $1",
+                zone_type,
+            )
+        return [
+            {
+                "type": "Feature",
+                "geometry": json.loads(row["geometry"]),
+                "properties": json.loads(row["properties"] or "{}"),
+            }
+            for row in rows
+        ]
 
     async def get_zones(self, zone_type: str) -> List[Dict]:
+        """Parsed zone features, served from the in-process cache when fresh"""
+        return (await self._get_cached(zone_type))[2]
+
+    async def get_index(self, zone_type: str) -> ZoneIndex:
+        """Spatial index over a zone layer, built once per zone version"""
+        return (await self._get_cached(zone_type))[3]
+
+    async def _get_cached(
+        self, zone_type: str
+    ) -> Tuple[str, float, List[Dict], ZoneIndex]:
+        entry = self._local.get(zone_type)
+        now = time.monotonic()
+        if entry and now - entry[1] < self.cache_ttl:
+            return entry
+
         if settings.ENVIRONMENT == Environment.DEVELOPMENT:
-            return self._dev_zones.get(zone_type, [])
+            version, features = "dev", self._dev_zones.get(zone_type, [])
+        else:
+            version = await self._cached_version(zone_type)
+            if entry and entry[0] == version:
+                # Unchanged: keep the parsed index, just restart the TTL
+                entry = (entry[0], now, entry[2], entry[3])
+                self._local[zone_type] = entry
+                return entry
+            features = await self._pull_zones(zone_type)
+            version = await self._cached_version(zone_type)
+
+        entry = (version, now, features, ZoneIndex.from_features(features))
+        self._local[zone_type] = entry
+        return entry
 
+    async def _cached_version(self, zone_type: str) -> str:
+        version = await self.redis.get(f"zones:{zone_type}:version")
+        return version.decode() if version else ""
+
+    async def _pull_zones(self, zone_type: str) -> List[Dict]:
         # Production logic with Redis fallback to DB
         cached = await self.redis.get(f"zones:{zone_type}")
         if cached:
             return json.loads(cached)
-        return await self._fetch_from_db(zone_type)
+        await self._load_zones_to_cache()
+        cached = await self.redis.get(f"zones:{zone_type}")
+        return json.loads(cached) if cached else await self._fetch_from_db(zone_type)
 
     def set_dev_zones(self, zone_type: str, data: List[Dict]):
         """Development-only: Manually set zone data"""
@@ -205,6 +823,17 @@ class DelhiZoneManager:
             raise RuntimeError("Only available in development mode")
 
         self._dev_zones[zone_type] = data
+        self._local.pop(zone_type, None)
         # Persist to local cache file
-        cache_file = settings.DATA_DIR / "zone_cache.dev.json"
+        cache_file = settings.ZONE_DATA_PATH / "zone_cache.dev.json"
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
         cache_file.write_text(json.dumps(self._dev_zones))
+
+
+# Shared zone manager (manage lifecycle with FastAPI events)
+zone_manager = DelhiZoneManager()
+lifecycle.add_resource(
+    name="zone_manager",
+    startup=zone_manager._startup,
+    shutdown=zone_manager._shutdown,
+)
@@ -0,0 +1,138 @@
+"""
+OSM node -> zone lookup table
+Road nodes of a Delhi OSM extract are classified against the indexed zone
+layers offline, so routes returned with OSRM node annotations can be scored
+without touching their geometry: a route's nodes are resolved with one
+binary search over the sorted node ids.
+
+The table is an .npz of sorted node ids, their (lon, lat) and a uint16 zone
+bitmask per node (bits as in geospatial.ZONE_BITS), tagged with the zone
+data version it was built from. Building it needs pyosmium (`pip install
+osmium`), which the service itself does not.
+
+Usage: python -m app.utils.nodetable <extract.osm.pbf> [output path]
+"""
+
+import logging
+import sys
+from pathlib import Path
+from typing import Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class NodeTable:
+    """Sorted node id -> (coordinates, zone bitmask) lookup"""
+
+    def __init__(
+        self, version: str, ids: np.ndarray, coords: np.ndarray, masks: np.ndarray
+    ):
+        self.version = version
+        self.ids = ids
+        self.coords = coords
+        self.masks = masks
+
+    @classmethod
+    def from_file(cls, path: Path) -> "NodeTable":
+        with np.load(path) as data:
+            return cls(
+                str(data["version"]), data["ids"], data["coords"], data["masks"]
+            )
+
+    @staticmethod
+    def read_version(path: Path) -> str:
+        """Zone data version a table file was built from, without loading it"""
+        with np.load(path) as data:
+            return str(data["version"])
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def lookup(self, node_ids: np.ndarray) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """
+        (coords, masks) for an array of OSM node ids, or None if any node is
+        missing from the table (e.g. the OSRM dataset is newer)
+        """
+        node_ids = np.asarray(node_ids, dtype=np.int64)
+        positions = np.searchsorted(self.ids, node_ids)
+        positions[positions == len(self.ids)] = 0
+        if not len(self.ids) or not np.array_equal(self.ids[positions], node_ids):
+            return None
+        return self.coords[positions], self.masks[positions]
+
+    def save(self, path: Path):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "wb") as f:
+            np.savez(
+                f,
+                version=np.array(self.version),
+                ids=self.ids,
+                coords=self.coords,
+                masks=self.masks,
+            )
+
+
+def read_road_nodes(osm_path: Path, boundary: dict) -> Tuple[np.ndarray, np.ndarray]:
+    """Unique (ids, coords) of nodes on highways inside `boundary`"""
+    try:
+        import osmium
+    except ImportError as exc:
+        raise ImportError("Building a node table requires pyosmium") from exc
+
+    ids, coords = [], []
+
+    class RoadNodes(osmium.SimpleHandler):
+        def way(self, way):
+            if "highway" not in way.tags:
+                return
+            for node in way.nodes:
+                if not node.location.valid():
+                    continue
+                lon, lat = node.location.lon, node.location.lat
+                if (
+                    boundary["min_lon"] <= lon <= boundary["max_lon"]
+                    and boundary["min_lat"] <= lat <= boundary["max_lat"]
+                ):
+                    ids.append(node.ref)
+                    coords.append((lon, lat))
+
+    RoadNodes().apply_file(str(osm_path), locations=True)
+    ids, first = np.unique(np.array(ids, dtype=np.int64), return_index=True)
+    return ids, np.array(coords, dtype=float).reshape(-1, 2)[first]
+
+
+def build_node_table(osm_path: Path) -> NodeTable:
+    """Classify the road nodes of an OSM extract against the loaded zones"""
+    from app.core.config import settings
+    from app.utils.geospatial import ZONE_BITS, geo_utils
+
+    ids, coords = read_road_nodes(osm_path, settings.DELHI_BOUNDARY)
+    masks = np.zeros(len(ids), dtype=np.uint16)
+    for zone_type, inside in geo_utils.zone_membership(coords, list(ZONE_BITS)).items():
+        masks[inside] |= np.uint16(1 << ZONE_BITS[zone_type])
+    return NodeTable(geo_utils.version, ids, coords, masks)
+
+
+def main(argv=None):
+    """Build the node table for an OSM extract from the current zone data"""
+    import asyncio
+
+    from app.core.config import settings
+    from app.utils.geospatial import geo_utils
+
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv:
+        sys.exit("Usage: python -m app.utils.nodetable <extract.osm.pbf> [output]")
+    output = Path(argv[1]) if len(argv) > 1 else settings.NODE_TABLE_PATH
+    asyncio.run(geo_utils.load_zones())
+    table = build_node_table(Path(argv[0]))
+    table.save(output)
+    logger.info(
+        f"Built node table {output}: {len(table)} nodes (zones {table.version})"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,382 @@
+"""
+Compact road graph for in-process routing
+The bikeable ways of a Delhi OSM extract are kept as CSR arrays: node
+(lon, lat), per-node offsets into the outgoing edges, and each edge's head
+node, length in metres and uint16 zone bitmask (bits as in
+geospatial.ZONE_BITS, classified at the edge midpoint). Queries run a
+bidirectional A* whose edge costs inflate the length of edges inside
+avoided zones, so routes detour around hazards rather than being picked
+from whatever alternatives OSRM returned.
+
+The graph is an .npz tagged with the zone data version its bitmasks were
+classified against. Building it needs pyosmium (`pip install osmium`),
+which the service itself does not.
+
+Usage: python -m app.utils.roadgraph <extract.osm.pbf> [output path]
+"""
+
+import heapq
+import logging
+import math
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import shapely
+
+from app.core.constants import ZoneType
+from app.utils.geospatial import ZONE_BITS, project_metres
+
+logger = logging.getLogger(__name__)
+
+# Highways a bicycle may use; motorways and unbuilt roads are left out
+BIKE_HIGHWAYS = {
+    "trunk",
+    "trunk_link",
+    "primary",
+    "primary_link",
+    "secondary",
+    "secondary_link",
+    "tertiary",
+    "tertiary_link",
+    "unclassified",
+    "residential",
+    "living_street",
+    "service",
+    "road",
+    "track",
+    "cycleway",
+    "path",
+    "footway",
+    "pedestrian",
+}
+
+# Metres per degree of (lon, lat) in the projection the lengths use
+_METRES_PER_DEG = project_metres(np.ones(2))
+
+# Keeps the A* potentials strictly below true costs despite float32 lengths
+_HEURISTIC_SCALE = 0.999
+
+
+class EdgeZones:
+    """
+    Edge zone bitmasks for one zone data version, with the edge costs
+    derived from them. Reclassifying builds a new instance, so requests
+    already routing keep a consistent set.
+    """
+
+    def __init__(self, version: str, lengths: np.ndarray, masks: np.ndarray):
+        self.version = version
+        self.lengths = lengths
+        self.masks = masks
+        self._costs: Dict[Tuple[Tuple[ZoneType, ...], float], np.ndarray] = {}
+
+    def edge_costs(self, avoid: List[ZoneType], risk_weight: float) -> np.ndarray:
+        """
+        Edge lengths, each metre inside an avoided zone costing
+        1 + risk_weight metres (cached per avoid set)
+        """
+        zones = tuple(sorted({z for z in avoid if z in ZONE_BITS}, key=str))
+        costs = self._costs.get((zones, risk_weight))
+        if costs is None:
+            costs = self.lengths
+            if zones:
+                hits = sum((self.masks >> ZONE_BITS[zone]) & 1 for zone in zones)
+                costs = costs * (1 + risk_weight * hits.astype(np.float32))
+            self._costs[(zones, risk_weight)] = costs
+        return costs
+
+
+class RoadGraph:
+    """Directed road graph in CSR form with per-edge zone bitmasks"""
+
+    def __init__(
+        self,
+        version: str,
+        coords: np.ndarray,
+        indptr: np.ndarray,
+        heads: np.ndarray,
+        lengths: np.ndarray,
+        masks: np.ndarray,
+    ):
+        self.coords = coords
+        self.indptr = indptr
+        self.heads = heads
+        self.lengths = lengths
+        self.zones = EdgeZones(version, lengths, masks)
+        self.xy = project_metres(coords)
+
+        # Incoming edges per node, for the backward search
+        tails = np.repeat(np.arange(len(coords)), np.diff(indptr))
+        self.rev_edges = np.argsort(heads, kind="stable")
+        self.rev_tails = tails[self.rev_edges]
+        self.rev_indptr = np.concatenate(
+            [[0], np.cumsum(np.bincount(heads, minlength=len(coords)))]
+        )
+
+        self._tree: Optional[shapely.STRtree] = None
+
+    @classmethod
+    def from_edges(
+        cls, version: str, coords: np.ndarray, tails: np.ndarray, heads: np.ndarray
+    ) -> "RoadGraph":
+        """Graph from directed (tail, head) node index pairs, zones unclassified"""
+        order = np.lexsort((heads, tails))
+        tails, heads = tails[order], heads[order]
+        indptr = np.concatenate(
+            [[0], np.cumsum(np.bincount(tails, minlength=len(coords)))]
+        )
+        xy = project_metres(coords)
+        lengths = np.hypot(*(xy[heads] - xy[tails]).T).astype(np.float32)
+        masks = np.zeros(len(heads), dtype=np.uint16)
+        return cls(version, coords, indptr, heads.astype(np.int32), lengths, masks)
+
+    @classmethod
+    def from_file(cls, path: Path) -> "RoadGraph":
+        with np.load(path) as data:
+            return cls(
+                str(data["version"]),
+                data["coords"],
+                data["indptr"],
+                data["heads"],
+                data["lengths"],
+                data["masks"],
+            )
+
+    def save(self, path: Path):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "wb") as f:
+            np.savez(
+                f,
+                version=np.array(self.version),
+                coords=self.coords,
+                indptr=self.indptr,
+                heads=self.heads,
+                lengths=self.lengths,
+                masks=self.masks,
+            )
+
+    def __len__(self) -> int:
+        return len(self.coords)
+
+    @property
+    def version(self) -> str:
+        return self.zones.version
+
+    @property
+    def masks(self) -> np.ndarray:
+        return self.zones.masks
+
+    def classify(self, snapshot) -> EdgeZones:
+        """
+        Edge zone bitmasks from a zone snapshot, leaving the graph's own
+        untouched (assign the result to `zones` to use it)
+        """
+        tails = np.repeat(np.arange(len(self)), np.diff(self.indptr))
+        midpoints = (self.coords[tails] + self.coords[self.heads]) / 2
+        masks = np.zeros(len(self.heads), dtype=np.uint16)
+        for zone_type, inside in snapshot.risk_grid.membership(
+            midpoints, list(ZONE_BITS)
+        ).items():
+            masks[inside] |= np.uint16(1 << ZONE_BITS[zone_type])
+        return EdgeZones(snapshot.version, self.lengths, masks)
+
+    def nearest(self, lon: float, lat: float, max_metres: float) -> Optional[int]:
+        """Index of the closest node within `max_metres`, if any"""
+        if self._tree is None:
+            self._tree = shapely.STRtree(shapely.points(self.coords))
+        point = shapely.Point(lon, lat)
+        # Search the radius in degrees of longitude (the shorter), then
+        # re-check the nearest node in metres
+        found = self._tree.query_nearest(
+            point, max_distance=max_metres / _METRES_PER_DEG.min()
+        )
+        if not len(found):
+            return None
+        node = int(found[0])
+        x, y = project_metres(np.array([lon, lat]))
+        if math.hypot(*(self.xy[node] - (x, y))) > max_metres:
+            return None
+        return node
+
+    def shortest_path(
+        self, source: int, target: int, costs: np.ndarray
+    ) -> Optional[List[int]]:
+        """
+        Node indices of the cheapest source -> target path, or None if the
+        target is unreachable. Bidirectional A* with the average of the
+        straight-line potentials towards each end, which is consistent for
+        both directions since every cost is at least the edge's length.
+        """
+        if source == target:
+            return [source]
+
+        xy = self.xy
+        (sx, sy), (tx, ty) = xy[source].tolist(), xy[target].tolist()
+        potentials: Dict[int, float] = {}
+
+        def potential(v: int) -> float:
+            p = potentials.get(v)
+            if p is None:
+                x, y = xy[v].tolist()
+                p = potentials[v] = (
+                    _HEURISTIC_SCALE
+                    * (math.hypot(x - tx, y - ty) - math.hypot(x - sx, y - sy))
+                    / 2
+                )
+            return p
+
+        adjacency = (
+            (self.indptr, self.heads, None),
+            (self.rev_indptr, self.rev_tails, self.rev_edges),
+        )
+        dist: Tuple[Dict[int, float], Dict[int, float]] = ({source: 0.0}, {target: 0.0})
+        parent: Tuple[Dict[int, int], Dict[int, int]] = ({source: -1}, {target: -1})
+        heaps = ([(potential(source), source)], [(-potential(target), target)])
+        settled = (set(), set())
+        best, meet = math.inf, -1
+
+        while heaps[0] and heaps[1]:
+            # Stop once no path through either frontier can beat the best
+            if heaps[0][0][0] + heaps[1][0][0] >= best:
+                break
+            # Expand the smaller frontier
+            side = 0 if len(heaps[0]) <= len(heaps[1]) else 1
+            _, u = heapq.heappop(heaps[side])
+            if u in settled[side]:
+                continue
+            settled[side].add(u)
+
+            indptr, neighbours, edges = adjacency[side]
+            start, end = indptr[u], indptr[u + 1]
+            edge_costs = costs[start:end] if edges is None else costs[edges[start:end]]
+            sign = 1 if side == 0 else -1
+            here, there, parents = dist[side], dist[1 - side], parent[side]
+            d_u = here[u]
+            for v, cost in zip(neighbours[start:end].tolist(), edge_costs.tolist()):
+                d = d_u + cost
+                if d < here.get(v, math.inf):
+                    here[v] = d
+                    parents[v] = u
+                    heapq.heappush(heaps[side], (d + sign * potential(v), v))
+                    if v in there and d + there[v] < best:
+                        best, meet = d + there[v], v
+
+        if meet < 0:
+            return None
+        path = []
+        node = meet
+        while node >= 0:
+            path.append(node)
+            node = parent[0][node]
+        path.reverse()
+        node = parent[1][meet]
+        while node >= 0:
+            path.append(node)
+            node = parent[1][node]
+        return path
+
+    def path_metres(self, path: List[int]) -> float:
+        """Length of a node path in metres"""
+        xy = self.xy[path]
+        return float(np.hypot(*np.diff(xy, axis=0).T).sum())
+
+
+def read_road_edges(
+    osm_path: Path, boundary: dict
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Node coords and directed (tail, head) index pairs for every bikeable
+    way segment inside `boundary`, honouring one-way streets
+    """
+    try:
+        import osmium
+    except ImportError as exc:
+        raise ImportError("Building a road graph requires pyosmium") from exc
+
+    refs, lons, lats, tails, heads = [], [], [], [], []
+
+    def inside(lon: float, lat: float) -> bool:
+        return (
+            boundary["min_lon"] <= lon <= boundary["max_lon"]
+            and boundary["min_lat"] <= lat <= boundary["max_lat"]
+        )
+
+    class RoadEdges(osmium.SimpleHandler):
+        def way(self, way):
+            tags = way.tags
+            if tags.get("highway") not in BIKE_HIGHWAYS:
+                return
+            if tags.get("bicycle") == "no" or (
+                tags.get("access") in ("no", "private")
+                and tags.get("bicycle") not in ("yes", "designated")
+            ):
+                return
+            oneway = tags.get("oneway")
+            if tags.get("junction") == "roundabout" and oneway is None:
+                oneway = "yes"
+            if tags.get("oneway:bicycle") == "no":
+                oneway = "no"
+
+            previous = None
+            for node in way.nodes:
+                location = node.location
+                if not location.valid() or not inside(location.lon, location.lat):
+                    previous = None
+                    continue
+                refs.append(node.ref)
+                lons.append(location.lon)
+                lats.append(location.lat)
+                if previous is not None:
+                    if oneway != "-1":
+                        tails.append(previous)
+                        heads.append(node.ref)
+                    if oneway not in ("yes", "1", "true"):
+                        tails.append(node.ref)
+                        heads.append(previous)
+                previous = node.ref
+
+    RoadEdges().apply_file(str(osm_path), locations=True)
+    ids, first = np.unique(np.array(refs, dtype=np.int64), return_index=True)
+    coords = np.column_stack([lons, lats]).reshape(-1, 2)[first]
+    return (
+        coords,
+        np.searchsorted(ids, np.array(tails, dtype=np.int64)),
+        np.searchsorted(ids, np.array(heads, dtype=np.int64)),
+    )
+
+
+def build_road_graph(osm_path: Path) -> RoadGraph:
+    """Road graph of an OSM extract with edges classified against the zones"""
+    from app.core.config import settings
+    from app.utils.geospatial import geo_utils
+
+    coords, tails, heads = read_road_edges(osm_path, settings.DELHI_BOUNDARY)
+    graph = RoadGraph.from_edges(geo_utils.version, coords, tails, heads)
+    graph.zones = graph.classify(geo_utils.snapshot)
+    return graph
+
+
+def main(argv=None):
+    """Build the road graph for an OSM extract from the current zone data"""
+    import asyncio
+
+    from app.core.config import settings
+    from app.utils.geospatial import geo_utils
+
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv:
+        sys.exit("Usage: python -m app.utils.roadgraph <extract.osm.pbf> [output]")
+    output = Path(argv[1]) if len(argv) > 1 else settings.ROAD_GRAPH_PATH
+    asyncio.run(geo_utils.load_zones())
+    graph = build_road_graph(Path(argv[0]))
+    graph.save(output)
+    logger.info(
+        f"Built road graph {output}: {len(graph)} nodes, "
+        f"{len(graph.heads)} edges (zones {graph.version})"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+"""
+Compact binary zone store
+GeoJSON zone layers are compiled offline into one file of WKB geometries
+with per-feature offsets and the precomputed zone bitmask grid. The service maps the
+file read-only with mmap, so forked workers share its pages and start
+without parsing JSON.
+
+Layout: MAGIC | u32 header length | JSON header | 8-byte aligned sections.
+The header records the zone data version and, per section, its byte offset
+(relative to the first section) and length. Shapely trees can't be
+serialized, so the STRtree is bulk-built from the decoded WKB at load.
+
+Usage: python -m app.utils.zonestore [output path]
+"""
+
+import json
+import logging
+import mmap
+import struct
+import sys
+from pathlib import Path
+from typing import Dict, Optional
+
+import numpy as np
+import shapely
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"DZS1"
+_ALIGN = 8
+
+
+def write_store(
+    path: Path,
+    version: str,
+    layers: Dict[str, np.ndarray],
+    risk_grid: Optional[np.ndarray] = None,
+    grid_meta: Optional[Dict] = None,
+):
+    """Serialize Shapely geometry arrays per layer (and a risk grid) to path"""
+    sections = []
+    position = 0
+
+    def add(data: bytes) -> list:
+        # [offset relative to the first section, length]
+        nonlocal position
+        ref = [position, len(data)]
+        sections.append(data)
+        position += _aligned(len(data))
+        return ref
+
+    header = {"version": version, "layers": {}, "risk_grid": None}
+    for name, geometries in layers.items():
+        wkb = shapely.to_wkb(geometries).tolist() if len(geometries) else []
+        offsets = np.zeros(len(wkb) + 1, dtype="<u8")
+        offsets[1:] = np.cumsum([len(blob) for blob in wkb])
+        header["layers"][name] = {
+            "count": len(wkb),
+            "offsets": add(offsets.tobytes()),
+            "wkb": add(b"".join(wkb)),
+        }
+    if risk_grid is not None:
+        grid = np.ascontiguousarray(risk_grid)
+        grid = grid.astype(grid.dtype.newbyteorder("<"))
+        header["risk_grid"] = {
+            **(grid_meta or {}),
+            "dtype": grid.dtype.str,
+            "shape": list(grid.shape),
+            "data": add(grid.tobytes()),
+        }
+
+    raw_header = json.dumps(header, sort_keys=True).encode()
+    prefix = MAGIC + struct.pack("<I", len(raw_header)) + raw_header
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(prefix.ljust(_aligned(len(prefix)), b"\0"))
+        for data in sections:
+            f.write(data.ljust(_aligned(len(data)), b"\0"))
+
+
+def _aligned(n: int) -> int:
+    return (n + _ALIGN - 1) // _ALIGN * _ALIGN
+
+
+class ZoneStore:
+    """Read-only, memory-mapped view of a compiled zone store"""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        with open(self.path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._mm[: len(MAGIC)] != MAGIC:
+            raise ValueError(f"Not a zone store: {self.path}")
+        (length,) = struct.unpack_from("<I", self._mm, len(MAGIC))
+        start = len(MAGIC) + 4
+        self.header = json.loads(bytes(self._mm[start : start + length]))
+        self.version: str = self.header["version"]
+        self._base = _aligned(start + length)
+
+    def _array(self, ref: list, dtype: str) -> np.ndarray:
+        offset, length = ref
+        return np.frombuffer(
+            self._mm,
+            dtype=dtype,
+            count=length // np.dtype(dtype).itemsize,
+            offset=self._base + offset,
+        )
+
+    def geometries(self, name: str) -> np.ndarray:
+        """Decode one layer's WKB section into Shapely geometries"""
+        layer = self.header["layers"].get(name)
+        if not layer or not layer["count"]:
+            return np.array([], dtype=object)
+        offsets = self._array(layer["offsets"], "<u8")
+        base = self._base + layer["wkb"][0]
+        blobs = [
+            self._mm[base + start : base + end]
+            for start, end in zip(offsets[:-1].tolist(), offsets[1:].tolist())
+        ]
+        return shapely.from_wkb(blobs)
+
+    def risk_grid(self, **expected) -> Optional[np.ndarray]:
+        """
+        Zero-copy view of the stored risk grid, or None if absent or built
+        with different parameters than `expected`
+        """
+        grid = self.header.get("risk_grid")
+        if not grid or any(grid.get(k) != v for k, v in expected.items()):
+            return None
+        return self._array(grid["data"], grid["dtype"]).reshape(grid["shape"])
+
+
+def main(argv=None):
+    """Compile the GeoJSON zone layers into a binary zone store"""
+    import asyncio
+
+    from app.core.config import settings
+    from app.utils.geospatial import geo_utils
+
+    argv = sys.argv[1:] if argv is None else argv
+    output = Path(argv[0]) if argv else settings.ZONE_STORE_PATH
+    asyncio.run(geo_utils.load_geojson_zones())
+    geo_utils.compile_zone_store(output)
+    logger.info(f"Compiled zone store {output} (version {geo_utils.version})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,8 @@
+"""
+Benchmarks for the Delhi bike router
+Synthetic zone layers and OSRM-like routes (benchmarks.synthetic) feed
+micro-benchmarks of the geospatial scoring hot path (benchmarks.micro),
+which write JSON results that can be compared between runs. For end-to-end
+load tests, benchmarks.osrm_stub replaces osrm-routed and benchmarks.loadgen
+drives the API at a fixed request rate.
+"""
@@ -0,0 +1,133 @@
+"""
+Async load generator for the routing API
+Drives POST /api/v1/routes open-loop at a target rate: requests are sent on
+schedule whether or not earlier ones have finished, and latency is measured
+from the scheduled send time so a slow server can't hide its queueing.
+Reports throughput, status counts and latency percentiles as JSON.
+
+Usage:
+    python -m benchmarks.loadgen --url http://localhost:8000 --rps 50 --duration 30
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from collections import Counter
+from typing import Dict, List
+
+import aiohttp
+import numpy as np
+
+from app.core.config import settings
+
+
+def od_pairs(count: int, seed: int) -> List[Dict]:
+    """Seeded origin-destination request bodies inside DELHI_BOUNDARY"""
+    rng = np.random.default_rng(seed)
+    boundary = settings.DELHI_BOUNDARY
+    lon = rng.uniform(boundary["min_lon"], boundary["max_lon"], (count, 2))
+    lat = rng.uniform(boundary["min_lat"], boundary["max_lat"], (count, 2))
+    return [
+        {
+            "start_lon": float(lon[i, 0]),
+            "start_lat": float(lat[i, 0]),
+            "end_lon": float(lon[i, 1]),
+            "end_lat": float(lat[i, 1]),
+        }
+        for i in range(count)
+    ]
+
+
+async def run_load(args: argparse.Namespace) -> Dict:
+    url = args.url.rstrip("/") + "/api/v1/routes"
+    bodies = od_pairs(args.pairs, args.seed)
+    if args.avoid:
+        for body in bodies:
+            body["avoid"] = args.avoid
+
+    total = max(1, int(args.rps * args.duration))
+    latencies: List[float] = []
+    statuses: Counter = Counter()
+    in_flight = asyncio.Semaphore(args.concurrency)
+    timeout = aiohttp.ClientTimeout(total=args.timeout)
+    connector = aiohttp.TCPConnector(limit=args.concurrency)
+
+    async with aiohttp.ClientSession(timeout=timeout, connector=connector) as session:
+
+        async def send(i: int, scheduled: float):
+            async with in_flight:
+                try:
+                    async with session.post(url, json=bodies[i % len(bodies)]) as r:
+                        await r.read()
+                        statuses[r.status] += 1
+                except asyncio.TimeoutError:
+                    statuses["timeout"] += 1
+                except aiohttp.ClientError as e:
+                    statuses[type(e).__name__] += 1
+            latencies.append(time.perf_counter() - scheduled)
+
+        started = time.perf_counter()
+        tasks = []
+        for i in range(total):
+            scheduled = started + i / args.rps
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            tasks.append(asyncio.create_task(send(i, scheduled)))
+        await asyncio.gather(*tasks)
+        elapsed = time.perf_counter() - started
+
+    ok = statuses.get(200, 0)
+    latency_ms = np.asarray(latencies) * 1000
+    return {
+        "target_rps": args.rps,
+        "duration": args.duration,
+        "requests": total,
+        "elapsed": elapsed,
+        "throughput_rps": total / elapsed,
+        "ok_rps": ok / elapsed,
+        "statuses": {str(k): v for k, v in sorted(statuses.items(), key=str)},
+        "latency_ms": {
+            "p50": float(np.percentile(latency_ms, 50)),
+            "p95": float(np.percentile(latency_ms, 95)),
+            "p99": float(np.percentile(latency_ms, 99)),
+            "max": float(latency_ms.max()),
+            "mean": float(latency_ms.mean()),
+        },
+        "pairs": args.pairs,
+        "avoid": args.avoid,
+        "concurrency": args.concurrency,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Routing API load generator")
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--rps", type=float, default=20.0)
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds")
+    parser.add_argument(
+        "--pairs",
+        type=int,
+        default=1000,
+        help="Distinct origin-destination pairs (fewer means more cache hits)",
+    )
+    parser.add_argument("--avoid", nargs="*", default=[], help="e.g. theft")
+    parser.add_argument("--concurrency", type=int, default=256, help="Max in flight")
+    parser.add_argument("--timeout", type=float, default=30.0, help="Seconds")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Write JSON results here (default stdout)")
+    args = parser.parse_args(argv)
+    if args.rps <= 0 or args.duration <= 0:
+        parser.error("--rps and --duration must be positive")
+
+    report = json.dumps(asyncio.run(run_load(args)), indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(report + "\n")
+    else:
+        print(report)
+
+
+if __name__ == "__main__":
+    main()
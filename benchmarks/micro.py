@@ -0,0 +1,205 @@
+"""
+Micro-benchmarks for the geospatial scoring hot path
+Builds a zone snapshot from synthetic layers, then times the per-point,
+per-route and batch scorers. Results are written as JSON; pass --compare
+with an earlier result file to flag regressions.
+
+Usage: python -m benchmarks.micro [--output results.json] [--compare base.json]
+"""
+
+import argparse
+import asyncio
+import json
+import platform
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Awaitable, Callable, Dict, List
+
+import numpy as np
+
+from app.core.constants import ZoneType
+from app.services.delhi_optimizer import DelhiRouteOptimizer
+from app.services.scoring import route_coordinates, scoring_engine
+from app.utils.geospatial import ZoneSnapshot, geo_utils
+from benchmarks.synthetic import generate_routes, generate_zones
+
+
+def summarize(times: List[float], items: int = 1) -> Dict:
+    """Latency statistics (seconds per call) for a list of call timings"""
+    times = np.asarray(times)
+    return {
+        "calls": len(times),
+        "items_per_call": items,
+        "min": float(times.min()),
+        "median": float(np.median(times)),
+        "mean": float(times.mean()),
+        "p95": float(np.percentile(times, 95)),
+        "items_per_sec": float(items / np.median(times)),
+    }
+
+
+def measure(fn: Callable[[], object], repeat: int, items: int = 1) -> Dict:
+    """Time `repeat` calls of fn after one warm-up call"""
+    fn()
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - started)
+    return summarize(times, items)
+
+
+def measure_async(
+    fn: Callable[[], Awaitable[object]], repeat: int, items: int = 1
+) -> Dict:
+    """Time `repeat` awaits of fn() inside one event loop"""
+
+    async def run() -> List[float]:
+        await fn()
+        times = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            await fn()
+            times.append(time.perf_counter() - started)
+        return times
+
+    return summarize(asyncio.run(run()), items)
+
+
+def run_benchmarks(args: argparse.Namespace) -> Dict:
+    started = time.perf_counter()
+    snapshot = ZoneSnapshot.from_features(
+        generate_zones(args.theft, args.waterlogging, args.bike_lanes, args.seed)
+    )
+    build_seconds = time.perf_counter() - started
+    geo_utils.swap(snapshot)
+
+    routes = generate_routes(args.routes, args.min_km, args.max_km, seed=args.seed + 1)
+    coordinates = [route_coordinates(route) for route in routes]
+    points = np.concatenate([np.asarray(c) for c in coordinates])
+    sample = points[:: max(1, len(points) // 1000)]
+    repeat = args.repeat
+
+    def is_in_zone():
+        for lon, lat in sample:
+            geo_utils.is_in_zone(lon, lat, ZoneType.THEFT)
+
+    def route_safety():
+        for coords in coordinates:
+            geo_utils.calculate_route_safety(coords)
+
+    def detect_hazards():
+        for coords in coordinates:
+            coords = np.asarray(coords, dtype=float)
+            membership = geo_utils.zone_membership(
+                coords, [ZoneType.THEFT, ZoneType.WATERLOGGING]
+            )
+            scoring_engine.detect_hazards(coords, membership, [])
+
+    optimizer = DelhiRouteOptimizer()
+
+    async def optimize():
+        for route in routes:
+            await optimizer.optimize(route)
+
+    def score_many():
+        scoring_engine.score_many(coordinates, [[] for _ in coordinates])
+
+    results = {
+        "zone_snapshot_build": {"seconds": build_seconds},
+        "is_in_zone": measure(is_in_zone, repeat, len(sample)),
+        "calculate_route_safety": measure(route_safety, repeat, len(routes)),
+        "detect_hazards_along_route": measure(detect_hazards, repeat, len(routes)),
+        "optimizer_optimize": measure_async(optimize, repeat, len(routes)),
+        "score_many": measure(score_many, repeat, len(routes)),
+    }
+    return {"meta": _meta(args, points), "results": results}
+
+
+def _meta(args: argparse.Namespace, points: np.ndarray) -> Dict:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "commit": commit,
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "zones": {
+            "theft": args.theft,
+            "waterlogging": args.waterlogging,
+            "bike_lanes": args.bike_lanes,
+        },
+        "routes": args.routes,
+        "route_points": len(points),
+        "seed": args.seed,
+        "repeat": args.repeat,
+    }
+
+
+def compare(current: Dict, baseline: Dict, tolerance: float) -> List[str]:
+    """
+    Benchmarks whose best time got slower than baseline by over `tolerance`
+    (the minimum is the least noisy statistic for micro-benchmarks)
+    """
+    regressions = []
+    for name, stats in current["results"].items():
+        before = baseline.get("results", {}).get(name, {})
+        if "min" not in stats or "min" not in before:
+            continue
+        ratio = stats["min"] / before["min"]
+        print(
+            f"{name:32s} {before['min']:.6f}s -> {stats['min']:.6f}s "
+            f"({ratio:.2f}x)",
+            file=sys.stderr,
+        )
+        if ratio > 1 + tolerance:
+            regressions.append(name)
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--theft", type=int, default=200)
+    parser.add_argument("--waterlogging", type=int, default=100)
+    parser.add_argument("--bike-lanes", type=int, default=300)
+    parser.add_argument("--routes", type=int, default=50)
+    parser.add_argument("--min-km", type=float, default=2.0)
+    parser.add_argument("--max-km", type=float, default=20.0)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Write JSON results here (default stdout)")
+    parser.add_argument("--compare", help="Baseline JSON results to compare with")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.1,
+        help="Allowed slowdown vs baseline before failing (0.1 = 10%%)",
+    )
+    args = parser.parse_args(argv)
+
+    report = run_benchmarks(args)
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(report, json.load(f), args.tolerance)
+        if regressions:
+            sys.exit(f"Regressed: {', '.join(regressions)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,197 @@
+"""
+Local OSRM stand-in for load tests
+Serves /route, /table and /nearest without osrm-routed or processed PBF
+data. Responses come from a recording when one matches the request, and
+are synthesized otherwise; latency, 5xx errors and hangs can be injected.
+With --record, requests are proxied to a real OSRM and the responses
+appended to the recording for later replay.
+
+Usage:
+    python -m benchmarks.osrm_stub --port 5055 --latency 0.02 --error-rate 0.01
+    python -m benchmarks.osrm_stub --record http://localhost:5000 \\
+        --recordings osrm.jsonl
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import random
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import polyline
+from aiohttp import ClientSession, web
+
+from benchmarks.synthetic import CYCLING_SPEED, METRES_PER_DEG_LAT, METRES_PER_DEG_LON
+
+logger = logging.getLogger(__name__)
+
+
+def request_key(path: str, params: Dict) -> str:
+    """Recording key: path plus params in a stable order"""
+    return path + "?" + "&".join(f"{k}={params[k]}" for k in sorted(params))
+
+
+def _coordinates(path: str) -> List[Tuple[float, float]]:
+    """(lon, lat) pairs from the last segment of an OSRM service path"""
+    return [
+        tuple(float(v) for v in pair.split(","))
+        for pair in path.rsplit("/", 1)[-1].split(";")
+    ]
+
+
+def _metres(a: np.ndarray, b: np.ndarray) -> float:
+    d = (b - a) * [METRES_PER_DEG_LON, METRES_PER_DEG_LAT]
+    return float(np.hypot(*d))
+
+
+def synthetic_route(
+    start: Tuple[float, float], end: Tuple[float, float], bend: float, params: Dict
+) -> Dict:
+    """A route bowed sideways by `bend` (fraction of its length), OSRM v5 shaped"""
+    start, end = np.asarray(start), np.asarray(end)
+    direct = _metres(start, end)
+    n = max(2, int(direct / 25))  # Vertex every ~25m, like overview=full
+    t = np.linspace(0, 1, n)[:, None]
+    normal = np.array([-(end - start)[1], (end - start)[0]])
+    coords = start + (end - start) * t + normal * bend * np.sin(np.pi * t)
+    distance = sum(_metres(a, b) for a, b in zip(coords[:-1], coords[1:]))
+
+    if params.get("overview") == "false":
+        geometry = None
+    elif params.get("geometries") == "geojson":
+        geometry = {"type": "LineString", "coordinates": coords.tolist()}
+    else:
+        precision = 6 if params.get("geometries") == "polyline6" else 5
+        geometry = polyline.encode(coords.tolist(), precision, geojson=True)
+
+    duration = distance / CYCLING_SPEED
+    leg = {"distance": distance, "duration": duration, "summary": "", "steps": []}
+    route = {
+        "distance": distance,
+        "duration": duration,
+        "weight": duration,
+        "weight_name": "duration",
+        "legs": [leg],
+    }
+    if geometry is not None:
+        route["geometry"] = geometry
+    return route
+
+
+class OSRMStub:
+    def __init__(self, args: argparse.Namespace):
+        self.args = args
+        self.recordings: Dict[str, Dict] = {}
+        self.session: Optional[ClientSession] = None
+        if args.recordings and Path(args.recordings).exists():
+            with open(args.recordings) as f:
+                for line in f:
+                    entry = json.loads(line)
+                    self.recordings[entry["key"]] = entry
+            logger.info(f"Loaded {len(self.recordings)} recorded responses")
+
+    async def handle(self, request: web.Request) -> web.Response:
+        await self._inject_faults()
+        params = dict(request.query)
+        key = request_key(request.path, params)
+
+        if self.args.record:
+            return await self._record(request.path, params, key)
+
+        entry = self.recordings.get(key)
+        if entry is not None:
+            return web.json_response(entry["body"], status=entry["status"])
+        return web.json_response(self._synthesize(request.path, params))
+
+    async def _inject_faults(self):
+        args = self.args
+        if args.timeout_rate and random.random() < args.timeout_rate:
+            await asyncio.sleep(3600)  # Hang until the client gives up
+        delay = args.latency
+        if args.jitter:
+            delay += random.expovariate(1 / args.jitter)
+        if delay:
+            await asyncio.sleep(delay)
+        if args.error_rate and random.random() < args.error_rate:
+            raise web.HTTPInternalServerError(text="injected error")
+
+    async def _record(self, path: str, params: Dict, key: str) -> web.Response:
+        if self.session is None:
+            self.session = ClientSession()
+        async with self.session.get(self.args.record + path, params=params) as response:
+            if response.content_type != "application/json":
+                # Proxy/server failures aren't OSRM answers; pass them through
+                return web.Response(
+                    status=response.status,
+                    body=await response.read(),
+                    content_type=response.content_type,
+                )
+            status, body = response.status, await response.json()
+        entry = {"key": key, "status": status, "body": body}
+        self.recordings[key] = entry
+        with open(self.args.recordings, "a") as f:
+            f.write(json.dumps(entry) + "\n")
+        return web.json_response(body, status=status)
+
+    def _synthesize(self, path: str, params: Dict) -> Dict:
+        points = _coordinates(path)
+        if path.startswith("/route/"):
+            count = 3 if params.get("alternatives") == "true" else 1
+            bends = [0.05, -0.12, 0.2][:count]
+            routes = [synthetic_route(points[0], points[-1], b, params) for b in bends]
+            return {"code": "Ok", "routes": routes, "waypoints": []}
+        if path.startswith("/table/"):
+            sources = self._indices(params.get("sources"), len(points))
+            destinations = self._indices(params.get("destinations"), len(points))
+            distances = [
+                [
+                    _metres(np.asarray(points[i]), np.asarray(points[j])) * 1.3
+                    for j in destinations
+                ]
+                for i in sources
+            ]
+            durations = [[d / CYCLING_SPEED for d in row] for row in distances]
+            return {"code": "Ok", "durations": durations, "distances": distances}
+        # /nearest and anything else: echo the first point as a waypoint
+        return {"code": "Ok", "waypoints": [{"location": list(points[0])}]}
+
+    @staticmethod
+    def _indices(value: Optional[str], count: int) -> List[int]:
+        if not value or value == "all":
+            return list(range(count))
+        return [int(i) for i in value.split(";")]
+
+    async def close(self, app: web.Application):
+        if self.session:
+            await self.session.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Local OSRM stand-in")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=5055)
+    parser.add_argument("--recordings", help="JSONL of recorded responses")
+    parser.add_argument("--record", help="Proxy to this OSRM URL and record")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds")
+    parser.add_argument(
+        "--jitter", type=float, default=0.0, help="Mean extra seconds (exponential)"
+    )
+    parser.add_argument("--error-rate", type=float, default=0.0, help="500s, 0-1")
+    parser.add_argument("--timeout-rate", type=float, default=0.0, help="Hangs, 0-1")
+    args = parser.parse_args(argv)
+    if args.record and not args.recordings:
+        parser.error("--record needs --recordings")
+
+    logging.basicConfig(level=logging.INFO)
+    stub = OSRMStub(args)
+    app = web.Application()
+    app.router.add_get("/{service}/v1/{profile}/{coordinates}", stub.handle)
+    app.on_cleanup.append(stub.close)
+    web.run_app(app, host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
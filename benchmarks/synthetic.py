@@ -0,0 +1,122 @@
+"""
+Synthetic Delhi data
+Seeded generators for zone layers inside Settings.DELHI_BOUNDARY and for
+OSRM v5-shaped routes of realistic length and vertex spacing, so results
+are reproducible without real hazard data or an OSRM server.
+"""
+
+from typing import Dict, List
+
+import numpy as np
+import shapely
+from shapely.geometry import mapping
+
+from app.core.config import settings
+from app.core.constants import ZoneType
+
+# Rough metres per degree around Delhi
+METRES_PER_DEG_LAT = 111_195.0
+METRES_PER_DEG_LON = 97_600.0
+
+# Typical riding speed used for synthetic durations (m/s)
+CYCLING_SPEED = 4.5
+
+
+def _random_points(rng: np.random.Generator, count: int) -> np.ndarray:
+    boundary = settings.DELHI_BOUNDARY
+    lon = rng.uniform(boundary["min_lon"], boundary["max_lon"], count)
+    lat = rng.uniform(boundary["min_lat"], boundary["max_lat"], count)
+    return np.column_stack([lon, lat])
+
+
+def _blobs(
+    rng: np.random.Generator, count: int, min_radius: float, max_radius: float
+) -> List[Dict]:
+    """Irregular polygons (jittered circles) with radii in metres"""
+    features = []
+    for lon, lat in _random_points(rng, count):
+        n = int(rng.integers(8, 24))
+        angles = np.sort(rng.uniform(0, 2 * np.pi, n))
+        radii = rng.uniform(min_radius, max_radius) * rng.uniform(0.6, 1.0, n)
+        ring = np.column_stack(
+            [
+                lon + radii * np.cos(angles) / METRES_PER_DEG_LON,
+                lat + radii * np.sin(angles) / METRES_PER_DEG_LAT,
+            ]
+        )
+        polygon = shapely.make_valid(shapely.Polygon(ring))
+        features.append(
+            {"type": "Feature", "properties": {}, "geometry": mapping(polygon)}
+        )
+    return features
+
+
+def _lanes(
+    rng: np.random.Generator, count: int, min_length: float, max_length: float
+) -> List[Dict]:
+    """Bike lanes as narrow corridors around random polylines (metres)"""
+    features = []
+    for start in _random_points(rng, count):
+        coords = _walk(rng, start, rng.uniform(min_length, max_length), spacing=50)
+        corridor = shapely.LineString(coords).buffer(5 / METRES_PER_DEG_LAT)
+        features.append(
+            {"type": "Feature", "properties": {}, "geometry": mapping(corridor)}
+        )
+    return features
+
+
+def _walk(
+    rng: np.random.Generator, start: np.ndarray, length: float, spacing: float
+) -> np.ndarray:
+    """Random walk with a drifting heading, `length` metres long"""
+    steps = max(2, int(length / spacing))
+    heading = rng.uniform(0, 2 * np.pi) + np.cumsum(rng.normal(0, 0.15, steps))
+    offsets = np.column_stack(
+        [
+            spacing * np.cos(heading) / METRES_PER_DEG_LON,
+            spacing * np.sin(heading) / METRES_PER_DEG_LAT,
+        ]
+    )
+    return np.vstack([start, start + np.cumsum(offsets, axis=0)])
+
+
+def generate_zones(
+    theft: int = 200,
+    waterlogging: int = 100,
+    bike_lanes: int = 300,
+    seed: int = 0,
+) -> Dict[ZoneType, List[Dict]]:
+    """GeoJSON features per zone layer, as ZoneSnapshot.from_features takes"""
+    rng = np.random.default_rng(seed)
+    return {
+        ZoneType.THEFT: _blobs(rng, theft, 150, 800),
+        ZoneType.WATERLOGGING: _blobs(rng, waterlogging, 80, 400),
+        ZoneType.BIKE_LANE: _lanes(rng, bike_lanes, 500, 3000),
+    }
+
+
+def generate_routes(
+    count: int = 50,
+    min_km: float = 2.0,
+    max_km: float = 20.0,
+    spacing: float = 25.0,
+    seed: int = 1,
+) -> List[Dict]:
+    """
+    OSRM v5 routes with full GeoJSON overview geometry, a vertex every
+    ~`spacing` metres (close to OSRM's overview=full density)
+    """
+    rng = np.random.default_rng(seed)
+    routes = []
+    for start in _random_points(rng, count):
+        distance = rng.uniform(min_km, max_km) * 1000
+        coords = _walk(rng, start, distance, spacing)
+        routes.append(
+            {
+                "geometry": {"type": "LineString", "coordinates": coords.tolist()},
+                "distance": distance,
+                "duration": distance / CYCLING_SPEED,
+                "legs": [{"steps": [], "distance": distance}],
+            }
+        )
+    return routes
@@ -0,0 +1,17 @@
+import pytest
+
+from app.utils.geospatial import ZoneSnapshot, geo_utils
+
+
+@pytest.fixture
+def use_zones():
+    """Swap zone layers into geo_utils, restoring the previous snapshot after"""
+    previous = geo_utils.snapshot
+
+    def use(layers) -> ZoneSnapshot:
+        snapshot = ZoneSnapshot.from_features(layers)
+        geo_utils.swap(snapshot)
+        return snapshot
+
+    yield use
+    geo_utils.swap(previous)
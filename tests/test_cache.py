@@ -0,0 +1,172 @@
+"""
+RouteCache single-flight, zone-version keying and Redis failure fallback,
+against fakeredis
+"""
+
+import asyncio
+import logging
+
+import fakeredis
+import orjson
+import pytest
+
+from app.core.config import settings
+from app.core.constants import ZoneType
+from app.services.cache import RouteCache, ShortLived
+from app.utils.geospatial import geo_utils
+
+START, END = (77.2090, 28.6139), (77.2295, 28.6129)
+THEFT_ZONE = {
+    "type": "Feature",
+    "geometry": {
+        "type": "Polygon",
+        "coordinates": [
+            [[77.20, 28.60], [77.21, 28.60], [77.21, 28.61], [77.20, 28.60]]
+        ],
+    },
+}
+
+
+class Compute:
+    """Counts calls, optionally holding each one until released"""
+
+    def __init__(self, value=None):
+        self.value = value if value is not None else {"routes": [{"distance": 1.0}]}
+        self.calls = 0
+        self.release = asyncio.Event()
+        self.release.set()
+
+    async def __call__(self):
+        self.calls += 1
+        await self.release.wait()
+        return self.value
+
+
+async def until(condition, timeout: float = 2.0):
+    """Wait for `condition()` to hold, polling the event loop"""
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not condition():
+        assert asyncio.get_running_loop().time() < deadline, "timed out"
+        await asyncio.sleep(0.005)
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    monkeypatch.setattr(settings, "ROUTE_CACHE_ENABLED", True)
+    cache = RouteCache()
+    cache.redis = fakeredis.FakeAsyncRedis()
+    return cache
+
+
+def test_concurrent_callers_share_one_computation(cache):
+    key = cache.make_key(START, END, [], False)
+
+    async def run():
+        compute = Compute()
+        compute.release.clear()
+        callers = [
+            asyncio.ensure_future(cache.get_or_compute(key, compute)) for _ in range(5)
+        ]
+        await until(lambda: compute.calls)
+        await asyncio.sleep(0.05)
+        assert compute.calls == 1
+        assert list(cache._inflight) == [key]
+
+        # A cancelled caller doesn't cancel the shared computation
+        callers[0].cancel()
+        compute.release.set()
+        results = await asyncio.gather(*callers[1:])
+        assert all(result == compute.value for result in results)
+        assert compute.calls == 1
+        assert not cache._inflight
+
+        # Stored in Redis with the full TTL, and served from the local tier
+        assert orjson.loads(await cache.redis.get(key)) == compute.value
+        assert 0 < await cache.redis.ttl(key) <= settings.REDIS_CACHE_TTL
+        assert await cache.get_or_compute(key, compute) == compute.value
+        assert compute.calls == 1
+
+        # A fresh process (empty local tier) reads it back from Redis
+        other = RouteCache()
+        other.redis = cache.redis
+        assert await other.get_or_compute(key, Compute()) == compute.value
+        assert key in other._local
+
+    asyncio.run(run())
+
+
+def test_short_lived_values_use_degraded_ttl(cache, monkeypatch):
+    monkeypatch.setattr(settings, "ROUTE_CACHE_DEGRADED_TTL", 5)
+    key = cache.make_key(START, END, [], False)
+
+    async def run():
+        compute = Compute(ShortLived({"routes": []}))
+        assert await cache.get_or_compute(key, compute) == {"routes": []}
+        assert 0 < await cache.redis.ttl(key) <= 5
+
+        # TTL 0 turns caching of short-lived values off altogether
+        monkeypatch.setattr(settings, "ROUTE_CACHE_DEGRADED_TTL", 0)
+        other_key = cache.make_key(END, START, [], False)
+        assert await cache.get_or_compute(other_key, compute) == {"routes": []}
+        assert not await cache.redis.exists(other_key)
+        assert other_key not in cache._local
+
+    asyncio.run(run())
+
+
+def test_keys_follow_zone_data_version(cache, use_zones):
+    use_zones({})
+    old_key = cache.make_key(START, END, [ZoneType.THEFT], False)
+    assert old_key.startswith(f"route:{geo_utils.version}:")
+    # Coordinates within a grid cell share a key; options don't
+    nearby = (START[0] + settings.ROUTE_CACHE_GRID / 4, START[1])
+    assert cache.make_key(nearby, END, [ZoneType.THEFT], False) == old_key
+    assert cache.make_key(START, END, [], False) != old_key
+    assert cache.make_key(START, END, [ZoneType.THEFT], True) != old_key
+
+    async def run():
+        compute = Compute()
+        await cache.get_or_compute(old_key, compute)
+        assert old_key in cache._local
+
+        use_zones({ZoneType.THEFT: [THEFT_ZONE]})
+        new_key = cache.make_key(START, END, [ZoneType.THEFT], False)
+        assert new_key != old_key
+        assert new_key.startswith(f"route:{geo_utils.version}:")
+
+        await cache.get_or_compute(new_key, compute)
+        assert compute.calls == 2
+        # The local tier was dropped with the old version
+        assert list(cache._local) == [new_key]
+
+    asyncio.run(run())
+
+
+def test_redis_failures_fall_back_to_computing(cache, caplog):
+    server = fakeredis.FakeServer()
+    server.connected = False
+    cache.redis = fakeredis.FakeAsyncRedis(server=server)
+    key = cache.make_key(START, END, [], False)
+
+    async def run():
+        compute = Compute()
+        with caplog.at_level(logging.WARNING, logger="app.services.cache"):
+            assert await cache.get_or_compute(key, compute) == compute.value
+        assert "Route cache read failed" in caplog.text
+        assert "Route cache write failed" in caplog.text
+
+        # The local tier still works without Redis
+        assert await cache.get_or_compute(key, compute) == compute.value
+        assert await cache.get(key) == compute.value
+        assert compute.calls == 1
+
+        assert await cache.get(cache.make_key(END, START, [], False)) is None
+        await cache.set(cache.make_key(END, START, [], False), compute.value)
+
+        # Once Redis is back, values go to it again
+        server.connected = True
+        other_key = cache.make_key(END, START, [ZoneType.THEFT], False)
+        await cache.get_or_compute(other_key, compute)
+        assert await cache.redis.exists(other_key)
+
+    asyncio.run(run())
@@ -0,0 +1,169 @@
+"""
+Zone geometry: per-combination zone lengths and risk grid membership,
+checked against brute-force shapely overlays and point tests
+"""
+
+from itertools import combinations
+
+import numpy as np
+import pytest
+import shapely
+from shapely.geometry import shape
+
+from app.core.config import settings
+from app.core.constants import ZoneType
+from app.utils.geospatial import (
+    ZONE_BITS,
+    ZONE_RISK_WEIGHTS,
+    geo_utils,
+    line_metres,
+)
+
+LON0, LAT0 = 77.2, 28.6
+
+
+def box(west: float, south: float, east: float, north: float) -> dict:
+    """Zone feature over a box, in offsets (degrees) from LON0, LAT0"""
+    ring = [
+        [LON0 + west, LAT0 + south],
+        [LON0 + east, LAT0 + south],
+        [LON0 + east, LAT0 + north],
+        [LON0 + west, LAT0 + north],
+        [LON0 + west, LAT0 + south],
+    ]
+    return {"type": "Feature", "geometry": {"type": "Polygon", "coordinates": [ring]}}
+
+
+# Overlapping layers, each with zones overlapping one another as well
+LAYERS = {
+    ZoneType.THEFT: [box(0.000, 0.000, 0.010, 0.010), box(0.006, 0.004, 0.016, 0.012)],
+    ZoneType.WATERLOGGING: [
+        box(0.004, -0.004, 0.012, 0.006),
+        box(0.010, 0.002, 0.020, 0.008),
+    ],
+    ZoneType.BIKE_LANE: [box(-0.002, 0.003, 0.022, 0.005)],
+}
+
+
+def route(*offsets) -> np.ndarray:
+    return np.array([[LON0 + dlon, LAT0 + dlat] for dlon, dlat in offsets])
+
+
+ROUTES = [
+    route((-0.005, 0.004), (0.025, 0.004)),  # Along the bike lane
+    route((-0.003, -0.006), (0.008, 0.009), (0.013, 0.001), (0.024, 0.011)),
+    route((0.005, 0.005), (0.007, 0.0045)),  # Short hop inside all three
+    route((0.003, 0.020), (0.030, 0.020)),  # Clear of every zone
+    route((0.001, 0.001)),  # Single point
+]
+
+
+def brute_force(line, layers) -> dict:
+    """Metres of `line` in exactly each combination of layers"""
+    unions = {
+        zone_type: shapely.union_all([shape(f["geometry"]) for f in features])
+        for zone_type, features in layers.items()
+    }
+    metres = {}
+    for size in range(len(unions) + 1):
+        for combo in combinations(unions, size):
+            part = line
+            for zone_type, union in unions.items():
+                if zone_type in combo:
+                    part = shapely.intersection(part, union)
+                else:
+                    part = shapely.difference(part, union)
+            metres[frozenset(combo)] = float(line_metres(np.array([part]))[0])
+    return metres
+
+
+def test_zone_lengths_match_brute_force_overlay(use_zones):
+    use_zones(LAYERS)
+    results = geo_utils.zone_lengths(ROUTES, list(LAYERS))
+    assert len(results) == len(ROUTES)
+
+    for coords, lengths in zip(ROUTES, results):
+        line = shapely.LineString(coords) if len(coords) > 1 else shapely.LineString()
+        expected = brute_force(line, LAYERS)
+        for combo, metres in expected.items():
+            assert lengths.get(combo, 0.0) == pytest.approx(metres, abs=0.01), combo
+        # Combinations partition the route
+        total = float(line_metres(np.array([line]))[0])
+        assert sum(lengths.values()) == pytest.approx(total, abs=0.01)
+
+    # Between them the routes cross every combination
+    crossed = {
+        combo
+        for coords in ROUTES[:2]
+        for combo, metres in brute_force(shapely.LineString(coords), LAYERS).items()
+        if metres > 0
+    }
+    assert len(crossed) == 2 ** len(LAYERS)
+
+
+def polygon(*points) -> dict:
+    ring = [list(p) for p in (*points, points[0])]
+    return {"type": "Feature", "geometry": {"type": "Polygon", "coordinates": [ring]}}
+
+
+def test_risk_grid_membership_matches_exact_point_test(use_zones):
+    boundary = settings.DELHI_BOUNDARY
+    west, south = boundary["min_lon"], boundary["min_lat"]
+    circle = shapely.Point(west + 0.06, south + 0.05).buffer(0.012)
+    layers = {
+        # Straddles the grid's south-west corner, so part of it is off-grid
+        ZoneType.THEFT: [
+            polygon(
+                (west - 0.02, south - 0.02),
+                (west + 0.03, south - 0.01),
+                (west + 0.02, south + 0.03),
+                (west - 0.01, south + 0.02),
+            ),
+        ],
+        # Diagonal and curved edges through cells, overlapping the theft zone
+        ZoneType.WATERLOGGING: [
+            polygon(
+                (west + 0.01, south + 0.01),
+                (west + 0.07, south + 0.02),
+                (west + 0.03, south + 0.06),
+            ),
+            {"type": "Feature", "geometry": shapely.geometry.mapping(circle)},
+        ],
+    }
+    grid = use_zones(layers).risk_grid
+
+    rng = np.random.default_rng(0)
+    points = rng.uniform(
+        [west - 0.03, south - 0.03], [west + 0.08, south + 0.08], (20000, 2)
+    )
+    membership = grid.membership(points, list(layers))
+
+    on_grid = (points[:, 0] >= west) & (points[:, 1] >= south)
+    cells = grid.masks[
+        ((points[on_grid, 1] - south) // grid.cell_size).astype(int),
+        ((points[on_grid, 0] - west) // grid.cell_size).astype(int),
+    ]
+    for zone_type, features in layers.items():
+        union = shapely.union_all([shape(f["geometry"]) for f in features])
+        expected = shapely.contains_xy(union, points[:, 0], points[:, 1])
+        np.testing.assert_array_equal(membership[zone_type], expected)
+
+        # Both grid paths were exercised: cells wholly inside the zone and
+        # boundary cells needing the exact test (bit + 8)
+        bit = 1 << ZONE_BITS[zone_type]
+        assert (cells & bit).any()
+        assert (cells & (bit << 8)).any()
+    # ...as were off-grid points inside a zone
+    assert membership[ZoneType.THEFT][~on_grid].any()
+
+    expected_risk = sum(
+        weight * membership[zone_type]
+        for zone_type, weight in ZONE_RISK_WEIGHTS.items()
+    )
+    np.testing.assert_allclose(grid.lookup(points), np.clip(expected_risk, 0, 1))
+
+
+def test_empty_snapshot_skips_rasterizing(use_zones):
+    grid = use_zones({}).risk_grid
+    assert not grid.masks.any()
+    assert not grid.lookup(np.array([[77.2, 28.6], [70.0, 20.0]])).any()
@@ -0,0 +1,267 @@
+"""
+OSRM client admission control, retries and hedging against a local
+upstream (benchmarks.osrm_stub behind aiohttp's TestServer), and how
+answers degraded under load are cached
+"""
+
+import argparse
+import asyncio
+from typing import Dict, List
+
+import fakeredis
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from fastapi import HTTPException
+
+from app.core.config import settings
+from app.services.cache import route_cache
+from app.services.osrm import OSRMClient
+from app.services.routing import bike_router
+from benchmarks.osrm_stub import OSRMStub
+
+START, END = (77.20, 28.60), (77.22, 28.62)
+ROUTE_PATH = settings.BIKE_ROUTING_URL.format(
+    coordinates=f"{START[0]},{START[1]};{END[0]},{END[1]}"
+)
+ROUTE_PARAMS = {"alternatives": "true", "geometries": "geojson", "overview": "full"}
+
+
+class Upstream:
+    """Synthetic OSRM that records requests and can stall or fail them"""
+
+    def __init__(self):
+        self.stub = OSRMStub(
+            argparse.Namespace(
+                recordings=None,
+                record=None,
+                latency=0.0,
+                jitter=0.0,
+                error_rate=0.0,
+                timeout_rate=0.0,
+            )
+        )
+        self.requests: List[Dict] = []
+        self.paths: List[str] = []
+        self.delays: List[float] = []  # Per request, in arrival order
+        self.statuses: List[int] = []  # Per request; 200 once exhausted
+        self.release = asyncio.Event()  # Set to let stalled requests finish
+        self.release.set()
+
+    async def handle(self, request: web.Request) -> web.Response:
+        self.requests.append(dict(request.query))
+        self.paths.append(request.path)
+        delay = self.delays.pop(0) if self.delays else 0.0
+        status = self.statuses.pop(0) if self.statuses else 200
+        await self.release.wait()
+        if delay:
+            await asyncio.sleep(delay)
+        if status != 200:
+            return web.Response(status=status, text="upstream error")
+        return await self.stub.handle(request)
+
+
+def run_with_client(monkeypatch, test, **overrides):
+    """Run `test(upstream, client)` against a fresh client and upstream"""
+    overrides = {
+        "OSRM_HEALTH_CHECK_INTERVAL": 0,
+        "OSRM_RETRY_BACKOFF": 0.001,
+        **overrides,
+    }
+    for name, value in overrides.items():
+        monkeypatch.setattr(settings, name, value)
+
+    async def run():
+        upstream = Upstream()
+        app = web.Application()
+        app.router.add_get("/{service}/v1/{profile}/{coordinates}", upstream.handle)
+        async with TestServer(app) as server:
+            monkeypatch.setattr(settings, "OSRM_URL", str(server.make_url("/")))
+            client = OSRMClient()
+            await client._startup()
+            try:
+                await test(upstream, client)
+            finally:
+                await client._shutdown()
+
+    asyncio.run(run())
+
+
+def table_path(i: int) -> str:
+    """A distinct upstream request per i"""
+    return settings.BIKE_TABLE_URL.format(coordinates=f"77.{i:02d},28.6;77.3,28.7")
+
+
+async def fill_queue(upstream: Upstream, client: OSRMClient, count: int):
+    """Stall `count` distinct requests upstream; returns their tasks"""
+    upstream.release.clear()
+    tasks = [
+        asyncio.ensure_future(client.get(table_path(i), {}, [START]))
+        for i in range(count)
+    ]
+    await asyncio.sleep(0.05)
+    return tasks
+
+
+def test_identical_requests_share_one_upstream_call(monkeypatch):
+    async def test(upstream, client):
+        upstream.delays = [0.05]
+        results = await asyncio.gather(
+            *(client.get(ROUTE_PATH, ROUTE_PARAMS, [START, END]) for _ in range(5))
+        )
+        assert len(upstream.requests) == 1
+        assert client.coalesced == 4
+        assert all(result is results[0] for result in results)
+
+    run_with_client(monkeypatch, test)
+
+
+def test_requests_beyond_max_queue_are_shed_with_429(monkeypatch):
+    async def test(upstream, client):
+        # One running plus two queued
+        tasks = await fill_queue(upstream, client, 3)
+        assert client.queued == 2
+        with pytest.raises(HTTPException) as shed:
+            await client.get(ROUTE_PATH, ROUTE_PARAMS, [START, END])
+        assert shed.value.status_code == 429
+        assert shed.value.headers["Retry-After"] == "1"
+        assert client.shed == 1
+
+        upstream.release.set()
+        await asyncio.gather(*tasks)
+
+    run_with_client(
+        monkeypatch,
+        test,
+        OSRM_MAX_CONCURRENCY=1,
+        OSRM_DEGRADE_QUEUE=0,
+        OSRM_MAX_QUEUE=2,
+    )
+
+
+def test_deep_queue_degrades_route_requests(monkeypatch):
+    async def test(upstream, client):
+        tasks = await fill_queue(upstream, client, 2)
+        route = asyncio.ensure_future(
+            client.get(ROUTE_PATH, ROUTE_PARAMS, [START, END])
+        )
+        await asyncio.sleep(0.05)
+        upstream.release.set()
+        data = await route
+        await asyncio.gather(*tasks)
+
+        assert upstream.requests[-1]["alternatives"] == "false"
+        assert data["degraded"] is True
+        assert len(data["routes"]) == 1
+        assert client.degraded == 1
+
+        # Once the queue drains, requests go out whole again
+        data = await client.get(ROUTE_PATH, ROUTE_PARAMS, [START, END])
+        assert upstream.requests[-1]["alternatives"] == "true"
+        assert "degraded" not in data
+
+    run_with_client(
+        monkeypatch,
+        test,
+        OSRM_MAX_CONCURRENCY=1,
+        OSRM_DEGRADE_QUEUE=1,
+        OSRM_MAX_QUEUE=10,
+    )
+
+
+def test_5xx_responses_are_retried(monkeypatch):
+    async def test(upstream, client):
+        upstream.statuses = [502, 503]
+        data = await client.get(ROUTE_PATH, ROUTE_PARAMS, [START, END])
+        assert data["code"] == "Ok"
+        assert len(upstream.requests) == 3
+        assert client.retries == 2
+
+    run_with_client(monkeypatch, test, OSRM_RETRIES=2)
+
+
+def test_retries_give_up_and_4xx_fails_at_once(monkeypatch):
+    async def test(upstream, client):
+        upstream.statuses = [500, 500]
+        with pytest.raises(RuntimeError):
+            await client.get(ROUTE_PATH, ROUTE_PARAMS, [START, END])
+        assert len(upstream.requests) == 2
+
+        upstream.statuses = [400]
+        with pytest.raises(RuntimeError):
+            await client.get(ROUTE_PATH, {**ROUTE_PARAMS, "steps": "x"}, [START, END])
+        assert len(upstream.requests) == 3
+
+    run_with_client(monkeypatch, test, OSRM_RETRIES=1)
+
+
+def test_slow_requests_are_hedged(monkeypatch):
+    async def test(upstream, client):
+        upstream.delays = [1.0]  # Only the first attempt stalls
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        data = await client.get(ROUTE_PATH, ROUTE_PARAMS, [START, END])
+        assert data["code"] == "Ok"
+        assert loop.time() - started < 0.5
+        assert len(upstream.requests) == 2
+        assert client.hedged == 1
+
+    run_with_client(
+        monkeypatch, test, OSRM_HEDGE_ENABLED=True, OSRM_HEDGE_MIN_DELAY=0.05
+    )
+
+
+def test_health_checks_probe_the_configured_profile(monkeypatch):
+    async def test(upstream, client):
+        backend = client.backends[0]
+        await client._health_check(backend)
+        assert upstream.paths[-1].startswith("/nearest/v1/bike/")
+        assert backend.healthy
+
+        upstream.statuses = [503] * settings.OSRM_HEALTH_CHECK_FAILURES
+        for _ in range(settings.OSRM_HEALTH_CHECK_FAILURES):
+            await client._health_check(backend)
+        assert not backend.healthy
+        await client._health_check(backend)
+        assert backend.healthy
+
+    run_with_client(
+        monkeypatch, test, BIKE_NEAREST_URL="/nearest/v1/bike/{coordinates}"
+    )
+
+
+def test_degraded_routes_are_cached_briefly(monkeypatch):
+    redis = fakeredis.FakeAsyncRedis()
+    monkeypatch.setattr(route_cache, "redis", redis)
+    monkeypatch.setattr(settings, "ROUTE_CACHE_DEGRADED_TTL", 7)
+    route_cache.clear()
+
+    async def test(upstream, client):
+        monkeypatch.setattr(bike_router, "osrm", client)
+        key = route_cache.make_key(START, END, [], False)
+
+        tasks = await fill_queue(upstream, client, 2)
+        route = asyncio.ensure_future(bike_router.calculate_route(START, END))
+        await asyncio.sleep(0.05)
+        upstream.release.set()
+        routes, _ = await route
+        await asyncio.gather(*tasks)
+        assert len(routes) == 1
+        assert 0 < await redis.ttl(key) <= 7
+
+        # A whole answer for another pair keeps the full TTL
+        other = (START[0] + 0.01, START[1])
+        await bike_router.calculate_route(other, END)
+        other_key = route_cache.make_key(other, END, [], False)
+        assert await redis.ttl(other_key) > 7
+
+    try:
+        run_with_client(
+            monkeypatch,
+            test,
+            OSRM_MAX_CONCURRENCY=1,
+            OSRM_DEGRADE_QUEUE=1,
+            OSRM_MAX_QUEUE=10,
+        )
+    finally:
+        route_cache.clear()
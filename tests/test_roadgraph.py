@@ -0,0 +1,158 @@
+"""
+Road graph routing: bidirectional A* against plain Dijkstra, risk-weighted
+detours, snapping, and GraphRouter reclassification on zone changes
+"""
+
+import heapq
+import math
+import random
+
+import numpy as np
+import pytest
+
+from app.core.config import settings
+from app.core.constants import ZoneType
+from app.services.graph_router import GraphRouter
+from app.utils.roadgraph import RoadGraph
+
+LON0, LAT0, STEP = 77.1, 28.6, 0.001  # ~100m grid spacing
+N = 12
+
+
+def grid_graph(drop: float = 0.0, seed: int = 0) -> RoadGraph:
+    """N x N grid, both directions per street, minus a `drop` share of edges"""
+    rng = np.random.default_rng(seed)
+    rows, cols = np.meshgrid(np.arange(N), np.arange(N), indexing="ij")
+    coords = np.column_stack([LON0 + cols.ravel() * STEP, LAT0 + rows.ravel() * STEP])
+    coords += rng.normal(0, STEP * 0.1, coords.shape) * bool(drop)
+    node = rows * N + cols
+    a = np.concatenate([node[:, :-1].ravel(), node[:-1].ravel()])
+    b = np.concatenate([node[:, 1:].ravel(), node[1:].ravel()])
+    tails, heads = np.concatenate([a, b]), np.concatenate([b, a])
+    keep = rng.random(len(tails)) >= drop
+    return RoadGraph.from_edges("unclassified", coords, tails[keep], heads[keep])
+
+
+def dijkstra(graph: RoadGraph, source: int, target: int, costs: np.ndarray):
+    dist, done, heap = {source: 0.0}, set(), [(0.0, source)]
+    while heap:
+        d, u = heapq.heappop(heap)
+        if u == target:
+            return d
+        if u in done:
+            continue
+        done.add(u)
+        for edge in range(graph.indptr[u], graph.indptr[u + 1]):
+            v, nd = int(graph.heads[edge]), d + float(costs[edge])
+            if nd < dist.get(v, math.inf):
+                dist[v] = nd
+                heapq.heappush(heap, (nd, v))
+    return None
+
+
+def path_edges(graph: RoadGraph, path, costs: np.ndarray):
+    """Cheapest edge index for each hop of a node path"""
+    edges = []
+    for u, v in zip(path, path[1:]):
+        candidates = [
+            e
+            for e in range(graph.indptr[u], graph.indptr[u + 1])
+            if graph.heads[e] == v
+        ]
+        assert candidates, f"no edge {u} -> {v}"
+        edges.append(min(candidates, key=lambda e: costs[e]))
+    return edges
+
+
+def band(min_col: float, max_col: float, max_row: float) -> dict:
+    """Zone feature spanning grid columns min_col..max_col, rows up to max_row"""
+    west, east = LON0 + min_col * STEP, LON0 + max_col * STEP
+    south, north = LAT0 - 0.5 * STEP, LAT0 + max_row * STEP
+    ring = [[west, south], [east, south], [east, north], [west, north], [west, south]]
+    return {"type": "Feature", "geometry": {"type": "Polygon", "coordinates": [ring]}}
+
+
+def test_shortest_path_matches_dijkstra():
+    graph = grid_graph(drop=0.15, seed=1)
+    rng = np.random.default_rng(2)
+    # Costs never below the length, as the A* potentials require
+    inflated = graph.lengths * (1 + 3 * rng.random(len(graph.lengths))).astype(
+        np.float32
+    )
+    pairs = random.Random(3)
+    for costs in (graph.lengths, inflated):
+        for _ in range(40):
+            source, target = pairs.randrange(len(graph)), pairs.randrange(len(graph))
+            expected = dijkstra(graph, source, target, costs)
+            path = graph.shortest_path(source, target, costs)
+            if expected is None:
+                assert path is None
+                continue
+            assert path[0] == source and path[-1] == target
+            found = sum(float(costs[e]) for e in path_edges(graph, path, costs))
+            assert found == pytest.approx(expected, rel=1e-4)
+
+
+def test_edge_costs_detour_around_avoided_zone(use_zones):
+    graph = grid_graph()
+    # Wall of theft zones across columns 4-7, open only along the top row
+    snapshot = use_zones({ZoneType.THEFT: [band(3.6, 7.4, N - 1.7)]})
+    graph.zones = graph.classify(snapshot)
+    assert graph.version == snapshot.version
+
+    zones = graph.zones
+    assert zones.edge_costs([], 4.0) is graph.lengths
+    costs = zones.edge_costs([ZoneType.THEFT], 4.0)
+    assert zones.edge_costs([ZoneType.THEFT], 4.0) is costs  # Cached
+
+    source, target = (N - 3) * N, (N - 3) * N + N - 1  # Ends of row N-3
+    shortest = graph.shortest_path(source, target, graph.lengths)
+    safest = graph.shortest_path(source, target, costs)
+
+    def zone_metres(path):
+        return sum(
+            float(graph.lengths[e])
+            for e in path_edges(graph, path, graph.lengths)
+            if graph.masks[e]
+        )
+
+    assert zone_metres(shortest) > 0
+    assert zone_metres(safest) == 0
+    assert graph.path_metres(safest) > graph.path_metres(shortest)
+
+
+def test_nearest_respects_snap_distance():
+    graph = grid_graph()
+    # ~50m from nodes (row 3, cols 3 and 4)
+    lon, lat = LON0 + 3.5 * STEP, LAT0 + 3 * STEP + STEP * 0.01
+    node = graph.nearest(lon, lat, 100.0)
+    assert node in (3 * N + 3, 3 * N + 4)
+    assert graph.nearest(lon, lat, 20.0) is None
+    # Far outside the grid
+    assert graph.nearest(LON0 - 0.1, LAT0, 500.0) is None
+
+
+def test_graph_router_reclassifies_on_zone_change(tmp_path, monkeypatch, use_zones):
+    path = tmp_path / "roads.npz"
+    grid_graph().save(path)
+    monkeypatch.setattr(settings, "ROAD_GRAPH_PATH", path)
+    router = GraphRouter()
+
+    empty = use_zones({})
+    graph = router.graph
+    assert graph.version == empty.version
+    unzoned = graph.zones
+    assert not unzoned.masks.any()
+
+    zoned = use_zones({ZoneType.THEFT: [band(3.6, 7.4, N - 1.7)]})
+    assert router.graph is graph
+    assert graph.version == zoned.version
+    assert graph.masks.any()
+    # Swapped in whole: a request holding the old set still sees it intact
+    assert graph.zones is not unzoned and not unzoned.masks.any()
+
+    start = (LON0, LAT0 + (N - 3) * STEP)
+    end = (LON0 + (N - 1) * STEP, LAT0 + (N - 3) * STEP)
+    routes = router.routes(start, end, [ZoneType.THEFT])
+    assert [r["weight_name"] for r in routes] == ["risk", "distance"]
+    assert routes[0]["distance"] > routes[1]["distance"]
@@ -0,0 +1,180 @@
+"""
+DelhiZoneManager version-change invalidation, against a fake asyncpg pool
+(answering the manager's two queries from an in-memory table) and fakeredis
+"""
+
+import asyncio
+import json
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta
+
+import fakeredis
+import pytest
+
+from app.core.config import Environment, settings
+from app.utils import geospatial
+from app.utils.geospatial import DelhiZoneManager
+
+T0 = datetime(2025, 1, 1)
+
+
+def square(lon: float, lat: float, size: float = 0.01) -> dict:
+    ring = [
+        [lon, lat],
+        [lon + size, lat],
+        [lon + size, lat + size],
+        [lon, lat + size],
+        [lon, lat],
+    ]
+    return {"type": "Polygon", "coordinates": [ring]}
+
+
+class FakeConnection:
+    def __init__(self, table: dict):
+        self.table = table  # zone_type -> [(geometry, updated_at)]
+
+    async def fetch(self, query: str, *args):
+        if "GROUP BY zone_type" in query:
+            return [
+                {
+                    "zone_type": zone_type,
+                    "n": len(rows),
+                    "updated": max((u for _, u in rows if u), default=None),
+                }
+                for zone_type, rows in self.table.items()
+            ]
+        return [
+            {"geometry": json.dumps(geometry), "properties": None}
+            for geometry, _ in self.table.get(args[0], [])
+        ]
+
+
+class FakePool:
+    def __init__(self, table: dict):
+        self.conn = FakeConnection(table)
+
+        self.closed = False
+
+    @asynccontextmanager
+    async def acquire(self):
+        yield self.conn
+
+    async def close(self):
+        self.closed = True
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def table() -> dict:
+    return {
+        "theft": [(square(77.2, 28.6), T0)],
+        "waterlogging": [(square(77.1, 28.5), T0)],
+        "bike_lanes": [(square(77.0, 28.4), None)],  # No timestamps
+    }
+
+
+@pytest.fixture
+def clock(monkeypatch) -> Clock:
+    clock = Clock()
+    monkeypatch.setattr(geospatial.time, "monotonic", clock)
+    return clock
+
+
+@pytest.fixture
+def manager(monkeypatch, table) -> DelhiZoneManager:
+    monkeypatch.setattr(settings, "ENVIRONMENT", Environment.PRODUCTION)
+    manager = DelhiZoneManager()
+    manager.redis = fakeredis.FakeAsyncRedis()
+    manager.pool = FakePool(table)
+    return manager
+
+
+def test_initial_load_caches_every_layer(manager):
+    async def run():
+        assert sorted(await manager._load_zones_to_cache()) == sorted(
+            DelhiZoneManager.ZONE_TYPES
+        )
+        assert await manager._cached_version("theft") == f"1:{T0.isoformat()}"
+        assert await manager._cached_version("bike_lanes") == "1:"
+        assert len(await manager.get_index("theft")) == 1
+
+    asyncio.run(run())
+
+
+def test_refresh_without_db_changes_pulls_nothing(manager):
+    async def run():
+        await manager._load_zones_to_cache()
+        assert await manager.refresh() == []
+
+    asyncio.run(run())
+
+
+def test_version_change_invalidates_only_that_layer(manager, table, clock):
+    async def run():
+        await manager._load_zones_to_cache()
+        theft = await manager.get_index("theft")
+        waterlogging = await manager.get_index("waterlogging")
+
+        table["theft"].append((square(77.3, 28.7), T0 + timedelta(hours=1)))
+        assert await manager.refresh() == ["theft"]
+
+        # Still within the TTL: the in-process entry is served as is
+        assert await manager.get_index("theft") is theft
+
+        clock.now += manager.cache_ttl + 1
+        reindexed = await manager.get_index("theft")
+        assert reindexed is not theft
+        assert len(reindexed) == 2
+        assert len(await manager.get_zones("theft")) == 2
+        # Unchanged version: the parsed index is kept across the TTL
+        assert await manager.get_index("waterlogging") is waterlogging
+
+    asyncio.run(run())
+
+
+def test_lifecycle_retries_load_and_refreshes_periodically(monkeypatch, table):
+    monkeypatch.setattr(settings, "ENVIRONMENT", Environment.PRODUCTION)
+    monkeypatch.setattr(settings, "ZONE_DB_REFRESH_INTERVAL", 0.01)
+    pool = FakePool(table)
+    attempts = []
+
+    async def create_pool(*args, **kwargs):
+        attempts.append(args)
+        if len(attempts) == 1:
+            raise OSError("PostGIS unreachable")
+        return pool
+
+    monkeypatch.setattr(geospatial.asyncpg, "create_pool", create_pool)
+    manager = DelhiZoneManager()
+    redis = fakeredis.FakeAsyncRedis()
+    manager.redis = redis
+
+    async def run():
+        # A failed first load doesn't fail startup; the refresh loop retries
+        await manager._startup()
+        assert manager.pool is None
+        await asyncio.sleep(0.05)
+        assert manager.pool is pool
+        assert await manager._cached_version("theft") == f"1:{T0.isoformat()}"
+
+        table["theft"].append((square(77.3, 28.7), T0 + timedelta(hours=1)))
+        await asyncio.sleep(0.05)
+        assert await manager._cached_version("theft") == (
+            f"2:{(T0 + timedelta(hours=1)).isoformat()}"
+        )
+        assert 0 < await redis.ttl("zones:theft") <= manager.cache_ttl
+
+        task = manager._refresh_task
+        await manager._shutdown()
+        await asyncio.sleep(0)
+        assert task.cancelled()
+        assert pool.closed and manager.pool is None and manager.redis is None
+
+    asyncio.run(run())